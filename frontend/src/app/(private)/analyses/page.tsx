@@ -1,6 +1,6 @@
 'use client';
 
-import { useState } from 'react';
+import { useEffect, useState } from 'react';
 import {
   Box,
   Typography,
@@ -40,8 +40,17 @@ const statusColors: Record<AnalysisStatus, 'default' | 'error' | 'success'> = {
 export default function AnalysesPage() {
   const [page, setPage] = useState(1);
   const [pageSize, setPageSize] = useState(10);
+  // nextCursor recebido para cada página: avançar não refaz o skip no servidor
+  const [cursors, setCursors] = useState<Record<number, string>>({});
 
-  const { data, isLoading, error } = useAnalysisHistory(page, pageSize);
+  const { data, isLoading, error } = useAnalysisHistory(page, pageSize, cursors[page]);
+
+  useEffect(() => {
+    const nextCursor = data?.metadata.nextCursor;
+    if (nextCursor && cursors[page + 1] !== nextCursor) {
+      setCursors((previous) => ({ ...previous, [page + 1]: nextCursor }));
+    }
+  }, [data, page, cursors]);
 
   const handlePageChange = (_: unknown, newPage: number) => {
     setPage(newPage + 1);
@@ -50,6 +59,7 @@ export default function AnalysesPage() {
   const handleRowsPerPageChange = (event: React.ChangeEvent<HTMLInputElement>) => {
     setPageSize(parseInt(event.target.value, 10));
     setPage(1);
+    setCursors({});
   };
 
   const formatDate = (dateString: string) => {
@@ -2,7 +2,7 @@
 
 import { Grid } from '@mui/material';
 import { useParams, useSearchParams } from 'next/navigation';
-import { Box, CircularProgress, Typography, Alert } from '@mui/material';
+import { Box, CircularProgress, Typography, Alert, Paper } from '@mui/material';
 import {AnalysisLayout} from '@/components/layouts/AnalysisLayout/AnalysisLayout';
 import { FillerWordAnalysisCard, SilenceAnalysisCard, SpeechRateCard, TranscriptionCard, SentimentTimelineChart } from '@/components/features/analysis';
 import { useAnalysisSubscription, useGetAnalysis } from '@/domain/analysis/hooks';
@@ -21,7 +21,7 @@ export default function AnalysisPage() {
   
   const isSubscriptionEnabled = !!analysis && processingStates.includes(analysis.status ?? 'pending');
 
-  const { statusMessage } = useAnalysisSubscription({
+  const { statusMessage, partialTranscript } = useAnalysisSubscription({
     analysisId: id, 
     enabled: isSubscriptionEnabled
   });
@@ -50,6 +50,17 @@ export default function AnalysisPage() {
       >
         <CircularProgress />
         <Typography>{statusMessage}</Typography>
+        {/* Trechos já transcritos, enviados pelo stream antes do resultado final */}
+        {partialTranscript && (
+          <Paper
+            variant="outlined"
+            sx={{ p: 2, width: '100%', maxWidth: 720, maxHeight: '40vh', overflowY: 'auto' }}
+          >
+            <Typography variant="body2" color="text.secondary" sx={{ whiteSpace: 'pre-wrap' }}>
+              {partialTranscript.trim()}
+            </Typography>
+          </Paper>
+        )}
       </Box>
     );
   }
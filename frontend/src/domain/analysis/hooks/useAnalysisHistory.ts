@@ -3,10 +3,10 @@ import { getAnalysisHistory, deleteAnalysis } from '../services/analysisHistoryS
 import { AnalysisHistoryResponse } from '../types/analysisHistory';
 import { toast } from 'react-hot-toast';
 
-export const useAnalysisHistory = (page: number, pageSize: number) => {
+export const useAnalysisHistory = (page: number, pageSize: number, cursor?: string) => {
   return useQuery<AnalysisHistoryResponse, Error>({
     queryKey: ['analysisHistory', page, pageSize],
-    queryFn: () => getAnalysisHistory(page, pageSize),
+    queryFn: () => getAnalysisHistory(page, pageSize, cursor),
     staleTime: 1000 * 60 * 2, // 2 minutos
   });
 };
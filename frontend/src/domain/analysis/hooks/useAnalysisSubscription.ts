@@ -1,7 +1,7 @@
 import { useEffect, useState } from 'react';
 import { useQueryClient } from '@tanstack/react-query';
 import { API_BASE_URL } from '@/lib/config/env';
-import { Analysis } from '@/domain/analysis/types/analysis';
+import { AnalysisResultEvent, QueueUpdateEvent } from '@/domain/analysis/types/analysis';
 import { EventSourcePolyfill } from 'event-source-polyfill';
 import { getClientSideToken } from '@/domain/auth/services/tokenService';
 
@@ -14,6 +14,19 @@ const statusMessages: Record<string, string> = {
     failed: 'Falha na análise.',
 };
 
+const terminalStatuses = ['completed', 'failed'];
+
+function queueMessage({ position, estimated_start }: QueueUpdateEvent): string {
+    if (position === 0) {
+        return 'Iniciando análise...';
+    }
+    const start = new Date(estimated_start).toLocaleTimeString('pt-BR', {
+        hour: '2-digit',
+        minute: '2-digit',
+    });
+    return `Na fila: posição ${position}, início previsto às ${start}`;
+}
+
 interface UseAnalysisSubscriptionProps {
     analysisId: string;
     enabled: boolean;
@@ -23,6 +36,7 @@ export function useAnalysisSubscription({ analysisId, enabled }: UseAnalysisSubs
     const queryClient = useQueryClient();
 
     const [statusMessage, setStatusMessage] = useState('Conectando...');
+    const [partialTranscript, setPartialTranscript] = useState('');
 
     useEffect(() => {
         if (!analysisId || !enabled) {
@@ -44,11 +58,28 @@ export function useAnalysisSubscription({ analysisId, enabled }: UseAnalysisSubs
                 if (!oldData) return undefined;
                 return { ...oldData, status: newStatus };
             });
+
+            // O servidor encerra o stream no status final; sem fechar aqui o
+            // EventSource reconectaria sozinho
+            if (terminalStatuses.includes(newStatus.toLowerCase())) {
+                eventSource.close();
+            }
+        });
+
+        eventSource.addEventListener('queue_update', (event) => {
+            const update: QueueUpdateEvent = JSON.parse((event as MessageEvent).data);
+            setStatusMessage(queueMessage(update));
+        });
+
+        eventSource.addEventListener('partial_transcript', (event) => {
+            const partial: { text: string } = JSON.parse((event as MessageEvent).data);
+            setPartialTranscript((previous) => previous + partial.text);
         });
 
         eventSource.addEventListener('analysis_result', (event) => {
-            const analysis: Analysis = JSON.parse((event as MessageEvent).data);
-            queryClient.setQueryData(['analysis', analysisId], analysis);
+            const result: AnalysisResultEvent = JSON.parse((event as MessageEvent).data);
+            // O evento traz só o resumo; o resultado completo é buscado de novo
+            queryClient.invalidateQueries({ queryKey: ['analysis', result.id] });
         });
 
         eventSource.onerror = () => {
@@ -60,5 +91,5 @@ export function useAnalysisSubscription({ analysisId, enabled }: UseAnalysisSubs
         };
     }, [analysisId, queryClient, enabled]);
 
-    return { statusMessage };
+    return { statusMessage, partialTranscript };
 }
\ No newline at end of file
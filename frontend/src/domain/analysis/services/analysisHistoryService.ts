@@ -3,11 +3,15 @@ import { AnalysisHistoryResponse } from '../types/analysisHistory';
 
 export const getAnalysisHistory = async (
   page: number = 1,
-  pageSize: number = 10
+  pageSize: number = 10,
+  cursor?: string
 ): Promise<AnalysisHistoryResponse> => {
   const params = new URLSearchParams();
   params.append('page', page.toString());
   params.append('pageSize', pageSize.toString());
+  if (cursor) {
+    params.append('cursor', cursor);
+  }
   
   return apiRequest<AnalysisHistoryResponse>({
     url: `/v2/analysis/?${params.toString()}`,
@@ -22,11 +22,12 @@ export const initiateAnalysis = async (audioFile: File): Promise<string> => {
 
 /**
  * Fetches the result of a specific analysis by its ID.
- * This is also cleaner, delegating the call to the apiClient.
+ * The API answers with an ETag, so the browser revalidates a cached copy
+ * and gets a 304 instead of the whole result again.
  */
 export const getAnalysis = (id: string): Promise<Analysis> => {
     return apiRequest<Analysis>({
-        url: `/v1/analysis/${id}`,
+        url: `/v2/analysis/${id}`,
         options: {
             method: 'GET',
         },
@@ -117,3 +117,31 @@ export interface Analysis {
     audioAnalysis: AudioAnalysis;
     score: number;
 }
+
+/**
+ * Payload do evento analysis_result: só o resumo e a versão. O resultado
+ * completo vem de GET /v2/analysis/{id}.
+ */
+export interface AnalysisResultEvent {
+    id: string;
+    filename: string;
+    createdAt: string;
+    status: 'completed';
+    score: number;
+    duration: number;
+    speechRate: number;
+    fillerWordsCount: number;
+    pausesCount: number;
+    version: number;
+    etag: string;
+}
+
+/**
+ * Evento queue_update do stream SSE: posição na fila do escalonador (0
+ * quando a análise ganhou uma vaga) e o início estimado, em ISO 8601.
+ */
+export interface QueueUpdateEvent {
+    lane: 'short' | 'long';
+    position: number;
+    estimated_start: string;
+}
@@ -15,6 +15,7 @@ export interface PaginationMetadata {
   page: number;
   pageSize: number;
   hasMore: boolean;
+  nextCursor?: string | null;
 }
 
 export interface AnalysisHistoryResponse {
@@ -4,6 +4,7 @@ import { API_BASE_URL } from '@/lib/config/env';
 import { EventSourcePolyfill } from 'event-source-polyfill';
 import { getClientSideToken } from '@/domain/auth/services/tokenService';
 import { RecentAnalysis } from '@/domain/dashboard/types';
+import { AnalysisResultEvent } from '@/domain/analysis/types/analysis';
 
 const statusMessages: Record<string, string> = {
     pending: 'Aguardando início...',
@@ -14,6 +15,8 @@ const statusMessages: Record<string, string> = {
     failed: 'Falha na análise.',
 };
 
+const terminalStatuses = ['completed', 'failed'];
+
 interface UseDashboardAnalysisSubscriptionProps {
     analysisId: string;
     enabled: boolean;
@@ -61,10 +64,16 @@ export function useDashboardAnalysisSubscription({
                     return updated;
                 }
             );
+
+            // O servidor encerra o stream no status final; sem fechar aqui o
+            // EventSource reconectaria sozinho
+            if (terminalStatuses.includes(newStatus.toLowerCase())) {
+                eventSource.close();
+            }
         });
 
         eventSource.addEventListener('analysis_result', (event) => {
-            const analysisData = JSON.parse((event as MessageEvent).data);
+            const result: AnalysisResultEvent = JSON.parse((event as MessageEvent).data);
 
             queryClient.setQueryData<RecentAnalysis>(
                 ['dashboard', 'recent'],
@@ -74,10 +83,10 @@ export function useDashboardAnalysisSubscription({
                     return {
                         ...oldData,
                         status: 'completed',
-                        fillerWordsCount: analysisData.speechAnalysis?.fillerwordsAnalysis?.total || 0,
-                        speechRate: Math.round(analysisData.audioAnalysis?.speechRate || 0),
-                        pausesCount: analysisData.speechAnalysis?.silenceAnalysis?.pauses || 0,
-                        score: analysisData?.score || 0,
+                        fillerWordsCount: result.fillerWordsCount,
+                        speechRate: Math.round(result.speechRate),
+                        pausesCount: result.pausesCount,
+                        score: result.score || 0,
                     };
                 }
             );
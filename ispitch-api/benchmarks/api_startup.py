@@ -0,0 +1,110 @@
+"""
+Tempo de inicialização e memória do processo da API.
+
+Cada execução roda um interpretador novo que importa `src.main` e monta a
+dependência usada pelas rotas de análise (`get_analysis_orchestrator`),
+e mede o tempo de cada passo, o pico de RSS e quais bibliotecas de ML
+acabaram carregadas. Com `--rev`, mede também outra revisão do repositório
+(checada em um worktree temporário) para comparar antes e depois.
+
+Uso: python -m benchmarks.api_startup [--runs 5] [--rev HEAD~1]
+"""
+
+import argparse
+import json
+import pathlib
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ML_MODULES = ('torch', 'whisper', 'transformers', 'spacy', 'nltk')
+
+PROBE = f"""
+import json, resource, sys, time
+start = time.perf_counter()
+import src.main
+imported = time.perf_counter()
+from src.analysis.application.dependencies import services
+services.get_analysis_orchestrator()
+ready = time.perf_counter()
+print(json.dumps({{
+    'import': imported - start,
+    'dependency': ready - imported,
+    'rss_mib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'ml_modules': [m for m in {ML_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+
+def run_probe(api_dir: pathlib.Path) -> dict:
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-c', PROBE],
+        cwd=api_dir,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result['total'] = time.perf_counter() - start
+    return result
+
+
+def report(label: str, api_dir: pathlib.Path, runs: int) -> None:
+    try:
+        results = [run_probe(api_dir) for _ in range(runs)]
+    except subprocess.CalledProcessError as e:
+        error = e.stderr.strip().splitlines()[-1] if e.stderr else e
+        print(f'{label:<12} falhou: {error}')
+        return
+
+    def median(key: str) -> float:
+        return statistics.median(r[key] for r in results)
+
+    print(
+        f'{label:<12} {median("total"):>8.3f} {median("import"):>8.3f} '
+        f'{median("dependency"):>8.3f} {median("rss_mib"):>8.1f}  '
+        f'{", ".join(results[-1]["ml_modules"]) or "-"}'
+    )
+
+
+def git(*args: str, cwd: pathlib.Path) -> str:
+    return subprocess.run(
+        ['git', *args], cwd=cwd, capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+def report_revision(rev: str, api_dir: pathlib.Path, runs: int) -> None:
+    prefix = git('rev-parse', '--show-prefix', cwd=api_dir)
+    worktree = pathlib.Path(tempfile.mkdtemp(prefix='api-startup-'))
+    git('worktree', 'add', '--detach', str(worktree), rev, cwd=api_dir)
+    try:
+        rev_api_dir = worktree / prefix
+        # O .env não é versionado; a outra revisão usa o mesmo
+        if (api_dir / '.env').exists():
+            shutil.copy(api_dir / '.env', rev_api_dir / '.env')
+        report(rev, rev_api_dir, runs)
+    finally:
+        git('worktree', 'remove', '--force', str(worktree), cwd=api_dir)
+
+
+def main(runs: int, revisions: list[str]) -> None:
+    api_dir = pathlib.Path(__file__).resolve().parent.parent
+    print(
+        f'{"revisão":<12} {"total":>8} {"import":>8} {"deps":>8} '
+        f'{"RSS MiB":>8}  bibliotecas de ML'
+    )
+    for rev in revisions:
+        report_revision(rev, api_dir, runs)
+    report('atual', api_dir, runs)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--rev', action='append', default=[])
+    args = parser.parse_args()
+    main(args.runs, args.rev)
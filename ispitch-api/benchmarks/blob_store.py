@@ -0,0 +1,113 @@
+"""
+Escrita e leitura de áudio pelos blob stores.
+
+Escreve um áudio em blocos de 1 MiB, como o StorageAdapter faz durante o
+upload, no diretório local e no bucket do `benchmarks.s3_standin`. Depois
+mede a leitura do bucket até um consumidor que gasta `--decode-ms` por MiB,
+como o ffmpeg da normalização: leituras por faixa em sequência contra o
+`StorageAdapter.read_audio`, que busca a próxima faixa enquanto o consumidor
+processa a atual. O bucket atrasa cada resposta em `--latency-ms`.
+
+Uso: python -m benchmarks.blob_store [--size-mb 60] [--latency-ms 20]
+     [--decode-ms 4]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Iterable
+
+from botocore.config import Config
+
+from src.analysis.infrastructure.persistance.adapters import (
+    FilesystemBlobStoreAdapter,
+    StorageAdapter,
+)
+from src.analysis.infrastructure.persistance.adapters.s3_blob_store_adapter import (  # noqa: E501
+    S3BlobStoreAdapter,
+)
+
+from . import s3_standin
+
+BLOCK = 1024 * 1024
+READ_CHUNK = 4 * 1024 * 1024
+KEY = 'audio/benchmark.wav'
+
+
+def write(store, data: bytes) -> float:
+    start = time.perf_counter()
+    writer = store.open_writer()
+    for offset in range(0, len(data), BLOCK):
+        writer.write(data[offset : offset + BLOCK])
+    writer.commit(KEY)
+    return time.perf_counter() - start
+
+
+def sequential_reads(store) -> Iterable[bytes]:
+    size = store.size(KEY)
+    for offset in range(0, size, READ_CHUNK):
+        yield store.read_range(KEY, offset, READ_CHUNK)
+
+
+def consume(chunks: Iterable[bytes], decode_ms: float) -> tuple[float, int]:
+    start = time.perf_counter()
+    size = 0
+    for chunk in chunks:
+        size += len(chunk)
+        time.sleep(decode_ms / 1000 * len(chunk) / BLOCK)
+    return time.perf_counter() - start, size
+
+
+def main(args: argparse.Namespace) -> None:
+    data = os.urandom(args.size_mb * BLOCK)
+    process, endpoint_url = s3_standin.start(latency_ms=args.latency_ms)
+    try:
+        s3_store = S3BlobStoreAdapter.create(
+            bucket='benchmark',
+            part_size=8 * BLOCK,
+            endpoint_url=endpoint_url,
+            region_name='us-east-1',
+            aws_access_key_id='benchmark',
+            aws_secret_access_key='benchmark',
+            config=Config(s3={'addressing_style': 'path'}),
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            fs_store = FilesystemBlobStoreAdapter(directory)
+
+            print(
+                f'{args.size_mb} MiB, latência do bucket {args.latency_ms:g} '
+                f'ms, consumidor {args.decode_ms:g} ms/MiB'
+            )
+            for label, store in (('diretório', fs_store), ('S3', s3_store)):
+                elapsed = write(store, data)
+                print(
+                    f'escrita {label:<10} {elapsed:>6.2f}s '
+                    f'{args.size_mb / elapsed:>8.1f} MiB/s'
+                )
+
+            # read_audio não usa as referências
+            storage = StorageAdapter(
+                s3_store, references=None, read_chunk_bytes=READ_CHUNK
+            )
+            sequential, size = consume(
+                sequential_reads(s3_store), args.decode_ms
+            )
+            assert size == len(data)
+            prefetched, size = consume(storage.read_audio(KEY), args.decode_ms)
+            assert size == len(data)
+            print(f'leitura em sequência  {sequential:>6.2f}s')
+            print(
+                f'leitura com read-ahead {prefetched:>5.2f}s '
+                f'({1 - prefetched / sequential:.0%} menos)'
+            )
+    finally:
+        process.terminate()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size-mb', type=int, default=60)
+    parser.add_argument('--latency-ms', type=float, default=20)
+    parser.add_argument('--decode-ms', type=float, default=4)
+    main(parser.parse_args())
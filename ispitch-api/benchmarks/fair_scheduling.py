@@ -0,0 +1,214 @@
+"""
+Latência dos áudios curtos sob carga mista, com e sem o escalonador.
+
+Simula, em tempo virtual, um usuário que envia `--heavy-uploads` gravações
+de 30 min de uma vez enquanto `--users` outros enviam clipes de 30 s a 2
+min (em média um a cada `--interval` segundos). Cada análise leva a duração
+do áudio vezes `--rtf` para rodar. Compara uma fila FIFO única com as
+mesmas vagas no total contra o `AnalysisSchedulerService` (filas curta e
+longa, vagas por usuário) rodando os scripts de verdade.
+
+O escalonador precisa de um Redis com Lua: o benchmark usa o banco de
+`--redis-url` e apaga as chaves `scheduler:*` dele antes de começar.
+
+Uso: python -m benchmarks.fair_scheduling [--redis-url redis://localhost/15]
+     [--heavy-uploads 10] [--users 40] [--interval 20] [--rtf 0.5]
+"""
+
+import argparse
+import asyncio
+import heapq
+import random
+import statistics
+from collections import deque
+from dataclasses import dataclass
+
+import redis.asyncio as aioredis
+
+from src.analysis.domain.models.audio import StoredAudio
+from src.analysis.domain.models.scheduling import QueuedAnalysis, QueueLane
+from src.analysis.domain.services.analysis_scheduler_service import (
+    AnalysisSchedulerService,
+    SchedulerConfig,
+)
+from src.analysis.infrastructure.adapters.scheduling.redis_scheduler_adapter import (  # noqa: E501
+    KEY_PREFIX,
+    RedisSchedulerAdapter,
+)
+
+SHORT_SLOTS = 4
+LONG_SLOTS = 2
+USER_SLOTS = 2
+SHORT_MAX_SECONDS = 120
+LONG_SECONDS = 30 * 60
+
+
+@dataclass
+class Upload:
+    analysis_id: str
+    user_id: str
+    duration: float
+    arrival: float
+
+
+def workload(args: argparse.Namespace) -> list[Upload]:
+    rng = random.Random(42)
+    uploads = [
+        Upload(f'heavy-{i}', 'heavy', LONG_SECONDS, 0.0)
+        for i in range(args.heavy_uploads)
+    ]
+    now = 0.0
+    for i in range(args.clips):
+        now += rng.expovariate(1 / args.interval)
+        uploads.append(
+            Upload(
+                f'clip-{i}',
+                f'user-{rng.randrange(args.users)}',
+                rng.uniform(30, SHORT_MAX_SECONDS),
+                now,
+            )
+        )
+    return uploads
+
+
+def fifo(uploads: list[Upload], rtf: float) -> dict[str, float]:
+    """Uma fila única, como o send_task('run_analysis') antigo."""
+    latencies = {}
+    queue: deque[Upload] = deque()
+    running: list[tuple[float, str]] = []
+    pending = deque(sorted(uploads, key=lambda u: u.arrival))
+    free = SHORT_SLOTS + LONG_SLOTS
+    now = 0.0
+    while pending or queue or running:
+        next_arrival = pending[0].arrival if pending else float('inf')
+        next_end = running[0][0] if running else float('inf')
+        if next_arrival <= next_end:
+            now = next_arrival
+            queue.append(pending.popleft())
+        else:
+            now, _ = heapq.heappop(running)
+            free += 1
+        while free and queue:
+            upload = queue.popleft()
+            end = now + upload.duration * rtf
+            latencies[upload.analysis_id] = end - upload.arrival
+            heapq.heappush(running, (end, upload.analysis_id))
+            free -= 1
+    return latencies
+
+
+class RecordingTaskQueue:
+    def __init__(self):
+        self.dispatched: list[QueuedAnalysis] = []
+
+    def enqueue_analysis(self, job: QueuedAnalysis) -> None:
+        self.dispatched.append(job)
+
+
+class SilentNotification:
+    async def publish(self, analysis_id, event, data) -> None:
+        pass
+
+    async def publish_many(self, events) -> None:
+        pass
+
+
+async def scheduled(
+    uploads: list[Upload], rtf: float, redis_client: aioredis.Redis
+) -> dict[str, float]:
+    lane_slots = {QueueLane.SHORT: SHORT_SLOTS, QueueLane.LONG: LONG_SLOTS}
+    task_queue = RecordingTaskQueue()
+    service = AnalysisSchedulerService(
+        scheduler_port=RedisSchedulerAdapter(
+            lambda: redis_client,
+            lane_slots=lane_slots,
+            tenant_slots=USER_SLOTS,
+            lease_seconds=24 * 60 * 60,
+        ),
+        task_queue_port=task_queue,
+        notification_port=SilentNotification(),
+        config=SchedulerConfig(
+            SHORT_MAX_SECONDS,
+            rtf,
+            lane_slots,
+            # Sem controle de admissão: todas as análises entram
+            max_wait_seconds=dict.fromkeys(lane_slots, float('inf')),
+            positions_interval_seconds=60,
+        ),
+    )
+    by_id = {upload.analysis_id: upload for upload in uploads}
+    latencies = {}
+    running: list[tuple[float, str, QueuedAnalysis]] = []
+    pending = deque(sorted(uploads, key=lambda u: u.arrival))
+    now = 0.0
+
+    def start_dispatched() -> None:
+        for job in task_queue.dispatched:
+            upload = by_id[job.analysis_id]
+            end = now + upload.duration * rtf
+            latencies[upload.analysis_id] = end - upload.arrival
+            heapq.heappush(running, (end, job.analysis_id, job))
+        task_queue.dispatched.clear()
+
+    while pending or running:
+        next_arrival = pending[0].arrival if pending else float('inf')
+        next_end = running[0][0] if running else float('inf')
+        if next_arrival <= next_end:
+            upload = pending.popleft()
+            now = upload.arrival
+            await service.submit(
+                upload.analysis_id,
+                upload.user_id,
+                StoredAudio(
+                    key=f'audio/{upload.analysis_id}.wav',
+                    content_hash=upload.analysis_id,
+                    size=0,
+                    filename=f'{upload.analysis_id}.wav',
+                    duration=upload.duration,
+                ),
+            )
+        else:
+            now, _, job = heapq.heappop(running)
+            await service.complete(job, succeeded=True)
+        start_dispatched()
+    return latencies
+
+
+def report(label: str, latencies: dict[str, float]) -> None:
+    clips = sorted(v for k, v in latencies.items() if k.startswith('clip-'))
+    heavy = [v for k, v in latencies.items() if k.startswith('heavy-')]
+    p95 = clips[int(len(clips) * 0.95) - 1]
+    print(
+        f'{label:<14} clipes p50 {statistics.median(clips):>7.0f}s '
+        f'p95 {p95:>7.0f}s   gravações longas (última) {max(heavy):>6.0f}s'
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    uploads = workload(args)
+    redis_client = aioredis.from_url(args.redis_url)
+    try:
+        keys = await redis_client.keys(f'{KEY_PREFIX}:*')
+        if keys:
+            await redis_client.delete(*keys)
+
+        print(
+            f'{args.heavy_uploads} gravações de {LONG_SECONDS // 60} min de um '
+            f'usuário, {args.clips} clipes de {args.users} usuários, '
+            f'{SHORT_SLOTS + LONG_SLOTS} vagas'
+        )
+        report('FIFO', fifo(uploads, args.rtf))
+        report('escalonador', await scheduled(uploads, args.rtf, redis_client))
+    finally:
+        await redis_client.aclose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--redis-url', default='redis://localhost:6379/15')
+    parser.add_argument('--heavy-uploads', type=int, default=10)
+    parser.add_argument('--users', type=int, default=40)
+    parser.add_argument('--clips', type=int, default=200)
+    parser.add_argument('--interval', type=float, default=20)
+    parser.add_argument('--rtf', type=float, default=0.5)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,98 @@
+"""
+Compara a extração de frames do Praat chamada a chamada (``praat_call`` por
+frame/pulso, implementação anterior) com a leitura vetorizada de
+``praat_frames``.
+
+Uso: python -m benchmarks.prosody_frames [minutos ...]
+"""
+
+import sys
+import time
+
+import numpy as np
+import parselmouth
+from parselmouth.praat import call as praat_call
+
+from src.analysis.infrastructure.adapters.audio import praat_frames
+from src.analysis.infrastructure.adapters.audio.audio_context import (
+    ParselmouthAudioContext,
+)
+
+SAMPLE_RATE = 16000
+PAUSE_THRESHOLD = -0.6
+DEFAULT_MINUTES = (1, 5)
+
+
+def synthesize(minutes: float) -> ParselmouthAudioContext:
+    """Sinal vozeado com vibrato, pausas e ruído, parecido com fala."""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(minutes * 60 * SAMPLE_RATE)) / SAMPLE_RATE
+    f0 = 140 + 25 * np.sin(2 * np.pi * 0.3 * t) + 5 * np.sin(2 * np.pi * 5 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+    voiced = np.sin(2 * np.pi * 0.25 * t) > PAUSE_THRESHOLD
+    values = 0.3 * np.sin(phase) + 0.1 * np.sin(2 * phase)
+    values = values * voiced + 0.01 * rng.standard_normal(len(t))
+    sound = parselmouth.Sound(values, sampling_frequency=SAMPLE_RATE)
+    return ParselmouthAudioContext(audio_path='<synthetic>', sound=sound)
+
+
+def per_frame(audio: ParselmouthAudioContext) -> None:
+    pitch = audio.contour_pitch
+    for i in range(1, praat_call(pitch, 'Get number of frames') + 1):
+        praat_call(pitch, 'Get time from frame number', i)
+        praat_call(pitch, 'Get value in frame', i, 'Hertz')
+
+    intensity = audio.intensity
+    for i in range(1, praat_call(intensity, 'Get number of frames') + 1):
+        time_ = praat_call(intensity, 'Get time from frame number', i)
+        praat_call(intensity, 'Get value in frame', i)
+        audio.voicing_pitch.get_value_at_time(time_)
+
+    for i in range(1, praat_call(audio.pitch, 'Get number of frames') + 1):
+        time_ = praat_call(audio.pitch, 'Get time from frame number', i)
+        praat_call(audio.harmonicity, 'Get value at time', time_, 'cubic')
+
+    pulses = audio.pulses
+    for i in range(1, praat_call(pulses, 'Get number of points') + 1):
+        praat_call(pulses, 'Get time from index', i)
+
+
+def vectorized(audio: ParselmouthAudioContext) -> None:
+    praat_frames.pitch_frames(audio.contour_pitch)
+
+    intensity_times, _ = praat_frames.intensity_frames(audio.intensity)
+    praat_frames.interpolate_at(
+        intensity_times, *praat_frames.pitch_frames(audio.voicing_pitch)
+    )
+
+    pitch_times, _ = praat_frames.pitch_frames(audio.pitch)
+    praat_frames.interpolate_at(
+        pitch_times, *praat_frames.harmonicity_frames(audio.harmonicity)
+    )
+
+    praat_frames.pulse_times(audio.pulses)
+
+
+def timed(function, audio: ParselmouthAudioContext) -> float:
+    start = time.perf_counter()
+    function(audio)
+    return time.perf_counter() - start
+
+
+def main(minutes: list[float]) -> None:
+    print(
+        f'{"min":>5} {"per-frame (s)":>14} {"vectorized (s)":>15} {"speedup":>8}'
+    )
+    for length in minutes:
+        audio = synthesize(length)
+        # Os objetos do Praat são calculados antes, só a extração é medida.
+        _ = audio.contour_pitch, audio.intensity, audio.voicing_pitch
+        _ = audio.harmonicity, audio.pulses
+
+        old = timed(per_frame, audio)
+        new = timed(vectorized, audio)
+        print(f'{length:>5g} {old:>14.3f} {new:>15.4f} {old / new:>7.0f}x')
+
+
+if __name__ == '__main__':
+    main([float(arg) for arg in sys.argv[1:]] or list(DEFAULT_MINUTES))
@@ -0,0 +1,178 @@
+"""
+Servidor mínimo que fala RESP2, usado pelos benchmarks no lugar de um
+Redis de verdade. Implementa o pubsub (SUBSCRIBE, PSUBSCRIBE, PUBLISH e os
+UNSUBSCRIBE) e o básico de streams (XADD com MAXLEN, XRANGE e XREVRANGE),
+e responde OK aos demais comandos, como os CLIENT SETINFO que o redis-py
+manda ao conectar e o EXPIRE.
+
+Roda em um processo separado para não dividir a CPU com o cliente medido.
+"""
+
+import asyncio
+import fnmatch
+import multiprocessing
+import time
+
+Reply = bytes | int | str | list | None
+StreamEntry = tuple[tuple[int, int], list[bytes]]
+
+
+def encode(reply: Reply) -> bytes:
+    if reply is None:
+        return b'$-1\r\n'
+    if isinstance(reply, int):
+        return b':%d\r\n' % reply
+    if isinstance(reply, str):
+        return b'+%s\r\n' % reply.encode()
+    if isinstance(reply, list):
+        return b'*%d\r\n' % len(reply) + b''.join(encode(r) for r in reply)
+    return b'$%d\r\n%s\r\n' % (len(reply), reply)
+
+
+async def read_command(reader: asyncio.StreamReader) -> list[bytes]:
+    header = await reader.readline()
+    if not header:
+        raise ConnectionResetError
+    args = []
+    for _ in range(int(header[1:])):
+        length = int((await reader.readline())[1:])
+        args.append((await reader.readexactly(length + 2))[:-2])
+    return args
+
+
+class PubSubServer:
+    def __init__(self):
+        self.channels: dict[bytes, set[asyncio.StreamWriter]] = {}
+        self.patterns: dict[bytes, set[asyncio.StreamWriter]] = {}
+        self.streams: dict[bytes, list[StreamEntry]] = {}
+
+    def subscriptions(self, writer: asyncio.StreamWriter) -> int:
+        return sum(
+            writer in subscribers
+            for table in (self.channels, self.patterns)
+            for subscribers in table.values()
+        )
+
+    def publish(self, channel: bytes, message: bytes) -> int:
+        receivers = 0
+        for writer in self.channels.get(channel, ()):
+            writer.write(encode([b'message', channel, message]))
+            receivers += 1
+        for pattern, writers in self.patterns.items():
+            if fnmatch.fnmatchcase(channel.decode(), pattern.decode()):
+                for writer in writers:
+                    writer.write(
+                        encode([b'pmessage', pattern, channel, message])
+                    )
+                    receivers += 1
+        return receivers
+
+    def xadd(self, key: bytes, args: list[bytes]) -> bytes:
+        max_len = None
+        if args[0].upper() == b'MAXLEN':
+            args = args[1:]
+            if args[0] in {b'~', b'='}:
+                args = args[1:]
+            max_len, args = int(args[0]), args[1:]
+
+        entries = self.streams.setdefault(key, [])
+        entry_id = (time.time_ns() // 1_000_000, 0)
+        if entries and entry_id <= entries[-1][0]:
+            last_ms, last_seq = entries[-1][0]
+            entry_id = (last_ms, last_seq + 1)
+        entries.append((entry_id, args[1:]))
+        if max_len is not None:
+            del entries[:-max_len]
+        return b'%d-%d' % entry_id
+
+    def xrange(self, command: bytes, args: list[bytes]) -> list:
+        def bound(value: bytes, default: tuple) -> tuple[tuple, bool]:
+            exclusive = value.startswith(b'(')
+            value = value.lstrip(b'(')
+            if value in {b'-', b'+'}:
+                return default, False
+            ms, _, seq = value.partition(b'-')
+            return (int(ms), int(seq or 0)), exclusive
+
+        key, first, second, *rest = args
+        if command == b'XREVRANGE':
+            first, second = second, first
+        (low, low_excl), (high, high_excl) = (
+            bound(first, (0, 0)),
+            bound(second, (2**63, 0)),
+        )
+        entries = [
+            [b'%d-%d' % entry_id, fields]
+            for entry_id, fields in self.streams.get(key, [])
+            if (low < entry_id or (low == entry_id and not low_excl))
+            and (entry_id < high or (entry_id == high and not high_excl))
+        ]
+        if command == b'XREVRANGE':
+            entries.reverse()
+        if rest and rest[0].upper() == b'COUNT':
+            entries = entries[: int(rest[1])]
+        return entries
+
+    def execute(self, args: list[bytes], writer: asyncio.StreamWriter) -> None:
+        command = args[0].upper()
+        tables = {
+            b'SUBSCRIBE': self.channels,
+            b'PSUBSCRIBE': self.patterns,
+            b'UNSUBSCRIBE': self.channels,
+            b'PUNSUBSCRIBE': self.patterns,
+        }
+        if command in tables:
+            table = tables[command]
+            for name in args[1:] or list(table):
+                if command.endswith(b'UNSUBSCRIBE'):
+                    table.get(name, set()).discard(writer)
+                else:
+                    table.setdefault(name, set()).add(writer)
+                count = self.subscriptions(writer)
+                writer.write(encode([command.lower(), name, count]))
+        elif command == b'PUBLISH':
+            writer.write(encode(self.publish(args[1], args[2])))
+        elif command == b'XADD':
+            writer.write(encode(self.xadd(args[1], args[2:])))
+        elif command in {b'XRANGE', b'XREVRANGE'}:
+            writer.write(encode(self.xrange(command, args[1:])))
+        elif command == b'PING':
+            writer.write(encode('PONG'))
+        else:
+            writer.write(encode('OK'))
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                self.execute(await read_command(reader), writer)
+                await writer.drain()
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for table in (self.channels, self.patterns):
+                for subscribers in table.values():
+                    subscribers.discard(writer)
+            writer.close()
+
+
+def serve(port_queue: multiprocessing.Queue) -> None:
+    async def run() -> None:
+        server = await asyncio.start_server(
+            PubSubServer().handle, '127.0.0.1', 0, backlog=4096
+        )
+        port_queue.put(server.sockets[0].getsockname()[1])
+        await server.serve_forever()
+
+    asyncio.run(run())
+
+
+def start() -> tuple[multiprocessing.Process, str]:
+    """Sobe o servidor em outro processo e devolve a URL para o redis-py."""
+    port_queue: multiprocessing.Queue = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=serve, args=(port_queue,), daemon=True
+    )
+    process.start()
+    return process, f'redis://127.0.0.1:{port_queue.get(timeout=10)}'
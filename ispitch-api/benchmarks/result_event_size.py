@@ -0,0 +1,183 @@
+"""
+Bytes que o evento analysis_result leva pelo Redis por análise concluída.
+
+Monta o resultado sintético de um áudio de N minutos (transcrição com
+palavras, contornos de pitch e intensidade a cada 10 ms, timeline de
+sentimento e tópicos) e compara o evento antigo, com o AnalysisSchema
+inteiro, com o evento resumido. O evento entra no Redis uma vez e sai uma
+vez para cada processo da API assinado.
+
+Uso: python -m benchmarks.result_event_size [minutos] [processos da API]
+"""
+
+import random
+import sys
+import zlib
+from datetime import datetime, timezone
+
+from src.analysis.application.mappers.analysis_result_mapper import (
+    AnalysisResultMapper,
+)
+from src.analysis.application.mappers.analysis_schema_mapper import (
+    AnalysisSchemaMapper,
+)
+from src.analysis.domain.models.analysis import (
+    Analysis,
+    AnalysisStatus,
+    AudioAnalysis,
+    SpeechAnalysis,
+)
+from src.analysis.domain.models.fillerwords import FillerWordsAnalysis
+from src.analysis.domain.models.prosody import (
+    IntensityAnalysis,
+    IntensityContour,
+    PitchAnalysis,
+    PitchContour,
+    ProsodyAnalysis,
+    VocalQualityAnalysis,
+)
+from src.analysis.domain.models.sentiment import (
+    SentimentAnalysis,
+    SentimentSegment,
+)
+from src.analysis.domain.models.silence import SilenceAnalysis
+from src.analysis.domain.models.topic import Topic, TopicAnalysis
+from src.analysis.domain.models.transcription import (
+    Segment,
+    Transcription,
+    Word,
+)
+
+DEFAULT_MINUTES = 5
+DEFAULT_API_PROCESSES = 2
+CONTOUR_STEP = 0.01
+VOICED_RATIO = 0.7
+WORDS = 'então hoje eu quero apresentar os resultados do nosso projeto'.split()
+
+
+def synthesize(minutes: float) -> Analysis:
+    rng = random.Random(0)
+    duration = minutes * 60
+    frames = [i * CONTOUR_STEP for i in range(int(duration / CONTOUR_STEP))]
+
+    segments = []
+    for i in range(int(duration / 5)):
+        start = i * 5.0
+        words = [
+            Word(
+                word=rng.choice(WORDS),
+                start=start + j * 0.4,
+                end=start + j * 0.4 + 0.3,
+            )
+            for j in range(12)
+        ]
+        text = ' '.join(word.word for word in words)
+        segments.append(Segment(id=i, start=start, text=text, words=words))
+
+    now = datetime.now(timezone.utc)
+    return Analysis(
+        id='0' * 24,
+        status=AnalysisStatus.COMPLETED,
+        filename='apresentacao.wav',
+        created_at=now,
+        updated_at=now,
+        user_id='benchmark',
+        score=78,
+        transcription=Transcription(
+            text=' '.join(segment.text for segment in segments),
+            segments=segments,
+        ),
+        speech_analysis=SpeechAnalysis(
+            silence_analysis=SilenceAnalysis(
+                duration=12.0, silences=[], pauses=18
+            ),
+            fillerwords_analysis=FillerWordsAnalysis(
+                total=9, distribution={'então': 9}, occurrences=[]
+            ),
+            topic_analysis=TopicAnalysis(
+                topics=[
+                    Topic(topic=f'Tópico {i}', summary=' '.join(WORDS) * 3)
+                    for i in range(5)
+                ]
+            ),
+            sentiment_analysis=SentimentAnalysis(
+                timeline=[
+                    SentimentSegment(
+                        start_time=s.start,
+                        end_time=s.start + 5.0,
+                        sentiment='neutro',
+                        score=rng.random(),
+                    )
+                    for s in segments
+                ]
+            ),
+        ),
+        audio_analysis=AudioAnalysis(
+            duration=duration,
+            speech_rate=132.0,
+            prosody_analysis=ProsodyAnalysis(
+                pitch_analysis=PitchAnalysis(
+                    mean_pitch=180.0,
+                    min_pitch=90.0,
+                    max_pitch=320.0,
+                    stdev_pitch=30.0,
+                    stdev_pitch_semitones=2.5,
+                    pitch_contour=[
+                        PitchContour(time=t, pitch=150 + rng.random() * 60)
+                        for t in frames
+                        if rng.random() < VOICED_RATIO
+                    ],
+                ),
+                intensity_analysis=IntensityAnalysis(
+                    mean_intensity=60.0,
+                    min_intensity=30.0,
+                    max_intensity=80.0,
+                    stdev_intensity=8.0,
+                    intensity_contour=[
+                        IntensityContour(time=t, volume=50 + rng.random() * 20)
+                        for t in frames
+                    ],
+                ),
+                vocal_quality=VocalQualityAnalysis(
+                    jitter=0.01, shimmer=0.05, hnr=18.0
+                ),
+            ),
+        ),
+    )
+
+
+def main(minutes: float, api_processes: int) -> None:
+    analysis = synthesize(minutes)
+    full = AnalysisSchemaMapper.from_model(analysis).model_dump_json(
+        by_alias=True
+    )
+    slim = AnalysisResultMapper.to_event(analysis).model_dump_json(by_alias=True)
+    cached = sum(
+        len(value)
+        for value in AnalysisResultMapper.to_compressed_fields(analysis).values()
+    )
+
+    def redis_bytes(payload: str) -> int:
+        return len(payload.encode()) * (1 + api_processes)
+
+    before, after = redis_bytes(full), redis_bytes(slim)
+    print(f'áudio:                 {minutes:g} min')
+    print(f'processos da API:      {api_processes}')
+    print(f'evento antigo:         {len(full.encode()) / 1024:>10.1f} KiB')
+    print(f'evento resumido:       {len(slim.encode()) / 1024:>10.1f} KiB')
+    print(
+        f'Redis por análise:     {before / 1024:>10.1f} KiB -> '
+        f'{after / 1024:.1f} KiB ({(1 - after / before) * 100:.2f}% menos)'
+    )
+    print(
+        f'cache do GET (zlib):   {cached / 1024:>10.1f} KiB '
+        f'(gzip da resposta: {len(zlib.compress(full.encode())) / 1024:.1f} KiB)'
+    )
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    main(
+        float(args.pop(0)) if args else DEFAULT_MINUTES,
+        int(args.pop(0)) if args else DEFAULT_API_PROCESSES,
+    )
@@ -0,0 +1,173 @@
+"""
+Servidor HTTP mínimo compatível com o S3, usado pelos benchmarks (e para
+testar o S3BlobStoreAdapter) no lugar de um bucket de verdade. Guarda os
+objetos em memória e implementa o que o adapter usa: PUT, HEAD, GET com
+Range, DELETE, CopyObject e o upload multipart (criar, enviar parte,
+completar e abortar). Endereçamento por caminho (/bucket/key), sem
+autenticação.
+
+`latency_ms` atrasa cada resposta para simular a rede até o bucket.
+Roda em um processo separado para não dividir a CPU com o cliente medido.
+"""
+
+import hashlib
+import multiprocessing
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+RANGE_PATTERN = re.compile(r'bytes=(\d+)-(\d*)')
+PART_PATTERN = re.compile(rb'<PartNumber>(\d+)</PartNumber>')
+
+
+class Bucket:
+    def __init__(self):
+        self.objects: dict[str, bytes] = {}
+        self.uploads: dict[str, dict[int, bytes]] = {}
+        self.lock = threading.Lock()
+
+
+class S3Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    bucket = Bucket()
+    latency = 0.0
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _target(self) -> tuple[str, dict[str, list[str]]]:
+        url = urlsplit(self.path)
+        # /bucket/key: o nome do bucket é ignorado, há um só
+        key = unquote(url.path).lstrip('/').partition('/')[2]
+        return key, parse_qs(url.query, keep_blank_values=True)
+
+    def _body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+    def _reply(
+        self, status: int, body: bytes = b'', headers: dict | None = None
+    ) -> None:
+        time.sleep(self.latency)
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _not_found(self) -> None:
+        self._reply(
+            404,
+            b'<Error><Code>NoSuchKey</Code><Message>Not found</Message></Error>',
+            {'Content-Type': 'application/xml'},
+        )
+
+    def do_HEAD(self) -> None:
+        key, _ = self._target()
+        data = self.bucket.objects.get(key)
+        if data is None:
+            self._reply(404)
+            return
+        time.sleep(self.latency)
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('ETag', f'"{hashlib.md5(data).hexdigest()}"')
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        key, _ = self._target()
+        data = self.bucket.objects.get(key)
+        if data is None:
+            self._not_found()
+            return
+        match = RANGE_PATTERN.fullmatch(self.headers.get('Range', ''))
+        if match is None:
+            self._reply(200, data)
+            return
+        start = int(match[1])
+        end = min(int(match[2] or len(data) - 1), len(data) - 1)
+        self._reply(
+            206,
+            data[start : end + 1],
+            {'Content-Range': f'bytes {start}-{end}/{len(data)}'},
+        )
+
+    def do_PUT(self) -> None:
+        key, query = self._target()
+        body = self._body()
+        copy_source = self.headers.get('x-amz-copy-source')
+        if copy_source:
+            source = unquote(copy_source).lstrip('/').partition('/')[2]
+            data = self.bucket.objects.get(source)
+            if data is None:
+                self._not_found()
+                return
+            self.bucket.objects[key] = data
+            etag = hashlib.md5(data).hexdigest()
+            self._reply(
+                200,
+                b'<CopyObjectResult><ETag>"%s"</ETag></CopyObjectResult>'
+                % etag.encode(),
+            )
+            return
+
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if 'uploadId' in query:
+            with self.bucket.lock:
+                parts = self.bucket.uploads[query['uploadId'][0]]
+                parts[int(query['partNumber'][0])] = body
+        else:
+            self.bucket.objects[key] = body
+        self._reply(200, headers={'ETag': etag})
+
+    def do_POST(self) -> None:
+        key, query = self._target()
+        body = self._body()
+        if 'uploads' in query:
+            upload_id = uuid.uuid4().hex
+            self.bucket.uploads[upload_id] = {}
+            self._reply(
+                200,
+                b'<InitiateMultipartUploadResult><Key>%s</Key>'
+                b'<UploadId>%s</UploadId></InitiateMultipartUploadResult>'
+                % (key.encode(), upload_id.encode()),
+            )
+            return
+
+        parts = self.bucket.uploads.pop(query['uploadId'][0])
+        numbers = [int(n) for n in PART_PATTERN.findall(body)]
+        self.bucket.objects[key] = b''.join(parts[n] for n in numbers)
+        self._reply(
+            200,
+            b'<CompleteMultipartUploadResult><Key>%s</Key><ETag>"x"</ETag>'
+            b'</CompleteMultipartUploadResult>' % key.encode(),
+        )
+
+    def do_DELETE(self) -> None:
+        key, query = self._target()
+        if 'uploadId' in query:
+            self.bucket.uploads.pop(query['uploadId'][0], None)
+        else:
+            self.bucket.objects.pop(key, None)
+        self._reply(204)
+
+
+def serve(port_queue: multiprocessing.Queue, latency_ms: float) -> None:
+    S3Handler.latency = latency_ms / 1000
+    server = ThreadingHTTPServer(('127.0.0.1', 0), S3Handler)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def start(latency_ms: float = 0.0) -> tuple[multiprocessing.Process, str]:
+    """Sobe o servidor em outro processo e devolve a URL do endpoint."""
+    port_queue: multiprocessing.Queue = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=serve, args=(port_queue, latency_ms), daemon=True
+    )
+    process.start()
+    return process, f'http://127.0.0.1:{port_queue.get(timeout=10)}'
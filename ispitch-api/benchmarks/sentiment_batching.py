@@ -0,0 +1,55 @@
+"""
+Compara a análise de sentimento segmento a segmento (uma chamada do
+pipeline por segmento) com `SentimentAnalysisAdapter.analyze_batch`.
+
+Uso: python -m benchmarks.sentiment_batching [segmentos]
+"""
+
+import random
+import sys
+import time
+
+from src.analysis.infrastructure.adapters.speech import (
+    sentiment_analysis_adapter,
+)
+
+DEFAULT_SEGMENTS = 200
+
+SENTENCES = [
+    'Hoje eu quero apresentar os resultados do nosso projeto.',
+    'Infelizmente tivemos alguns problemas com o prazo de entrega.',
+    'A equipe fez um trabalho excelente e estou muito orgulhoso.',
+    'Os dados mostram um crescimento consistente no último trimestre.',
+    'Não gostei da forma como a reunião foi conduzida.',
+]
+
+
+def synthesize(n_segments: int) -> list[str]:
+    """Segmentos de 1 a 40 frases, alguns maiores que o limite do modelo."""
+    rng = random.Random(0)
+    return [
+        ' '.join(rng.choices(SENTENCES, k=rng.choice([1, 2, 3, 5, 40])))
+        for _ in range(n_segments)
+    ]
+
+
+def main(n_segments: int) -> None:
+    adapter = sentiment_analysis_adapter.SentimentAnalysisAdapter()
+    texts = synthesize(n_segments)
+
+    start = time.perf_counter()
+    for text in texts:
+        adapter.sentiment_pipeline(text, truncation=True)
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    adapter.analyze_batch(texts)
+    batched = time.perf_counter() - start
+
+    print(f'segmentos:   {n_segments}')
+    print(f'um a um:     {sequential:.2f}s')
+    print(f'em lote:     {batched:.2f}s ({sequential / batched:.1f}x)')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SEGMENTS)
@@ -0,0 +1,271 @@
+"""
+Carga de clientes SSE simultâneos sobre o pubsub do Redis.
+
+Compara o gerador antigo (um cliente Redis e um pubsub por conexão, com
+`get_message` e `sleep(0.1)` a cada volta) com `RedisSSEAdapter.events`
+sobre o `RedisEventBroker` (uma assinatura por padrão para o processo), e
+mede o replay pelo stream para clientes que chegam depois do fim.
+O Redis é o servidor de `benchmarks.redis_standin`, em outro processo.
+
+Para cada modo mede a CPU do processo dos clientes durante a entrega, a
+latência de entrega dos eventos publicados e as conexões abertas com o
+Redis.
+
+Uso: python -m benchmarks.sse_fanout [--clients 2000] [--analyses 200]
+     [--events 10]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import AsyncGenerator, Callable
+
+import redis.asyncio as aioredis
+
+from src.analysis.application.adapters.redis_event_broker import (
+    RedisEventBroker,
+)
+from src.analysis.application.adapters.sse_adapter import RedisSSEAdapter
+from src.analysis.domain.models.analysis import AnalysisStatus
+from src.analysis.domain.models.events import SseEvent
+from src.analysis.infrastructure.adapters.notification.redis_adapter import (
+    channel_name,
+    stream_key,
+)
+
+from . import redis_standin
+
+EventSource = Callable[[str], AsyncGenerator[dict, None]]
+
+
+def legacy_events(redis_url: str) -> EventSource:
+    """O gerador de antes do broker, reproduzido para comparação."""
+
+    async def events(analysis_id: str) -> AsyncGenerator[dict, None]:
+        redis_client = aioredis.from_url(redis_url)
+        channel = f'analysis:{analysis_id}'
+        pubsub = redis_client.pubsub()
+        await pubsub.subscribe(channel)
+        try:
+            while True:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=30.0
+                )
+                if message:
+                    payload = json.loads(message['data'])
+                    yield {'event': payload['event'], 'data': payload['data']}
+                    if payload['data'] == AnalysisStatus.COMPLETED.value:
+                        break
+                await asyncio.sleep(0.1)
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.aclose()
+            await redis_client.aclose()
+
+    return events
+
+
+async def consume(
+    events: EventSource,
+    analysis_id: str,
+    ready: asyncio.Event,
+    latencies: list[float],
+) -> None:
+    generator = events(analysis_id)
+    # A assinatura acontece na primeira iteração do gerador
+    first = asyncio.ensure_future(anext(generator))
+    await asyncio.sleep(0)
+    ready.set()
+    event = await first
+    while True:
+        if event['event'] == SseEvent.STAGE_UPDATE.value:
+            latencies.append(time.perf_counter() - float(event['data']))
+        elif event['data'] == AnalysisStatus.COMPLETED.value:
+            break
+        event = await anext(generator)
+    await generator.aclose()
+
+
+async def publish(
+    publisher: aioredis.Redis, analysis_id: str, event: SseEvent, data: str
+) -> None:
+    # O mesmo que o script do RedisNotificationAdapter, sem Lua: o servidor
+    # substituto não executa scripts.
+    event_id = await publisher.xadd(
+        stream_key(analysis_id),
+        {'event': event.value, 'data': data},
+        maxlen=1000,
+    )
+    await publisher.publish(
+        channel_name(analysis_id),
+        json.dumps({
+            'id': event_id.decode(),
+            'event': event.value,
+            'data': data,
+        }),
+    )
+
+
+async def publish_all(
+    redis_url: str, analysis_ids: list[str], n_events: int
+) -> None:
+    publisher = aioredis.from_url(redis_url)
+    for _ in range(n_events):
+        for analysis_id in analysis_ids:
+            await publish(
+                publisher,
+                analysis_id,
+                SseEvent.STAGE_UPDATE,
+                str(time.perf_counter()),
+            )
+        await asyncio.sleep(0.05)
+    for analysis_id in analysis_ids:
+        await publish(
+            publisher,
+            analysis_id,
+            SseEvent.STATUS_UPDATE,
+            AnalysisStatus.COMPLETED.value,
+        )
+    await publisher.aclose()
+
+
+class UnknownAnalyses:
+    """Repositório vazio: as análises do benchmark só existem no Redis."""
+
+    @staticmethod
+    async def find_summary_by_id(analysis_id: str) -> None:
+        return None
+
+
+async def replay_finished(
+    events: EventSource, analysis_ids: list[str], n_clients: int
+) -> float:
+    """Tempo para clientes que chegam depois do fim receberem tudo."""
+
+    async def late_client(analysis_id: str) -> None:
+        async for event in events(analysis_id):
+            if event['data'] == AnalysisStatus.COMPLETED.value:
+                return
+
+    start = time.perf_counter()
+    await asyncio.wait_for(
+        asyncio.gather(
+            *(
+                late_client(analysis_ids[i % len(analysis_ids)])
+                for i in range(n_clients)
+            )
+        ),
+        timeout=60,
+    )
+    return time.perf_counter() - start
+
+
+async def run_mode(
+    events: EventSource,
+    redis_url: str,
+    args: argparse.Namespace,
+    prefix: str,
+) -> dict:
+    analysis_ids = [f'{prefix}-{i}' for i in range(args.analyses)]
+    latencies: list[float] = []
+    readies = [asyncio.Event() for _ in range(args.clients)]
+    clients = [
+        asyncio.create_task(
+            consume(
+                events,
+                analysis_ids[i % args.analyses],
+                readies[i],
+                latencies,
+            )
+        )
+        for i in range(args.clients)
+    ]
+    await asyncio.gather(*(ready.wait() for ready in readies))
+    # Espera as assinaturas chegarem ao servidor
+    await asyncio.sleep(1.0)
+
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    await publish_all(redis_url, analysis_ids, args.events)
+    await asyncio.wait_for(asyncio.gather(*clients), timeout=120)
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'analysis_ids': analysis_ids,
+        'cpu': time.process_time() - cpu_start,
+        'elapsed': elapsed,
+        'delivered': len(latencies),
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p99_ms': latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+async def run_broker(redis_url: str, args: argparse.Namespace) -> dict:
+    redis_client = aioredis.from_url(redis_url)
+    broker = RedisEventBroker(redis_client, queue_size=64)
+    await broker.start()
+    try:
+        adapter = RedisSSEAdapter(
+            broker,
+            redis_client=redis_client,
+            analysis_repository=UnknownAnalyses(),
+            heartbeat_seconds=15,
+        )
+        result = await run_mode(adapter.events, redis_url, args, 'broker')
+        result['replay'] = await replay_finished(
+            adapter.events, result['analysis_ids'], args.clients
+        )
+        return result
+    finally:
+        await broker.stop()
+        await redis_client.aclose()
+
+
+def report(label: str, result: dict, args: argparse.Namespace) -> None:
+    expected = args.clients * args.events
+    print(
+        f'{label:<14} {result["cpu"]:>9.2f}s '
+        f'{result["p50_ms"]:>9.1f} {result["p99_ms"]:>9.1f} '
+        f'{result["delivered"]:>7}/{expected:<7} {result["elapsed"]:>7.2f}s'
+    )
+
+
+def main(args: argparse.Namespace) -> None:
+    process, redis_url = redis_standin.start()
+    try:
+        print(
+            f'{args.clients} clientes, {args.analyses} análises, '
+            f'{args.events} eventos por análise'
+        )
+        print(
+            f'{"modo":<14} {"CPU":>10} {"p50 ms":>9} {"p99 ms":>9} '
+            f'{"entregues":>15} {"total":>8}'
+        )
+        legacy = asyncio.run(
+            run_mode(legacy_events(redis_url), redis_url, args, 'legacy')
+        )
+        report('por conexão', legacy, args)
+        broker = asyncio.run(run_broker(redis_url, args))
+        report('broker', broker, args)
+        print(
+            f'conexões Redis: por conexão {args.clients + 1}, '
+            'broker 2 (assinatura + publicação)'
+        )
+        print(
+            f'{args.clients} clientes conectando depois do fim: '
+            f'{broker["replay"]:.2f}s até o status final pelo stream '
+            '(antes ficavam esperando até o timeout)'
+        )
+    finally:
+        process.terminate()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=2000)
+    parser.add_argument('--analyses', type=int, default=200)
+    parser.add_argument('--events', type=int, default=10)
+    main(parser.parse_args())
@@ -0,0 +1,118 @@
+"""
+Paridade e desempenho dos backends de transcrição.
+
+Transcreve cada áudio de fixture com cada backend registrado em
+TRANSCRIPTION_BACKENDS e mostra o WER e o fator de tempo real (RTF = tempo
+de transcrição / duração do áudio). Se existir um `.txt` com o mesmo nome
+do áudio, ele é a referência do WER; senão, o primeiro backend é a
+referência dos demais.
+
+Uso: python -m benchmarks.transcription_backends AUDIO_OU_PASTA
+         [--backends openai-whisper faster-whisper]
+"""
+
+import argparse
+import pathlib
+import re
+import time
+
+from src.analysis.application.dependencies import worker as deps
+
+AUDIO_SUFFIXES = {'.wav', '.mp3'}
+# Pedaços lidos do arquivo, como os do upload
+READ_CHUNK = 1024 * 1024
+
+
+def normalize(text: str) -> list[str]:
+    return re.sub(r'[^\w\s]', ' ', text.lower()).split()
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Distância de edição entre as palavras, dividida pela referência."""
+    ref, hyp = normalize(reference), normalize(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, start=1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, start=1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (ref_word != hyp_word),
+                )
+            )
+        previous = current
+
+    return previous[-1] / len(ref)
+
+
+def collect_fixtures(paths: list[str]) -> list[pathlib.Path]:
+    fixtures = []
+    for path in map(pathlib.Path, paths):
+        if path.is_dir():
+            fixtures.extend(
+                sorted(p for p in path.iterdir() if p.suffix in AUDIO_SUFFIXES)
+            )
+        else:
+            fixtures.append(path)
+    return fixtures
+
+
+def normalize_file(normalization_port, path: pathlib.Path):
+    with open(path, 'rb') as f:
+        return normalization_port.normalize(
+            str(path), iter(lambda: f.read(READ_CHUNK), b'')
+        )
+
+
+def main(paths: list[str], backends: list[str]) -> None:
+    fixtures = collect_fixtures(paths)
+    # Decodificado uma vez, fora da medição, como no pipeline
+    normalization_port = deps.get_audio_normalization_port()
+    normalized = {f: normalize_file(normalization_port, f) for f in fixtures}
+    references = {
+        f: f.with_suffix('.txt').read_text(encoding='utf-8')
+        for f in fixtures
+        if f.with_suffix('.txt').exists()
+    }
+
+    print(f'{"backend":<16} {"arquivo":<28} {"RTF":>6} {"WER":>6}')
+    for backend in backends:
+        load_start = time.perf_counter()
+        transcription_port = deps.TRANSCRIPTION_BACKENDS[backend]()
+        load_time = time.perf_counter() - load_start
+
+        total_time = 0.0
+        for fixture in fixtures:
+            start = time.perf_counter()
+            transcription = transcription_port.transcribe(normalized[fixture])
+            elapsed = time.perf_counter() - start
+            total_time += elapsed
+
+            # Sem referência humana, o primeiro backend vira a referência
+            reference = references.setdefault(fixture, transcription.text)
+            wer = word_error_rate(reference, transcription.text)
+            rtf = elapsed / normalized[fixture].duration
+            print(f'{backend:<16} {fixture.name:<28} {rtf:>6.3f} {wer:>6.3f}')
+
+        total_rtf = total_time / sum(a.duration for a in normalized.values())
+        print(
+            f'{backend:<16} {"total":<28} {total_rtf:>6.3f} '
+            f'(carga do modelo: {load_time:.1f}s)'
+        )
+
+    for fixture in fixtures:
+        normalization_port.release(normalized[fixture])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('paths', nargs='+')
+    parser.add_argument(
+        '--backends', nargs='+', default=list(deps.TRANSCRIPTION_BACKENDS)
+    )
+    args = parser.parse_args()
+    main(args.paths, args.backends)
@@ -0,0 +1,86 @@
+"""
+Memória dos processos de worker do Celery, lida de /proc (Linux).
+
+RSS conta as páginas compartilhadas em cada processo; PSS divide cada página
+compartilhada entre os processos que a mapeiam, então a soma dos PSS é o
+consumo real do conjunto. Com os modelos pré-carregados no pai (prefork +
+WORKER_PRELOAD_MODELS), o PSS dos filhos deve ficar bem abaixo do RSS.
+
+Uso: python -m benchmarks.worker_memory [PID_DO_PAI]
+     (sem PID, usa todos os processos `celery ... worker`)
+"""
+
+import pathlib
+import sys
+
+PROC = pathlib.Path('/proc')
+FIELDS = ('Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty', 'Private_Dirty')
+
+
+def read_rollup(pid: int) -> dict[str, int]:
+    """Campos do smaps_rollup, em kB."""
+    values = {}
+    for line in (PROC / str(pid) / 'smaps_rollup').read_text().splitlines():
+        name, _, rest = line.partition(':')
+        if name in FIELDS:
+            values[name] = int(rest.split()[0])
+    return values
+
+
+def parent_of(pid: int) -> int:
+    stat = (PROC / str(pid) / 'stat').read_text()
+    # O nome do processo vem entre parênteses e pode conter espaços
+    return int(stat.rsplit(')', 1)[1].split()[1])
+
+
+def cmdline_of(pid: int) -> str:
+    raw = (PROC / str(pid) / 'cmdline').read_bytes()
+    return raw.replace(b'\0', b' ').decode(errors='replace').strip()
+
+
+def is_worker(pid: int, root_pid: int | None) -> bool:
+    if root_pid is None:
+        command = cmdline_of(pid)
+        return 'celery' in command and 'worker' in command
+    return pid == root_pid or parent_of(pid) == root_pid
+
+
+def find_workers(root_pid: int | None) -> list[int]:
+    pids = []
+    for entry in PROC.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            if is_worker(int(entry.name), root_pid):
+                pids.append(int(entry.name))
+        except (FileNotFoundError, ProcessLookupError, PermissionError):
+            continue
+    return sorted(pids)
+
+
+def main(root_pid: int | None) -> None:
+    pids = find_workers(root_pid)
+    if not pids:
+        print('Nenhum processo de worker encontrado.')
+        return
+
+    header = ' '.join(f'{field:>14}' for field in FIELDS)
+    print(f'{"pid":>8} {header}  (MiB)')
+
+    totals = dict.fromkeys(FIELDS, 0)
+    for pid in pids:
+        try:
+            rollup = read_rollup(pid)
+        except (FileNotFoundError, PermissionError):
+            continue
+        for field in FIELDS:
+            totals[field] += rollup.get(field, 0)
+        row = ' '.join(f'{rollup.get(f, 0) / 1024:>14.1f}' for f in FIELDS)
+        print(f'{pid:>8} {row}')
+
+    row = ' '.join(f'{totals[f] / 1024:>14.1f}' for f in FIELDS)
+    print(f'{"total":>8} {row}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else None)
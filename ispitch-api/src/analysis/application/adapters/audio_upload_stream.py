@@ -0,0 +1,215 @@
+from typing import AsyncIterator, Awaitable, Callable, Mapping, Optional
+
+from fastapi import HTTPException, Request, status
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+from ...infrastructure.adapters.audio.header_probe import (
+    AudioHeader,
+    AudioHeaderProbe,
+    UnsupportedAudioError,
+)
+
+FILE_FIELD = b'file'
+# Folga para os delimitadores e cabeçalhos do multipart no Content-Length
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class AudioUploadStream:
+    """
+    Lê o campo `file` de um upload multipart direto do corpo da requisição,
+    sem passar pelo spool do UploadFile.
+
+    `open` avança até os cabeçalhos do arquivo e valida o tipo declarado;
+    `chunks` devolve o conteúdo à medida que chega, lendo o cabeçalho do
+    áudio pelo caminho. O upload é interrompido assim que passa do tamanho
+    ou da duração máxima, ou quando o conteúdo não é WAV nem MP3.
+
+    `on_header` é chamado assim que o cabeçalho é lido, antes de o primeiro
+    trecho ser devolvido: o que ele levantar interrompe o upload sem que
+    nada tenha sido gravado.
+    """
+
+    def __init__(
+        self,
+        request: Request,
+        suffixes: Mapping[str, str],
+        max_bytes: int,
+        max_duration: float,
+    ):
+        self.request = request
+        self.suffixes = suffixes
+        self.max_bytes = max_bytes
+        self.max_duration = max_duration
+        self.filename: Optional[str] = None
+        self.content_type: Optional[str] = None
+        self.header: Optional[AudioHeader] = None
+        self.size = 0
+
+        self._body = request.stream()
+        self._parser: Optional[MultipartParser] = None
+        self._probe: Optional[AudioHeaderProbe] = None
+        self._pending: list[bytes] = []
+        self._part_headers: dict[bytes, bytes] = {}
+        self._header_field = bytearray()
+        self._header_value = bytearray()
+        self._in_file = False
+        self._file_found = False
+        self._file_done = False
+
+    @property
+    def suffix(self) -> str:
+        return self.suffixes[self.content_type]
+
+    async def open(self) -> None:
+        content_length = self._content_length()
+        if content_length > self.max_bytes + MULTIPART_OVERHEAD_BYTES:
+            self._too_large()
+
+        content_type, options = parse_options_header(
+            self.request.headers.get('content-type', '')
+        )
+        if content_type != b'multipart/form-data' or b'boundary' not in options:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail='Expected a multipart/form-data body.',
+            )
+
+        self._parser = MultipartParser(
+            options[b'boundary'],
+            callbacks={
+                'on_part_begin': self._on_part_begin,
+                'on_header_field': self._on_header_field,
+                'on_header_value': self._on_header_value,
+                'on_header_end': self._on_header_end,
+                'on_headers_finished': self._on_headers_finished,
+                'on_part_data': self._on_part_data,
+                'on_part_end': self._on_part_end,
+            },
+        )
+        while not self._file_found:
+            if not await self._read():
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail='Missing the `file` field.',
+                )
+
+        if self.content_type not in self.suffixes:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail=(
+                    f'Unsupported file type: {self.content_type}. '
+                    'Supported types are: ' + ', '.join(self.suffixes)
+                ),
+            )
+        # O CBR do MP3 tem a duração estimada pelo tamanho; a sobra do
+        # multipart no Content-Length é desprezível para isso
+        self._probe = AudioHeaderProbe(expected_size=content_length or None)
+
+    async def chunks(
+        self,
+        on_header: Optional[Callable[[AudioHeader], Awaitable[None]]] = None,
+    ) -> AsyncIterator[bytes]:
+        while True:
+            pending, self._pending = self._pending, []
+            for data in pending:
+                had_header = self.header is not None
+                self._check(data)
+                if on_header and not had_header and self.header is not None:
+                    await on_header(self.header)
+                yield data
+            if self._file_done:
+                break
+            if not await self._read():
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail='The upload ended before the file was complete.',
+                )
+
+        if self.header is None:
+            self._unsupported('Audio header not found.')
+
+    def _check(self, data: bytes) -> None:
+        self.size += len(data)
+        if self.size > self.max_bytes:
+            self._too_large()
+
+        if self.header is not None:
+            return
+        try:
+            self.header = self._probe.feed(data)
+        except UnsupportedAudioError as e:
+            self._unsupported(str(e))
+        if (
+            self.header is not None
+            and self.header.duration is not None
+            and self.header.duration > self.max_duration
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=(
+                    f'Audio duration exceeds the limit of '
+                    f'{self.max_duration:g} seconds.'
+                ),
+            )
+
+    async def _read(self) -> bool:
+        try:
+            chunk = await anext(self._body)
+        except StopAsyncIteration:
+            self._parser.finalize()
+            return False
+        self._parser.write(chunk)
+        return True
+
+    def _content_length(self) -> int:
+        try:
+            return int(self.request.headers.get('content-length', 0))
+        except ValueError:
+            return 0
+
+    def _too_large(self) -> None:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f'File size exceeds the limit of {self.max_bytes} bytes.',
+        )
+
+    @staticmethod
+    def _unsupported(detail: str) -> None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=detail
+        )
+
+    def _on_part_begin(self) -> None:
+        self._part_headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        field = bytes(self._header_field).lower()
+        self._part_headers[field] = bytes(self._header_value)
+        self._header_field.clear()
+        self._header_value.clear()
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(
+            self._part_headers.get(b'content-disposition', b'')
+        )
+        if options.get(b'name') != FILE_FIELD or self._file_found:
+            return
+        self._in_file = self._file_found = True
+        filename = options.get(b'filename')
+        self.filename = filename.decode() if filename else None
+        self.content_type = self._part_headers.get(b'content-type', b'').decode()
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_file:
+            self._pending.append(data[start:end])
+
+    def _on_part_end(self) -> None:
+        if self._in_file:
+            self._in_file = False
+            self._file_done = True
@@ -0,0 +1,103 @@
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = 'analysis:'
+RECONNECT_DELAY_SECONDS = 1.0
+
+
+class RedisEventBroker:
+    """
+    Única assinatura Redis do processo da API. Assina `analysis:*` por
+    padrão uma vez e repassa cada mensagem, decodificada uma só vez, para as
+    filas dos clientes SSE daquela análise.
+
+    As filas são limitadas: um cliente lento perde os eventos mais antigos
+    da sua fila, nunca o mais recente (o status final chega por último), e
+    não atrasa os outros clientes.
+    """
+
+    def __init__(
+        self,
+        redis_client: aioredis.Redis,
+        queue_size: int,
+    ):
+        self.redis_client = redis_client
+        self.queue_size = queue_size
+        self._queues: dict[str, set[asyncio.Queue]] = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._queues.values())
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._listen())
+        logger.info('SSE event broker started')
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        logger.info('SSE event broker stopped')
+
+    @asynccontextmanager
+    async def subscribe(self, analysis_id: str) -> AsyncIterator[asyncio.Queue]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._queues.setdefault(analysis_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._queues.get(analysis_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._queues[analysis_id]
+
+    def dispatch(self, analysis_id: str, payload: Any) -> None:
+        for queue in self._queues.get(analysis_id, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(payload)
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self.redis_client.pubsub()
+            try:
+                await pubsub.psubscribe(f'{CHANNEL_PREFIX}*')
+                # listen() espera no socket: nenhum polling entre mensagens
+                async for message in pubsub.listen():
+                    if message['type'] == 'pmessage':
+                        self._on_message(message)
+            except RedisError as e:
+                logger.warning(
+                    f'SSE event broker lost its subscription: {e}. '
+                    f'Reconnecting in {RECONNECT_DELAY_SECONDS:g}s'
+                )
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+            finally:
+                await pubsub.aclose()
+
+    def _on_message(self, message: dict) -> None:
+        channel = message['channel']
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+        analysis_id = channel.removeprefix(CHANNEL_PREFIX)
+        if analysis_id not in self._queues:
+            return
+
+        try:
+            payload = json.loads(message['data'])
+        except (TypeError, ValueError):
+            logger.warning(f'[{analysis_id}] Ignoring malformed SSE message')
+            return
+        self.dispatch(analysis_id, payload)
@@ -1,41 +1,143 @@
-import asyncio
-import json
-from typing import AsyncGenerator, Dict
+from typing import AsyncGenerator, Dict, Optional
 
 import redis.asyncio as aioredis
 from sse_starlette.sse import EventSourceResponse
 
 from ...domain.models.analysis import AnalysisStatus
+from ...domain.models.events import SseEvent
+from ...domain.ports.output import AnalysisRepositoryPort
+from ...infrastructure.adapters.notification.redis_adapter import stream_key
+from ..mappers.analysis_result_mapper import AnalysisResultMapper
+from .redis_event_broker import RedisEventBroker
+
+TERMINAL_STATUSES = {AnalysisStatus.COMPLETED.value, AnalysisStatus.FAILED.value}
+
+
+def is_terminal(event: Dict) -> bool:
+    return (
+        event['event'] == SseEvent.STATUS_UPDATE.value
+        and event['data'] in TERMINAL_STATUSES
+    )
+
+
+def parse_event_id(event_id: str) -> tuple[int, int]:
+    milliseconds, sequence = event_id.split('-')
+    return int(milliseconds), int(sequence)
 
 
 class RedisSSEAdapter:
-    def __init__(self, redis_client: aioredis.Redis):
+    """
+    Eventos de uma análise lidos do stream Redis e, depois, do broker.
+
+    O cliente recebe primeiro o que está no stream depois do seu
+    Last-Event-ID (tudo, numa conexão nova) e então os eventos ao vivo.
+    Quando o stream já expirou e a análise terminou, o resultado vem do
+    banco e a conexão é encerrada sem esperar nenhum evento.
+    """
+
+    def __init__(
+        self,
+        event_broker: RedisEventBroker,
+        redis_client: aioredis.Redis,
+        analysis_repository: AnalysisRepositoryPort,
+        heartbeat_seconds: int,
+    ):
+        self.event_broker = event_broker
         self.redis_client = redis_client
+        self.analysis_repository = analysis_repository
+        self.heartbeat_seconds = heartbeat_seconds
+
+    async def events(
+        self, analysis_id: str, last_event_id: Optional[str] = None
+    ) -> AsyncGenerator[Dict, None]:
+        # Assina antes de ler o stream: o que for publicado durante a
+        # leitura fica na fila e é filtrado pelo ID abaixo.
+        async with self.event_broker.subscribe(analysis_id) as queue:
+            backlog = await self._read_stream(analysis_id, last_event_id)
+            for event in backlog:
+                yield event
+                if is_terminal(event):
+                    return
+
+            if backlog:
+                last_event_id = backlog[-1]['id']
+            else:
+                # Sem Last-Event-ID, o stream vazio é um stream inexistente
+                tail = (
+                    await self._read_tail(analysis_id) if last_event_id else None
+                )
+                if tail is not None and is_terminal(tail):
+                    return
+                if tail is None:
+                    stored_events = await self._stored_result_events(analysis_id)
+                    for event in stored_events:
+                        yield event
+                    if stored_events:
+                        return
+
+            while True:
+                event = await queue.get()
+                if last_event_id and parse_event_id(
+                    event['id']
+                ) <= parse_event_id(last_event_id):
+                    continue
+
+                yield event
+                if is_terminal(event):
+                    break
+
+    def stream_events(
+        self, analysis_id: str, last_event_id: Optional[str] = None
+    ) -> EventSourceResponse:
+        # O ping do sse_starlette mantém a conexão viva entre eventos
+        return EventSourceResponse(
+            self.events(analysis_id, last_event_id),
+            ping=self.heartbeat_seconds,
+        )
+
+    async def _read_stream(
+        self, analysis_id: str, last_event_id: Optional[str]
+    ) -> list[Dict]:
+        # "(" torna o início exclusivo: só o que veio depois do último ID
+        start = f'({last_event_id}' if last_event_id else '-'
+        entries = await self.redis_client.xrange(
+            stream_key(analysis_id), min=start
+        )
+        return [self._to_event(entry) for entry in entries]
+
+    async def _read_tail(self, analysis_id: str) -> Optional[Dict]:
+        entries = await self.redis_client.xrevrange(
+            stream_key(analysis_id), count=1
+        )
+        return self._to_event(entries[0]) if entries else None
+
+    async def _stored_result_events(self, analysis_id: str) -> list[Dict]:
+        """
+        Eventos finais de uma análise já terminada, montados do banco. O
+        evento de resultado só leva escalares, então basta a projeção.
+        """
+        summary = await self.analysis_repository.find_summary_by_id(analysis_id)
+        if summary is None or summary.status not in TERMINAL_STATUSES:
+            return []
+
+        events = []
+        if summary.status == AnalysisStatus.COMPLETED:
+            result_event = AnalysisResultMapper.summary_to_event(summary)
+            events.append({
+                'event': SseEvent.ANALYSIS_RESULT.value,
+                'data': result_event.model_dump_json(by_alias=True),
+            })
+        events.append({
+            'event': SseEvent.STATUS_UPDATE.value,
+            'data': summary.status.value,
+        })
+        return events
 
-    def stream_events(self, analysis_id: str) -> EventSourceResponse:
-        async def event_generator() -> AsyncGenerator[Dict, None]:
-            channel = f'analysis:{analysis_id}'
-            pubsub = self.redis_client.pubsub()
-            await pubsub.subscribe(channel)
-
-            try:
-                while True:
-                    message = await pubsub.get_message(
-                        ignore_subscribe_messages=True,
-                        timeout=30.0,
-                    )
-                    if message:
-                        payload = json.loads(message['data'])
-                        event_name = payload['event']
-                        event_data = payload['data']
-
-                        yield {'event': event_name, 'data': event_data}
-
-                        if event_data == AnalysisStatus.COMPLETED.value:
-                            break
-                    await asyncio.sleep(0.1)
-            finally:
-                await pubsub.unsubscribe(channel)
-                await pubsub.close()
-
-        return EventSourceResponse(event_generator())
+    @staticmethod
+    def _to_event(entry: tuple) -> Dict:
+        event_id, fields = entry
+        return {
+            'id': event_id.decode(),
+            'event': fields[b'event'].decode(),
+            'data': fields[b'data'].decode(),
+        }
@@ -0,0 +1,41 @@
+"""
+Recalcula os rollups de estatísticas a partir das análises salvas.
+
+Usado para popular `analysis_stats_rollups` com as análises concluídas antes
+dos rollups existirem, ou para corrigir buckets depois de uma falha ao
+atualizá-los. Análises concluídas durante o rebuild podem ficar fora dos
+buckets recalculados; rode com os workers parados ou rode de novo depois.
+
+Uso: python -m src.analysis.application.commands.rebuild_stats [--user-id ID]
+"""
+
+import argparse
+import asyncio
+from typing import Optional
+
+from ....core.database import db
+from ...infrastructure.persistance.documents.analysis_document import (
+    AnalysisDocument,
+)
+from ...infrastructure.persistance.documents.analysis_stats_rollup_document import (  # noqa: E501
+    AnalysisStatsRollupDocument,
+)
+from ..dependencies.services import get_analysis_stats_repository
+
+
+async def rebuild_stats(user_id: Optional[str]) -> int:
+    await db.connect(
+        document_models=[AnalysisDocument, AnalysisStatsRollupDocument]
+    )
+    try:
+        return await get_analysis_stats_repository().rebuild(user_id)
+    finally:
+        await db.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--user-id', default=None)
+    args = parser.parse_args()
+    buckets = asyncio.run(rebuild_stats(args.user_id))
+    print(f'{buckets} buckets recalculados')
@@ -1,26 +1,43 @@
 from functools import lru_cache
 
-import nltk
-import spacy
-import whisper
-from transformers import T5ForConditionalGeneration, T5Tokenizer
-
 from ....core.config import settings
 
+# As bibliotecas de ML são importadas dentro de cada função, só no processo
+# que de fato carrega o modelo (o worker); daí os `noqa: PLC0415`.
+
 MODEL_NAME = 'unicamp-dl/ptt5-base-portuguese-vocab'
 
 
 @lru_cache(maxsize=1)
 def get_whisper_model():
+    import whisper  # noqa: PLC0415
+
     return whisper.load_model(settings.whisper_model)
 
 
+@lru_cache(maxsize=1)
+def get_faster_whisper_model():
+    # Dependência opcional: só existe quando o backend é selecionado
+    import faster_whisper  # noqa: PLC0415
+
+    return faster_whisper.WhisperModel(
+        settings.whisper_model,
+        device='cpu',
+        compute_type=settings.faster_whisper_compute_type,
+        cpu_threads=settings.faster_whisper_cpu_threads,
+    )
+
+
 @lru_cache(maxsize=1)
 def get_spacy_model():
+    import spacy  # noqa: PLC0415
+
     return spacy.load('pt_core_news_sm')
 
 
 def load_nltk_tokenizer():
+    import nltk  # noqa: PLC0415
+
     try:
         nltk.data.find('tokenizers/punkt_tab')
     except LookupError:
@@ -28,6 +45,8 @@ def load_nltk_tokenizer():
 
 
 def load_nltk_synonym_resources():
+    import nltk  # noqa: PLC0415
+
     try:
         nltk.data.find('corpora/wordnet')
     except LookupError:
@@ -40,9 +59,23 @@ def load_nltk_synonym_resources():
 
 @lru_cache(maxsize=1)
 def get_summarizer_tokenizer():
-    return T5Tokenizer.from_pretrained(MODEL_NAME, legacy=False)
+    import transformers  # noqa: PLC0415
+
+    return transformers.T5Tokenizer.from_pretrained(MODEL_NAME, legacy=False)
 
 
 @lru_cache(maxsize=1)
 def get_summarizer_model():
-    return T5ForConditionalGeneration.from_pretrained(MODEL_NAME)
+    import transformers  # noqa: PLC0415
+
+    return transformers.T5ForConditionalGeneration.from_pretrained(MODEL_NAME)
+
+
+def set_torch_threads(num_threads: int) -> None:
+    """
+    Limita as threads de CPU do torch no processo atual, para que N
+    processos de worker não disputem os mesmos núcleos.
+    """
+    import torch  # noqa: PLC0415
+
+    torch.set_num_threads(num_threads)
@@ -1,173 +1,220 @@
 from functools import lru_cache
-from typing import AsyncIterator
-
-from ...application.dependencies.models import (
-    get_spacy_model,
-    get_summarizer_model,
-    get_summarizer_tokenizer,
-    get_whisper_model,
-    load_nltk_synonym_resources,
-    load_nltk_tokenizer,
-)
+from typing import Callable
+
+import redis.asyncio as aioredis
+
+from ....core.config import settings
+from ...domain.models.scheduling import QueueLane
 from ...domain.ports.input import (
     AnalysisOrchestratorPort,
+    AnalysisSchedulingPort,
     AnalysisStatsPort,
-    AudioAnalysisPort,
-    LexicalRichnessPort,
-    ScoreCalculationPort,
-    SpeechAnalysisPort,
-    TopicAnalysisPort,
-    VocabularyAnalysisPort,
-)
-from ...domain.ports.input import (
-    SentimentAnalysisPort as SentimentAnalysisInputPort,
 )
 from ...domain.ports.output import (
     AnalysisRepositoryPort,
-    AudioPort,
-    FillerWordsAnalysisPort,
+    AnalysisSchedulerPort,
+    AnalysisStatsRepositoryPort,
+    BlobStorePort,
+    MetricsStorePort,
+    RateLimiterPort,
     StoragePort,
-    SynonymProviderPort,
     TaskQueuePort,
-    TopicModelPort,
-    TranscriptionPort,
-)
-from ...domain.ports.output import (
-    SentimentAnalysisPort as SentimentAnalysisOutputPort,
 )
 from ...domain.services.analysis_orchestrator_service import (
     AnalysisOrchestratorDependencies,
     AnalysisOrchestratorService,
 )
+from ...domain.services.analysis_scheduler_service import (
+    AnalysisSchedulerService,
+    SchedulerConfig,
+)
 from ...domain.services.analysis_stats_service import AnalysisStatsService
-from ...domain.services.audio_analysis_service import AudioAnalysisService
-from ...domain.services.lexical_richness_service import LexicalRichnessService
-from ...domain.services.score_calculation_service import ScoreCalculationService
-from ...domain.services.sentiment_analysis_service import (
-    SentimentAnalysisService,
+from ...infrastructure.adapters.metrics.redis_metrics_adapter import (
+    RedisMetricsAdapter,
 )
-from ...domain.services.speech_analysis_service import SpeechAnalysisService
-from ...domain.services.topic_analysis_service import TopicAnalysisService
-from ...domain.services.vocabulary_analysis_service import (
-    VocabularyAnalysisService,
+from ...infrastructure.adapters.notification.redis_adapter import (
+    RedisNotificationAdapter,
 )
-from ...infrastructure.adapters import (
-    AudioAdapter,
-    CeleryTaskQueueAdapter,
-    FillerWordsAnalysisAdapter,
-    HuggingFaceTopicAdapter,
-    NltkSynonymProviderAdapter,
-    WhisperAdapter,
+from ...infrastructure.adapters.scheduling.redis_rate_limiter_adapter import (
+    RedisRateLimiterAdapter,
+)
+from ...infrastructure.adapters.scheduling.redis_scheduler_adapter import (
+    RedisSchedulerAdapter,
 )
-from ...infrastructure.adapters.speech.sentiment_analysis_adapter import (
-    SentimentAnalysisAdapter,
+from ...infrastructure.adapters.task_queue.celery_adapter import (
+    CeleryTaskQueueAdapter,
 )
 from ...infrastructure.context.resource_manager import ResourceManager
 from ...infrastructure.persistance.adapters import (
     AnalysisRepositoryAdapter,
     AnalysisStatsRepositoryAdapter,
+    FilesystemBlobStoreAdapter,
+    RedisBlobReferences,
     StorageAdapter,
 )
 from ..adapters.sse_adapter import RedisSSEAdapter
+from ..services.analysis_result_service import AnalysisResultService
+from ..services.scheduler_sweeper import SchedulerSweeper
+
+# Dependências da API: leitura e enfileiramento. Nada aqui importa ou carrega
+# modelos; as portas de análise ficam em `worker`.
 
 
 def get_analysis_orchestrator() -> AnalysisOrchestratorPort:
     deps = AnalysisOrchestratorDependencies(
-        transcription_port=get_transcription_port(),
         storage_port=get_storage_port(),
-        speech_analysis_port=get_speech_analysis_port(),
-        audio_analysis_port=get_audio_analysis_port(),
         analysis_repository_port=get_analysis_repository(),
-        task_queue_port=get_task_queue_port(),
+        scheduling_port=get_scheduling_port(),
     )
     return AnalysisOrchestratorService(deps)
 
 
-def get_transcription_port() -> TranscriptionPort:
-    return WhisperAdapter(get_whisper_model())
+def create_filesystem_blob_store() -> BlobStorePort:
+    return FilesystemBlobStoreAdapter(settings.blob_store_dir)
 
 
-def get_storage_port() -> StoragePort:
-    return StorageAdapter()
+def create_s3_blob_store() -> BlobStorePort:
+    # Importado sob demanda: boto3 é uma dependência opcional
+    from ...infrastructure.persistance.adapters import (  # noqa: PLC0415
+        s3_blob_store_adapter,
+    )
 
+    return s3_blob_store_adapter.S3BlobStoreAdapter.create(
+        bucket=settings.s3_bucket,
+        part_size=settings.s3_part_size_bytes,
+        endpoint_url=settings.s3_endpoint_url,
+        region_name=settings.s3_region,
+        aws_access_key_id=settings.s3_access_key_id,
+        aws_secret_access_key=settings.s3_secret_access_key,
+    )
 
-def get_fillerwords_analysis_port() -> FillerWordsAnalysisPort:
-    return FillerWordsAnalysisAdapter(get_spacy_model())
 
+BLOB_STORE_BACKENDS: dict[str, Callable[[], BlobStorePort]] = {
+    'filesystem': create_filesystem_blob_store,
+    's3': create_s3_blob_store,
+}
 
-def get_audio_analysis_port() -> AudioAnalysisPort:
-    return AudioAnalysisService(get_audio_port())
 
+@lru_cache(maxsize=1)
+def get_blob_store() -> BlobStorePort:
+    try:
+        create_backend = BLOB_STORE_BACKENDS[settings.blob_store_backend]
+    except KeyError:
+        raise ValueError(
+            f'Unknown blob store backend {settings.blob_store_backend!r}; '
+            f'available: {sorted(BLOB_STORE_BACKENDS)}'
+        )
+    return create_backend()
 
-def get_audio_port() -> AudioPort:
-    return AudioAdapter()
 
+@lru_cache(maxsize=1)
+def get_storage_port() -> StoragePort:
+    return StorageAdapter(
+        get_blob_store(),
+        references=RedisBlobReferences(ResourceManager.get_redis_client),
+        read_chunk_bytes=settings.blob_read_chunk_bytes,
+    )
 
+
+@lru_cache(maxsize=1)
 def get_analysis_repository() -> AnalysisRepositoryPort:
     return AnalysisRepositoryAdapter()
 
 
+@lru_cache(maxsize=1)
 def get_task_queue_port() -> TaskQueuePort:
     return CeleryTaskQueueAdapter()
 
 
-async def get_sse_adapter() -> AsyncIterator[RedisSSEAdapter]:
-    async with ResourceManager.sse_adapter_context() as sse_adapter:
-        yield sse_adapter
+def get_scheduler_config() -> SchedulerConfig:
+    return SchedulerConfig(
+        short_max_seconds=settings.scheduler_short_max_seconds,
+        realtime_factor=settings.scheduler_realtime_factor,
+        lane_slots={
+            QueueLane.SHORT: settings.scheduler_short_slots,
+            QueueLane.LONG: settings.scheduler_long_slots,
+        },
+        max_wait_seconds={
+            QueueLane.SHORT: settings.admission_short_max_wait_seconds,
+            QueueLane.LONG: settings.admission_long_max_wait_seconds,
+        },
+        positions_interval_seconds=settings.scheduler_positions_interval_seconds,
+    )
 
 
-@lru_cache(maxsize=1)
-def get_synonym_provider() -> SynonymProviderPort:
-    load_nltk_synonym_resources()
-    return NltkSynonymProviderAdapter()
+def create_scheduler_port(
+    redis_client: Callable[[], aioredis.Redis],
+) -> AnalysisSchedulerPort:
+    return RedisSchedulerAdapter(
+        redis_client,
+        lane_slots=get_scheduler_config().lane_slots,
+        tenant_slots=settings.scheduler_user_max_running,
+        lease_seconds=settings.scheduler_lease_seconds,
+    )
 
 
 @lru_cache(maxsize=1)
-def get_vocabulary_analysis_port() -> VocabularyAnalysisPort:
-    return VocabularyAnalysisService(get_synonym_provider())
+def get_scheduler_port() -> AnalysisSchedulerPort:
+    return create_scheduler_port(ResourceManager.get_redis_client)
 
 
-@lru_cache(maxsize=1)
-def get_lexical_richness_port() -> LexicalRichnessPort:
-    return LexicalRichnessService()
+def get_scheduling_port() -> AnalysisSchedulingPort:
+    return AnalysisSchedulerService(
+        scheduler_port=get_scheduler_port(),
+        task_queue_port=get_task_queue_port(),
+        notification_port=RedisNotificationAdapter(
+            ResourceManager.get_redis_client()
+        ),
+        config=get_scheduler_config(),
+    )
 
 
-@lru_cache(maxsize=1)
-def get_topic_model_port() -> TopicModelPort:
-    return HuggingFaceTopicAdapter(
-        tokenizer=get_summarizer_tokenizer(), model=get_summarizer_model()
+def create_scheduler_sweeper() -> SchedulerSweeper:
+    return SchedulerSweeper(
+        get_scheduling_port,
+        interval_seconds=settings.scheduler_sweep_interval_seconds,
     )
 
 
 @lru_cache(maxsize=1)
-def get_topic_analysis_port() -> TopicAnalysisPort:
-    load_nltk_tokenizer()
-    return TopicAnalysisService(get_topic_model_port())
+def get_upload_rate_limiter() -> RateLimiterPort:
+    return RedisRateLimiterAdapter(
+        ResourceManager.get_redis_client,
+        capacity=settings.upload_rate_burst,
+        rate_per_second=settings.upload_rate_per_minute / 60,
+    )
 
 
 @lru_cache(maxsize=1)
-def get_analysis_stats_service() -> AnalysisStatsPort:
-    stats_repository = AnalysisStatsRepositoryAdapter()
-    return AnalysisStatsService(stats_repository)
+def get_metrics_store() -> MetricsStorePort:
+    return RedisMetricsAdapter(
+        ResourceManager.get_redis_client,
+        push_interval_seconds=settings.metrics_push_interval_seconds,
+    )
 
 
 @lru_cache(maxsize=1)
-def get_score_calculation_service() -> ScoreCalculationPort:
-    return ScoreCalculationService()
+def get_analysis_result_service() -> AnalysisResultService:
+    return AnalysisResultService(
+        get_analysis_repository(),
+        max_cache_bytes=settings.analysis_result_cache_max_bytes,
+    )
 
 
-@lru_cache(maxsize=1)
-def get_sentiment_analysis_port() -> SentimentAnalysisInputPort:
-    return SentimentAnalysisService(get_sentiment_analysis_adapter())
+def get_sse_adapter() -> RedisSSEAdapter:
+    return RedisSSEAdapter(
+        ResourceManager.get_event_broker(),
+        redis_client=ResourceManager.get_redis_client(),
+        analysis_repository=get_analysis_repository(),
+        heartbeat_seconds=settings.sse_heartbeat_seconds,
+    )
 
 
 @lru_cache(maxsize=1)
-def get_sentiment_analysis_adapter() -> SentimentAnalysisOutputPort:
-    return SentimentAnalysisAdapter()
+def get_analysis_stats_repository() -> AnalysisStatsRepositoryPort:
+    return AnalysisStatsRepositoryAdapter()
 
 
-def get_speech_analysis_port() -> SpeechAnalysisPort:
-    return SpeechAnalysisService(
-        fillerwords_analysis_port=get_fillerwords_analysis_port(),
-        sentiment_analysis_port=get_sentiment_analysis_port(),
-    )
+@lru_cache(maxsize=1)
+def get_analysis_stats_service() -> AnalysisStatsPort:
+    return AnalysisStatsService(get_analysis_stats_repository())
@@ -1,23 +1,94 @@
-from fastapi import File, HTTPException, UploadFile, status
+from typing import Annotated
 
-MAX_FILE_SIZE = 60 * 1024 * 1024
-ALLOWED_CONTENT_TYPES = ['audio/mpeg', 'audio/wav']
+from fastapi import Depends, Request
 
+from ....auth.application.dependencies.security import authentication
+from ....core.config import settings
+from ....core.exceptions import TooManyRequestsException
+from ...domain.models.audio import StoredAudio
+from ...domain.ports.input import AnalysisSchedulingPort
+from ...domain.ports.output import RateLimiterPort, StoragePort
+from ...infrastructure.adapters.audio.header_probe import AudioHeader
+from ..adapters.audio_upload_stream import AudioUploadStream
+from .services import (
+    get_scheduling_port,
+    get_storage_port,
+    get_upload_rate_limiter,
+)
 
-async def validate_audio_file(file: UploadFile = File(...)):
-    if file.content_type not in ALLOWED_CONTENT_TYPES:
-        raise HTTPException(
-            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-            detail=(
-                f'Unsupported file type: {file.content_type}. '
-                'Supported types are: ' + ', '.join(ALLOWED_CONTENT_TYPES)
-            ),
-        )
+# Tipos aceitos e a extensão do arquivo temporário de cada um
+ALLOWED_CONTENT_TYPES = {'audio/mpeg': '.mp3', 'audio/wav': '.wav'}
+
+# O corpo é lido por AudioUploadStream, fora do FastAPI; isto só descreve o
+# formulário na documentação
+AUDIO_UPLOAD_OPENAPI = {
+    'requestBody': {
+        'required': True,
+        'content': {
+            'multipart/form-data': {
+                'schema': {
+                    'type': 'object',
+                    'required': ['file'],
+                    'properties': {
+                        'file': {'type': 'string', 'format': 'binary'}
+                    },
+                }
+            }
+        },
+    }
+}
+
+
+async def receive_audio_upload(
+    request: Request,
+    storage_port: StoragePort = Depends(get_storage_port),
+    scheduling_port: AnalysisSchedulingPort = Depends(get_scheduling_port),
+) -> StoredAudio:
+    upload = AudioUploadStream(
+        request,
+        suffixes=ALLOWED_CONTENT_TYPES,
+        max_bytes=settings.upload_max_bytes,
+        max_duration=settings.upload_max_duration_seconds,
+    )
+
+    async def admit(header: AudioHeader) -> None:
+        # Com a fila cheia, responde 429 no primeiro trecho em vez de
+        # receber e gravar o arquivo inteiro; a admissão vale de novo antes
+        # de criar a análise, com a fila de então
+        await scheduling_port.admit(header.duration)
+
+    await upload.open()
+    stored_audio = await storage_port.save_temporary_audio(
+        upload.chunks(on_header=admit), upload.suffix
+    )
 
-    if file.size > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=(f'File size exceeds the limit of {MAX_FILE_SIZE} bytes.'),
+    stored_audio.filename = upload.filename
+    stored_audio.codec = upload.header.codec
+    stored_audio.duration = upload.header.duration
+    return stored_audio
+
+
+async def check_upload_rate(key: str, rate_limiter: RateLimiterPort) -> None:
+    retry_after = await rate_limiter.acquire(f'upload:{key}')
+    if retry_after > 0:
+        raise TooManyRequestsException(
+            message='Muitos envios em pouco tempo. Aguarde para enviar outro.',
+            retry_after=retry_after,
         )
 
-    return file
+
+async def limit_user_uploads(
+    user_id: Annotated[str, Depends(authentication)],
+    rate_limiter: RateLimiterPort = Depends(get_upload_rate_limiter),
+) -> None:
+    """Limite de envios por usuário, antes de receber o arquivo."""
+    await check_upload_rate(f'user:{user_id}', rate_limiter)
+
+
+async def limit_anonymous_uploads(
+    request: Request,
+    rate_limiter: RateLimiterPort = Depends(get_upload_rate_limiter),
+) -> None:
+    """Na v1, sem usuário, o limite é por endereço do cliente."""
+    client = request.client.host if request.client else 'unknown'
+    await check_upload_rate(f'client:{client}', rate_limiter)
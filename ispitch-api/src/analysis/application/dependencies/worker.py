@@ -0,0 +1,328 @@
+"""
+Grafo de dependências do worker de análise.
+
+Os modelos e os adapters que importam whisper, torch, transformers, spaCy e
+NLTK só são carregados quando uma porta é construída (no warm-up ou na
+primeira tarefa), nunca ao importar este módulo. A API usa apenas o grafo
+de `services`.
+
+No pipeline em estágios, cada worker atende só alguns grupos de etapas
+(`worker_stage_groups`) e constrói só as portas deles: o de transcrição
+carrega o Whisper, o de NLP o spaCy, o T5 e o BERT, o de prosódia o
+parselmouth.
+"""
+
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+from ....core.config import settings
+from ...domain.ports.input import (
+    AnalysisSchedulingPort,
+    AudioAnalysisPort,
+    LexicalRichnessPort,
+    ScoreCalculationPort,
+    SpeechAnalysisPort,
+    TopicAnalysisPort,
+    VocabularyAnalysisPort,
+)
+from ...domain.ports.input import (
+    SentimentAnalysisPort as SentimentAnalysisInputPort,
+)
+from ...domain.ports.output import (
+    AnalysisCachePort,
+    AnalysisSchedulerPort,
+    AudioNormalizationPort,
+    AudioPort,
+    FillerWordsAnalysisPort,
+    StoragePort,
+    SynonymProviderPort,
+    TopicModelPort,
+    TranscriptionPort,
+)
+from ...domain.ports.output import (
+    SentimentAnalysisPort as SentimentAnalysisOutputPort,
+)
+from ...domain.services.analysis_scheduler_service import (
+    AnalysisSchedulerService,
+)
+from ...domain.services.audio_analysis_service import AudioAnalysisService
+from ...domain.services.lexical_richness_service import LexicalRichnessService
+from ...domain.services.score_calculation_service import ScoreCalculationService
+from ...domain.services.sentiment_analysis_service import (
+    SentimentAnalysisService,
+)
+from ...domain.services.speech_analysis_service import SpeechAnalysisService
+from ...domain.services.topic_analysis_service import TopicAnalysisService
+from ...domain.services.vocabulary_analysis_service import (
+    VocabularyAnalysisService,
+)
+from ...infrastructure import adapters
+from ...infrastructure.context.worker_runtime import worker_runtime
+from ...infrastructure.persistance.adapters import (
+    DiskAnalysisCacheAdapter,
+    MongoAnalysisCacheAdapter,
+    RedisBlobReferences,
+    StorageAdapter,
+)
+from . import models
+from .services import (
+    create_scheduler_port,
+    get_analysis_repository,
+    get_analysis_stats_repository,
+    get_blob_store,
+    get_scheduler_config,
+    get_task_queue_port,
+)
+
+
+def create_openai_whisper_backend() -> TranscriptionPort:
+    return adapters.WhisperAdapter(
+        models.get_whisper_model(),
+        chunk_seconds=settings.transcription_chunk_seconds,
+        chunk_overlap_seconds=settings.transcription_chunk_overlap_seconds,
+        chunk_search_seconds=settings.transcription_chunk_search_seconds,
+    )
+
+
+def create_faster_whisper_backend() -> TranscriptionPort:
+    # Importado sob demanda: faster-whisper é uma dependência opcional
+    from ...infrastructure.adapters.transcription import (  # noqa: PLC0415
+        faster_whisper_adapter,
+    )
+
+    return faster_whisper_adapter.FasterWhisperAdapter(
+        models.get_faster_whisper_model(),
+        beam_size=settings.faster_whisper_beam_size,
+        batch_size=settings.faster_whisper_batch_size,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_whisper_batch_server():
+    from ...infrastructure.adapters.transcription import (  # noqa: PLC0415
+        whisper_batch_server,
+    )
+
+    return whisper_batch_server.WhisperBatchServer(
+        models.get_whisper_model(),
+        max_batch_size=settings.whisper_batch_max_size,
+        max_wait_ms=settings.whisper_batch_max_wait_ms,
+        timeout_seconds=settings.whisper_batch_timeout_seconds,
+    )
+
+
+def create_whisper_batched_backend() -> TranscriptionPort:
+    # Um único servidor por processo: com o pool de threads, as tarefas
+    # simultâneas do worker compartilham os batches
+    from ...infrastructure.adapters.transcription import (  # noqa: PLC0415
+        whisper_batched_adapter,
+    )
+
+    return whisper_batched_adapter.WhisperBatchedAdapter(
+        get_whisper_batch_server(),
+        chunk_seconds=settings.transcription_chunk_seconds,
+        chunk_overlap_seconds=settings.transcription_chunk_overlap_seconds,
+        chunk_search_seconds=settings.transcription_chunk_search_seconds,
+    )
+
+
+TRANSCRIPTION_BACKENDS: dict[str, Callable[[], TranscriptionPort]] = {
+    'openai-whisper': create_openai_whisper_backend,
+    'faster-whisper': create_faster_whisper_backend,
+    'whisper-batched': create_whisper_batched_backend,
+}
+
+
+@lru_cache(maxsize=1)
+def get_transcription_port() -> TranscriptionPort:
+    try:
+        create_backend = TRANSCRIPTION_BACKENDS[settings.transcription_backend]
+    except KeyError:
+        raise ValueError(
+            f'Unknown transcription backend '
+            f'{settings.transcription_backend!r}; available: '
+            f'{sorted(TRANSCRIPTION_BACKENDS)}'
+        )
+    return create_backend()
+
+
+@lru_cache(maxsize=1)
+def get_fillerwords_analysis_port() -> FillerWordsAnalysisPort:
+    return adapters.FillerWordsAnalysisAdapter(models.get_spacy_model())
+
+
+@lru_cache(maxsize=1)
+def get_audio_analysis_port() -> AudioAnalysisPort:
+    return AudioAnalysisService(get_audio_port())
+
+
+@lru_cache(maxsize=1)
+def get_audio_normalization_port() -> AudioNormalizationPort:
+    return adapters.PcmNormalizerAdapter()
+
+
+@lru_cache(maxsize=1)
+def get_audio_port() -> AudioPort:
+    return adapters.AudioAdapter()
+
+
+@lru_cache(maxsize=1)
+def get_synonym_provider() -> SynonymProviderPort:
+    models.load_nltk_synonym_resources()
+    return adapters.NltkSynonymProviderAdapter()
+
+
+@lru_cache(maxsize=1)
+def get_vocabulary_analysis_port() -> VocabularyAnalysisPort:
+    return VocabularyAnalysisService(get_synonym_provider())
+
+
+@lru_cache(maxsize=1)
+def get_lexical_richness_port() -> LexicalRichnessPort:
+    return LexicalRichnessService()
+
+
+@lru_cache(maxsize=1)
+def get_topic_model_port() -> TopicModelPort:
+    from ...infrastructure.adapters.topics import (  # noqa: PLC0415
+        huggingface_adapter,
+    )
+
+    return huggingface_adapter.HuggingFaceTopicAdapter(
+        tokenizer=models.get_summarizer_tokenizer(),
+        model=models.get_summarizer_model(),
+        generation=huggingface_adapter.GenerationConfig(
+            decoding=settings.topic_decoding,
+            num_beams=settings.topic_num_beams,
+            batch_size=settings.topic_batch_size,
+            cache_size=settings.topic_cache_size,
+        ),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_topic_analysis_port() -> TopicAnalysisPort:
+    models.load_nltk_tokenizer()
+    return TopicAnalysisService(get_topic_model_port())
+
+
+@lru_cache(maxsize=1)
+def get_score_calculation_service() -> ScoreCalculationPort:
+    return ScoreCalculationService()
+
+
+@lru_cache(maxsize=1)
+def get_sentiment_analysis_port() -> SentimentAnalysisInputPort:
+    return SentimentAnalysisService(get_sentiment_analysis_adapter())
+
+
+@lru_cache(maxsize=1)
+def get_sentiment_analysis_adapter() -> SentimentAnalysisOutputPort:
+    return adapters.SentimentAnalysisAdapter(
+        batch_size=settings.sentiment_batch_size,
+        max_length=settings.sentiment_max_length,
+        window_stride=settings.sentiment_window_stride,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_speech_analysis_port() -> SpeechAnalysisPort:
+    return SpeechAnalysisService(
+        fillerwords_analysis_port=get_fillerwords_analysis_port(),
+        sentiment_analysis_port=get_sentiment_analysis_port(),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_storage_port() -> StoragePort:
+    # O mesmo blob store da API, com as referências no Redis do runtime
+    return StorageAdapter(
+        get_blob_store(),
+        references=RedisBlobReferences(lambda: worker_runtime.redis_client),
+        read_chunk_bytes=settings.blob_read_chunk_bytes,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_scheduler_port() -> AnalysisSchedulerPort:
+    # O mesmo escalonador da API: o worker libera a vaga ao terminar
+    return create_scheduler_port(lambda: worker_runtime.redis_client)
+
+
+def get_scheduling_port() -> AnalysisSchedulingPort:
+    return AnalysisSchedulerService(
+        scheduler_port=get_scheduler_port(),
+        task_queue_port=get_task_queue_port(),
+        notification_port=worker_runtime.notification_port,
+        config=get_scheduler_config(),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_analysis_cache_port() -> AnalysisCachePort | None:
+    if settings.analysis_cache_backend == 'mongo':
+        return MongoAnalysisCacheAdapter(
+            max_entries=settings.analysis_cache_max_entries
+        )
+    if settings.analysis_cache_backend == 'disk':
+        return DiskAnalysisCacheAdapter(
+            directory=settings.analysis_cache_dir,
+            max_entries=settings.analysis_cache_max_entries,
+            ttl_seconds=settings.analysis_cache_ttl_seconds,
+        )
+    return None
+
+
+# Campo de AnalysisPort -> construtor da porta
+PORT_GETTERS: dict[str, Callable[[], Any]] = {
+    'audio_normalization_port': get_audio_normalization_port,
+    'transcription_port': get_transcription_port,
+    'speech_analysis_port': get_speech_analysis_port,
+    'audio_analysis_port': get_audio_analysis_port,
+    'vocabulary_analysis_port': get_vocabulary_analysis_port,
+    'lexical_richness_port': get_lexical_richness_port,
+    'topic_analysis_port': get_topic_analysis_port,
+    'score_calculation_port': get_score_calculation_service,
+    'storage_port': get_storage_port,
+}
+
+# Portas de que cada grupo de STAGE_GROUPS precisa
+STAGE_GROUP_PORTS: dict[str, tuple[str, ...]] = {
+    'transcribe': (
+        'audio_normalization_port',
+        'transcription_port',
+        'storage_port',
+    ),
+    'prosody': (
+        'audio_normalization_port',
+        'audio_analysis_port',
+        'storage_port',
+    ),
+    'nlp': (
+        'speech_analysis_port',
+        'vocabulary_analysis_port',
+        'lexical_richness_port',
+        'topic_analysis_port',
+    ),
+    'finalize': ('audio_analysis_port', 'score_calculation_port'),
+}
+
+
+def get_ports(group: Optional[str] = None) -> dict[str, Any]:
+    """As portas de um grupo de etapas ou, sem grupo, todas."""
+    names = STAGE_GROUP_PORTS[group] if group else PORT_GETTERS
+    return {name: PORT_GETTERS[name]() for name in names}
+
+
+def warm_up_worker_ports() -> None:
+    """
+    Builds every port used by the stage groups this worker serves, loading
+    their models (Whisper, spaCy, the NLTK resources, T5, the sentiment
+    pipeline) into the caches above.
+    """
+    for group in settings.worker_stage_groups:
+        get_ports(group)
+    get_analysis_repository()
+    get_analysis_stats_repository()
+    get_storage_port()
+    get_analysis_cache_port()
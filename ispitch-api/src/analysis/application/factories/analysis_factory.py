@@ -1,56 +1,138 @@
+from dataclasses import dataclass
+
+from ....core.config import settings
+from ...domain.models.scheduling import QueueLane
+from ...domain.models.stage_group import StageGroup
 from ...domain.ports.output import NotificationPort
 from ...domain.services.async_analysis_orchestrator_service import (
     AnalysisConfig,
     AnalysisPort,
     AsyncAnalysisOrchestratorService,
 )
-from ..dependencies import services as deps
+from ...infrastructure.adapters.audio import pcm_normalizer_adapter
+from ..dependencies import models
+from ..dependencies import worker as deps
+from ..services.analysis_stage_service import AnalysisStageService
 from ..services.analysis_workflow_service import (
     AsyncAnalysisWorkflowService,
 )
 
 
+def get_stage_models(group: StageGroup | None = None) -> dict[str, str]:
+    """
+    Modelo que produz cada etapa cacheável, usado na chave do cache. Só as
+    etapas de `group`, quando dado.
+    """
+    stage_models = {
+        'transcription': (
+            f'{settings.transcription_backend}:{settings.whisper_model}'
+            f':chunk{settings.transcription_chunk_seconds:g}'
+        ),
+        'duration': f'parselmouth:{pcm_normalizer_adapter.SAMPLE_RATE}hz',
+        'prosody': f'parselmouth:{pcm_normalizer_adapter.SAMPLE_RATE}hz',
+    }
+    # Resumos amostrados mudam a cada execução: sem chave, não são cacheados
+    if settings.topic_decoding != 'sample' and (
+        group is None or 'topics' in group.targets
+    ):
+        from ...infrastructure.adapters.topics import (  # noqa: PLC0415
+            huggingface_adapter,
+        )
+
+        # Os feixes e os limites de tamanho dos resumos mudam o texto gerado
+        stage_models['topics'] = (
+            f'{models.MODEL_NAME}:{settings.topic_decoding}'
+            f':beams{settings.topic_num_beams}'
+            f':words{huggingface_adapter.MAX_WORDS_FOR_SEGMENT}'
+            f':step{huggingface_adapter.SUMMARY_LENGTH_STEP}'
+        )
+    if group is None or 'sentiment' in group.targets:
+        # Sob demanda, para não importar transformers junto com as tarefas
+        # (nem nos workers que não rodam a etapa)
+        from ...infrastructure.adapters.speech import (  # noqa: PLC0415
+            sentiment_analysis_adapter,
+        )
+
+        # O tamanho das janelas, o passo e o lote mudam os escores
+        stage_models['sentiment'] = (
+            f'{sentiment_analysis_adapter.MODEL_NAME}'
+            f':len{settings.sentiment_max_length}'
+            f':stride{settings.sentiment_window_stride}'
+            f':batch{settings.sentiment_batch_size}'
+        )
+    return stage_models
+
+
+@dataclass
+class AnalysisJob:
+    """Dados de uma análise enfileirada, como recebidos pela tarefa."""
+
+    analysis_id: str
+    user_id: str | None
+    audio_key: str
+    filename: str
+    audio_hash: str | None = None
+    # Fila do escalonador, para devolver a vaga ao terminar
+    lane: str = QueueLane.SHORT.value
+    duration: float = 0.0
+    submitted_at: float | None = None
+
+
 class AsyncAnalysisFactory:
     @staticmethod
-    def create_workflow_service(
-        analysis_id: str,
-        user_id: str,
-        audio_path: str,
-        filename: str,
+    def create_orchestrator(
+        job: AnalysisJob,
         notification_port: NotificationPort,
-    ) -> AsyncAnalysisWorkflowService:
-        transcription_port = deps.get_transcription_port()
-        speech_analysis_port = deps.get_speech_analysis_port()
-        audio_analysis_port = deps.get_audio_analysis_port()
-        vocabulary_analysis_port = deps.get_vocabulary_analysis_port()
-        lexical_richness_port = deps.get_lexical_richness_port()
-        topic_analysis_port = deps.get_topic_analysis_port()
-        analysis_repository = deps.get_analysis_repository()
-        storage_port = deps.get_storage_port()
-        score_calculation_port = deps.get_score_calculation_service()
-
-        orchestrator = AsyncAnalysisOrchestratorService(
+        group: StageGroup | None = None,
+    ) -> AsyncAnalysisOrchestratorService:
+        """Sem `group`, com as portas de todas as etapas."""
+        return AsyncAnalysisOrchestratorService(
             config=AnalysisConfig(
-                analysis_id=analysis_id,
-                user_id=user_id,
-                audio_path=audio_path,
-                filename=filename,
+                analysis_id=job.analysis_id,
+                user_id=job.user_id,
+                audio_key=job.audio_key,
+                filename=job.filename,
+                max_workers=settings.analysis_max_workers,
+                audio_hash=job.audio_hash,
+                cache_version=settings.analysis_cache_version,
+                stage_models=get_stage_models(group),
             ),
             ports=AnalysisPort(
-                transcription_port=transcription_port,
-                speech_analysis_port=speech_analysis_port,
-                audio_analysis_port=audio_analysis_port,
-                vocabulary_analysis_port=vocabulary_analysis_port,
-                lexical_richness_port=lexical_richness_port,
-                topic_analysis_port=topic_analysis_port,
                 notification_port=notification_port,
-                score_calculation_port=score_calculation_port,
+                analysis_cache_port=deps.get_analysis_cache_port(),
+                **deps.get_ports(group.name if group else None),
             ),
         )
 
+    @staticmethod
+    def create_workflow_service(
+        job: AnalysisJob,
+        notification_port: NotificationPort,
+        group: StageGroup | None = None,
+    ) -> AsyncAnalysisWorkflowService:
+        """
+        O fluxo completo de uma análise: todas as etapas no modo monolítico,
+        ou só o grupo `finalize`, com os artefatos dos outros grupos, no
+        pipeline em estágios.
+        """
         return AsyncAnalysisWorkflowService(
-            orchestrator=orchestrator,
-            analysis_repository=analysis_repository,
+            orchestrator=AsyncAnalysisFactory.create_orchestrator(
+                job, notification_port, group
+            ),
+            analysis_repository=deps.get_analysis_repository(),
             notification_port=notification_port,
-            storage_port=storage_port,
+            storage_port=deps.get_storage_port(),
+            stats_repository=deps.get_analysis_stats_repository(),
+        )
+
+    @staticmethod
+    def create_stage_service(
+        job: AnalysisJob, notification_port: NotificationPort, group: StageGroup
+    ) -> AnalysisStageService:
+        return AnalysisStageService(
+            orchestrator=AsyncAnalysisFactory.create_orchestrator(
+                job, notification_port, group
+            ),
+            storage_port=deps.get_storage_port(),
+            group=group,
         )
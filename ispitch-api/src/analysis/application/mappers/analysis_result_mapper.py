@@ -0,0 +1,110 @@
+import json
+import zlib
+from datetime import datetime, timezone
+from typing import Optional
+
+from ...domain.models.analysis import Analysis
+from ...domain.models.analysis_summary import AnalysisSummary
+from ..rest.schemas import AnalysisResultEventSchema
+from .analysis_schema_mapper import AnalysisSchemaMapper
+
+# Partes do AnalysisSchema que podem ser pedidas separadamente; os campos
+# escalares (id, status, score, datas...) vão sempre na resposta.
+SECTIONS = ('transcription', 'speechAnalysis', 'audioAnalysis')
+
+
+class AnalysisResultMapper:
+    @staticmethod
+    def version(updated_at: datetime) -> int:
+        """
+        Version of a stored result: updated_at in epoch milliseconds, the
+        precision Mongo keeps, so the worker and the API compute the same
+        value before and after the round trip.
+        """
+        if updated_at.tzinfo is None:
+            updated_at = updated_at.replace(tzinfo=timezone.utc)
+        return int(updated_at.timestamp() * 1000)
+
+    @staticmethod
+    def etag(
+        analysis_id: str, version: int, sections: Optional[list[str]] = None
+    ) -> str:
+        suffix = f'-{"+".join(sections)}' if sections else ''
+        return f'"{analysis_id}-{version}{suffix}"'
+
+    @classmethod
+    def to_event(cls, analysis: Analysis) -> AnalysisResultEventSchema:
+        speech = analysis.speech_analysis
+        audio = analysis.audio_analysis
+        version = cls.version(analysis.updated_at)
+        return AnalysisResultEventSchema(
+            id=analysis.id,
+            filename=analysis.filename,
+            created_at=analysis.created_at,
+            status=analysis.status.value,
+            score=analysis.score,
+            duration=audio.duration if audio else 0.0,
+            speech_rate=audio.speech_rate if audio else 0.0,
+            filler_words_count=(
+                speech.fillerwords_analysis.total
+                if speech and speech.fillerwords_analysis
+                else 0
+            ),
+            pauses_count=(
+                speech.silence_analysis.pauses
+                if speech and speech.silence_analysis
+                else 0
+            ),
+            version=version,
+            etag=cls.etag(analysis.id, version),
+        )
+
+    @classmethod
+    def summary_to_event(
+        cls, summary: AnalysisSummary
+    ) -> AnalysisResultEventSchema:
+        """The same event built from the projected summary scalars."""
+        version = cls.version(summary.updated_at or summary.created_at)
+        return AnalysisResultEventSchema(
+            id=summary.id,
+            filename=summary.filename,
+            created_at=summary.created_at,
+            status=summary.status.value,
+            score=summary.score,
+            duration=summary.duration,
+            speech_rate=summary.speech_rate,
+            filler_words_count=summary.filler_words_count,
+            pauses_count=summary.pauses_count,
+            version=version,
+            etag=cls.etag(summary.id, version),
+        )
+
+    @staticmethod
+    def to_compressed_fields(analysis: Analysis) -> dict[str, bytes]:
+        """
+        JSON of each top-level field of the AnalysisSchema, compressed on
+        its own, so a response with only some sections neither decompresses
+        nor parses the others.
+        """
+        document = AnalysisSchemaMapper.from_model(analysis).model_dump(
+            mode='json', by_alias=True
+        )
+        return {
+            key: zlib.compress(json.dumps(value, separators=(',', ':')).encode())
+            for key, value in document.items()
+        }
+
+    @staticmethod
+    def from_compressed_fields(
+        fields: dict[str, bytes], sections: Optional[list[str]] = None
+    ) -> bytes:
+        keys = [
+            key
+            for key in fields
+            if sections is None or key not in SECTIONS or key in sections
+        ]
+        members = (
+            json.dumps(key).encode() + b':' + zlib.decompress(fields[key])
+            for key in keys
+        )
+        return b'{' + b','.join(members) + b'}'
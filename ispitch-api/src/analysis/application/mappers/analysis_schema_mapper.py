@@ -1,4 +1,5 @@
 from ...domain.models.analysis import Analysis
+from ...domain.models.analysis_summary import AnalysisSummary
 from ..mappers.fillerwords_analysis_schema_mapper import (
     FillerWordsAnalysisSchemaMapper,
 )
@@ -93,15 +94,13 @@ class AnalysisSchemaMapper:
         )
 
     @staticmethod
-    def to_summary(analysis: Analysis) -> AnalysisSummarySchema:
+    def to_summary(summary: AnalysisSummary) -> AnalysisSummarySchema:
         return AnalysisSummarySchema(
-            id=analysis.id,
-            user_id=analysis.user_id,
-            status=analysis.status,
-            filename=analysis.filename,
-            duration=analysis.audio_analysis.duration
-            if analysis.audio_analysis
-            else 0.0,
-            created_at=analysis.created_at,
-            score=analysis.score,
+            id=summary.id,
+            user_id=summary.user_id,
+            status=summary.status,
+            filename=summary.filename,
+            duration=summary.duration,
+            created_at=summary.created_at,
+            score=summary.score,
         )
@@ -0,0 +1,41 @@
+import base64
+import binascii
+import json
+import re
+from datetime import datetime
+
+from ....core.exceptions import ValidationException
+from ...domain.models.pagination import AnalysisCursor
+
+OBJECT_ID_PATTERN = re.compile(r'[0-9a-f]{24}')
+
+
+class CursorMapper:
+    """
+    Converts cursors to the opaque token sent as `nextCursor` and back.
+    """
+
+    @staticmethod
+    def to_token(cursor: AnalysisCursor) -> str:
+        payload = json.dumps(
+            {'t': cursor.created_at.isoformat(), 'id': cursor.id},
+            separators=(',', ':'),
+        )
+        token = base64.urlsafe_b64encode(payload.encode())
+        return token.decode().rstrip('=')
+
+    @staticmethod
+    def from_token(token: str) -> AnalysisCursor:
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded))
+            cursor = AnalysisCursor(
+                created_at=datetime.fromisoformat(payload['t']),
+                id=payload['id'],
+            )
+        except (binascii.Error, ValueError, TypeError, KeyError) as e:
+            raise ValidationException('Cursor inválido.', details=[str(e)])
+
+        if not OBJECT_ID_PATTERN.fullmatch(str(cursor.id)):
+            raise ValidationException('Cursor inválido.', details=['id'])
+        return cursor
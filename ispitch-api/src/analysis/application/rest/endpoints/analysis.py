@@ -1,34 +1,46 @@
-from typing import Annotated
+import math
+import re
+from datetime import datetime, timezone
+from typing import Annotated, Optional
 
 from fastapi import (
     APIRouter,
-    BackgroundTasks,
     Depends,
-    File,
+    Header,
     Query,
-    UploadFile,
+    Response,
     status,
 )
 
 from .....auth.application.dependencies.security import authentication
+from .....core.exceptions import NotFoundException, ValidationException
 from .....core.schemas import PaginationMetadata
 from ....application.dependencies.services import (
     get_analysis_orchestrator,
+    get_analysis_result_service,
     get_analysis_stats_service,
     get_sse_adapter,
 )
 from ....application.dependencies.validations import (
-    validate_audio_file,
+    AUDIO_UPLOAD_OPENAPI,
+    limit_anonymous_uploads,
+    limit_user_uploads,
+    receive_audio_upload,
 )
+from ....domain.models.audio import StoredAudio
+from ....domain.models.pagination import AnalysisCursor
 from ....domain.models.time_range import TimeRange
 from ....domain.ports.input import (
     AnalysisOrchestratorPort,
     AnalysisStatsPort,
 )
 from ...adapters.sse_adapter import RedisSSEAdapter
+from ...mappers.analysis_result_mapper import SECTIONS, AnalysisResultMapper
 from ...mappers.analysis_schema_mapper import AnalysisSchemaMapper
 from ...mappers.analysis_stats_mapper import AnalysisStatsMapper
+from ...mappers.cursor_mapper import CursorMapper
 from ...mappers.recent_analysis_mapper import RecentAnalysisMapper
+from ...services.analysis_result_service import AnalysisResultService
 from ..schemas import (
     AnalysisSchema,
     AnalysisStatsSchema,
@@ -36,6 +48,11 @@ from ..schemas import (
     RecentAnalysisSchema,
 )
 
+# IDs de entrada de stream Redis, devolvidos pelo EventSource ao reconectar
+EVENT_ID_PATTERN = re.compile(r'\d+-\d+')
+# ObjectId do Mongo em hexadecimal
+ANALYSIS_ID_PATTERN = re.compile(r'[0-9a-fA-F]{24}')
+
 router_v1 = APIRouter(prefix='/v1/analysis', tags=['Analysis'])
 router_v2 = APIRouter(prefix='/v2/analysis', tags=['Analysis'])
 
@@ -47,15 +64,16 @@ router_v2 = APIRouter(prefix='/v2/analysis', tags=['Analysis'])
     summary='Initiates a new audio analysis',
     description='Receives an audio file (.mp3 or .wav), '
     + 'starts the analysis process and returns an unique ID',
+    openapi_extra=AUDIO_UPLOAD_OPENAPI,
 )
 async def initiate_v1(
-    background_tasks: BackgroundTasks,
-    file: Annotated[UploadFile, Depends(validate_audio_file)] = File(...),
+    _: Annotated[None, Depends(limit_anonymous_uploads)],
+    audio: Annotated[StoredAudio, Depends(receive_audio_upload)],
     analysis_orchestrator: AnalysisOrchestratorPort = Depends(
         get_analysis_orchestrator
     ),
 ):
-    analysis_id = await analysis_orchestrator.initiate(file, background_tasks)
+    analysis_id = await analysis_orchestrator.initiate(audio)
     return analysis_id
 
 
@@ -87,15 +105,27 @@ async def get_by_id(
     status_code=status.HTTP_202_ACCEPTED,
     summary='Initiates a new audio analysis',
     description='Receives an audio file (.mp3 or .wav), '
-    + 'starts the analysis process and returns an unique ID',
+    + 'queues the analysis and returns an unique ID. Retry-After has the '
+    + 'estimated seconds until the result and X-Estimated-Start when the '
+    + 'analysis should start. Answers 429 with Retry-After when the user '
+    + 'sends too many files or the queue is full',
+    openapi_extra=AUDIO_UPLOAD_OPENAPI,
 )
 async def initiate(
-    file: Annotated[UploadFile, Depends(validate_audio_file)] = File(...),
+    response: Response,
+    # Autentica e aplica o limite de envios antes de receber o arquivo
+    user_id: Annotated[str, Depends(authentication)],
+    _: Annotated[None, Depends(limit_user_uploads)],
+    audio: Annotated[StoredAudio, Depends(receive_audio_upload)],
     orchestrator: AnalysisOrchestratorPort = Depends(get_analysis_orchestrator),
-    user_id: str = Depends(authentication),
 ):
-    analysis_id = await orchestrator.initiate_analysis(file, user_id)
-    return analysis_id
+    admission = await orchestrator.initiate_analysis(audio, user_id)
+    until_completion = (
+        admission.estimated_completion - datetime.now(timezone.utc)
+    ).total_seconds()
+    response.headers['Retry-After'] = str(max(1, math.ceil(until_completion)))
+    response.headers['X-Estimated-Start'] = admission.estimated_start.isoformat()
+    return admission.analysis_id
 
 
 @router_v2.get(
@@ -106,8 +136,20 @@ async def stream_status(
     analysis_id: str,
     sse_adapter: RedisSSEAdapter = Depends(get_sse_adapter),
     _: str = Depends(authentication),
+    last_event_id: Optional[str] = Header(None, alias='Last-Event-ID'),
 ):
-    return sse_adapter.stream_events(analysis_id)
+    """
+    Replays the events after `Last-Event-ID` (all of them on a new
+    connection) and then streams the live ones. Finished analyses are
+    answered right away and the stream is closed.
+    """
+    # Uma vez aberto, o stream só pode responder 200; o ID inválido é
+    # recusado antes
+    if not ANALYSIS_ID_PATTERN.fullmatch(analysis_id):
+        raise NotFoundException('Analysis')
+    if last_event_id and not EVENT_ID_PATTERN.fullmatch(last_event_id):
+        last_event_id = None
+    return sse_adapter.stream_events(analysis_id, last_event_id)
 
 
 @router_v2.get(
@@ -127,15 +169,36 @@ async def get_user_analyses(
         le=50,
         description='Number of results per page',
     ),
+    cursor: Optional[str] = Query(
+        None,
+        description='nextCursor of the previous page. When given, the page '
+        'is read after it instead of skipping `page - 1` pages',
+    ),
 ):
-    analyses, total = await orchestrator.get_by_user_id(user_id, page, page_size)
+    if cursor is not None:
+        analysis_page = await orchestrator.get_page_by_user_id(
+            user_id, page_size, CursorMapper.from_token(cursor)
+        )
+        analyses, total = analysis_page.analyses, analysis_page.total
+        next_cursor = analysis_page.next_cursor
+    else:
+        analyses, total = await orchestrator.get_by_user_id(
+            user_id, page, page_size
+        )
+        has_more = (page * page_size) < total
+        next_cursor = (
+            AnalysisCursor.after(analyses[-1]) if has_more and analyses else None
+        )
 
     items = [AnalysisSchemaMapper.to_summary(a) for a in analyses]
     metadata = PaginationMetadata(
         total=total,
         page=page,
         page_size=page_size,
-        has_more=(page * page_size) < total,
+        has_more=next_cursor is not None,
+        next_cursor=(
+            CursorMapper.to_token(next_cursor) if next_cursor else None
+        ),
     )
     return AnalysisSummaryResponseSchema(analyses=items, metadata=metadata)
 
@@ -171,3 +234,60 @@ async def get_recent_analysis(
 ):
     analysis = await orchestrator.find_recent_by_user_id(user_id)
     return RecentAnalysisMapper.from_model(analysis)
+
+
+@router_v2.get(
+    '/{analysis_id}',
+    response_model=AnalysisSchema,
+    summary='Get the full analysis result',
+    description='Retrieves the stored result of an analysis of the '
+    'authenticated user. Answers 304 when If-None-Match has the current ETag.',
+)
+async def get_result(
+    analysis_id: str,
+    result_service: AnalysisResultService = Depends(get_analysis_result_service),
+    user_id: str = Depends(authentication),
+    sections: Optional[str] = Query(
+        None,
+        description='Comma-separated sections to include '
+        f'({", ".join(SECTIONS)}). The scalar fields are always returned',
+    ),
+    if_none_match: Optional[str] = Header(None, alias='If-None-Match'),
+):
+    requested_sections = parse_sections(sections)
+    summary = await result_service.find_summary(analysis_id, user_id)
+    etag = AnalysisResultMapper.etag(
+        analysis_id, result_service.version(summary), requested_sections
+    )
+    # O navegador revalida a cada uso e recebe 304 enquanto a versão for a
+    # mesma, sem baixar o resultado de novo
+    headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+    if if_none_match and any(
+        tag.strip() in {etag, '*'} for tag in if_none_match.split(',')
+    ):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+        )
+
+    version, content = await result_service.get_result_json(
+        summary, requested_sections
+    )
+    headers['ETag'] = AnalysisResultMapper.etag(
+        analysis_id, version, requested_sections
+    )
+    return Response(
+        content=content, media_type='application/json', headers=headers
+    )
+
+
+def parse_sections(sections: Optional[str]) -> Optional[list[str]]:
+    if sections is None:
+        return None
+
+    requested = sorted({s.strip() for s in sections.split(',') if s.strip()})
+    invalid = [section for section in requested if section not in SECTIONS]
+    if invalid:
+        raise ValidationException(
+            'Seção inválida.', [f'Seções válidas: {", ".join(SECTIONS)}']
+        )
+    return requested
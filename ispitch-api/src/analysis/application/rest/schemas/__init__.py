@@ -1,4 +1,5 @@
 from .analysis import AnalysisSchema, AudioAnalysisSchema, SpeechAnalysisSchema
+from .analysis_result_event import AnalysisResultEventSchema
 from .analysis_stats import AnalysisStatsSchema
 from .analysis_summary import (
     AnalysisSummaryResponseSchema,
@@ -7,6 +8,7 @@ from .analysis_summary import (
 from .recent_analysis import RecentAnalysisSchema
 
 __all__ = [
+    'AnalysisResultEventSchema',
     'AnalysisSchema',
     'AnalysisStatsSchema',
     'AnalysisSummaryResponseSchema',
@@ -0,0 +1,13 @@
+from .recent_analysis import RecentAnalysisSchema
+
+
+class AnalysisResultEventSchema(RecentAnalysisSchema):
+    """
+    Payload of the analysis_result event: the summary shown while the job
+    runs, plus the version of the stored result. The full result is read
+    from GET /v2/analysis/{id}, which answers with the same ETag.
+    """
+
+    duration: float
+    version: int
+    etag: str
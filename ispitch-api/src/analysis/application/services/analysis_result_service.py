@@ -0,0 +1,91 @@
+import logging
+from collections import OrderedDict
+from typing import Optional
+
+from ....core.exceptions import NotFoundException
+from ...domain.models.analysis_summary import AnalysisSummary
+from ...domain.ports.output import AnalysisRepositoryPort
+from ..mappers.analysis_result_mapper import AnalysisResultMapper
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisResultService:
+    """
+    Caminho de leitura do resultado completo de uma análise.
+
+    A versão vem de uma projeção com poucos campos; o documento inteiro só
+    é lido do Mongo quando a versão não está no cache do processo, que
+    guarda o JSON de cada campo comprimido com zlib e é limitado em bytes.
+    Como um resultado salvo não muda sem mudar de versão, as entradas nunca
+    precisam ser invalidadas, só descartadas pelo LRU.
+    """
+
+    def __init__(
+        self, analysis_repository: AnalysisRepositoryPort, max_cache_bytes: int
+    ):
+        self.analysis_repository = analysis_repository
+        self.max_cache_bytes = max_cache_bytes
+        self._cache: OrderedDict[tuple[str, int], dict[str, bytes]] = (
+            OrderedDict()
+        )
+        self._cache_bytes = 0
+
+    async def find_summary(
+        self, analysis_id: str, user_id: str
+    ) -> AnalysisSummary:
+        summary = await self.analysis_repository.find_summary_by_id(analysis_id)
+        if summary is None or summary.user_id != user_id:
+            raise NotFoundException('Analysis')
+        return summary
+
+    @staticmethod
+    def version(summary: AnalysisSummary) -> int:
+        return AnalysisResultMapper.version(
+            summary.updated_at or summary.created_at
+        )
+
+    async def get_result_json(
+        self,
+        summary: AnalysisSummary,
+        sections: Optional[list[str]] = None,
+    ) -> tuple[int, bytes]:
+        """Versão e JSON do resultado, só com as seções pedidas."""
+        version = self.version(summary)
+        fields = self._cache_get(summary.id, version)
+        if fields is None:
+            analysis = await self.analysis_repository.find_by_id(summary.id)
+            if analysis is None:
+                raise NotFoundException('Analysis')
+            fields = AnalysisResultMapper.to_compressed_fields(analysis)
+            # A versão lida pode ser mais nova que a da projeção
+            version = AnalysisResultMapper.version(analysis.updated_at)
+            self._cache_set(summary.id, version, fields)
+
+        return version, AnalysisResultMapper.from_compressed_fields(
+            fields, sections
+        )
+
+    def _cache_get(
+        self, analysis_id: str, version: int
+    ) -> Optional[dict[str, bytes]]:
+        fields = self._cache.get((analysis_id, version))
+        if fields is not None:
+            self._cache.move_to_end((analysis_id, version))
+        return fields
+
+    def _cache_set(
+        self, analysis_id: str, version: int, fields: dict[str, bytes]
+    ) -> None:
+        size = sum(len(value) for value in fields.values())
+        if size > self.max_cache_bytes:
+            return
+
+        key = (analysis_id, version)
+        if key in self._cache:
+            return
+        self._cache[key] = fields
+        self._cache_bytes += size
+        while self._cache_bytes > self.max_cache_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= sum(len(value) for value in evicted.values())
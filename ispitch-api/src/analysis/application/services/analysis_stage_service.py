@@ -0,0 +1,47 @@
+import logging
+
+from ...domain.models.stage_group import StageGroup
+from ...domain.ports.input import AsyncAnalysisOrchestratorPort
+from ...domain.ports.output import StoragePort
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisStageService:
+    """
+    Um grupo de etapas do pipeline em estágios. Os resultados passam entre
+    as tarefas por referência: ficam no blob store e só as chaves vão pelo
+    broker.
+    """
+
+    def __init__(
+        self,
+        orchestrator: AsyncAnalysisOrchestratorPort,
+        storage_port: StoragePort,
+        group: StageGroup,
+    ):
+        self._orchestrator = orchestrator
+        self._storage_port = storage_port
+        self._group = group
+
+    async def execute(self, artifacts: dict[str, str]) -> dict[str, str]:
+        """
+        :param artifacts: Chave de cada resultado já produzido, por etapa.
+        :return: `artifacts` com as chaves dos resultados deste grupo.
+        """
+        seed = {
+            name: await self._storage_port.load_artifact(artifacts[name])
+            for name in self._group.inputs
+        }
+        results = await self._orchestrator.execute_group(self._group, seed)
+
+        refs = dict(artifacts)
+        for name, value in results.items():
+            refs[name] = await self._storage_port.save_artifact(
+                self._orchestrator.analysis_id, name, value
+            )
+        logger.info(
+            f'[{self._orchestrator.analysis_id}] '
+            f'Stage group {self._group.name} artifacts saved'
+        )
+        return refs
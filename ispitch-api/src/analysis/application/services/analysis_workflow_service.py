@@ -1,15 +1,18 @@
 import logging
 from datetime import datetime, timezone
+from typing import Optional
 
 from ...domain.models.analysis import Analysis, AnalysisStatus
 from ...domain.models.events import SseEvent
+from ...domain.models.stage_group import STAGE_GROUPS
 from ...domain.ports.input import AsyncAnalysisOrchestratorPort
 from ...domain.ports.output import (
     AnalysisRepositoryPort,
+    AnalysisStatsRepositoryPort,
     NotificationPort,
     StoragePort,
 )
-from ..mappers.analysis_schema_mapper import AnalysisSchemaMapper
+from ..mappers.analysis_result_mapper import AnalysisResultMapper
 
 logger = logging.getLogger(__name__)
 
@@ -21,35 +24,67 @@ class AsyncAnalysisWorkflowService:
         analysis_repository: AnalysisRepositoryPort,
         notification_port: NotificationPort,
         storage_port: StoragePort,
+        stats_repository: AnalysisStatsRepositoryPort,
     ):
         self._orchestrator = orchestrator
         self._analysis_repository = analysis_repository
         self._notification_port = notification_port
         self._storage_port = storage_port
+        self._stats_repository = stats_repository
 
-    async def execute(self) -> None:
+    async def execute(self, artifacts: Optional[dict[str, str]] = None) -> bool:
+        """
+        :param artifacts: No pipeline em estágios, a chave do resultado de
+            cada etapa já executada pelas outras tarefas.
+        :return: Se a análise terminou com sucesso.
+        """
         try:
-            result = await self._orchestrator.execute()
+            seed = await self._load_seed(artifacts)
+            result = await self._orchestrator.execute(seed)
             await self._handle_success(result)
+            return True
         except Exception as e:
             logger.error(
                 f'[{self._orchestrator.analysis_id}] Analysis failed: {e}',
                 exc_info=True,
             )
             await self._handle_failure(e)
+            return False
         finally:
-            await self._cleanup()
+            await self._cleanup(staged=artifacts is not None)
+
+    async def fail(self, error: Exception) -> None:
+        """Encerra como falha uma análise cuja tarefa de etapa falhou."""
+        logger.error(
+            f'[{self._orchestrator.analysis_id}] Analysis failed: {error}'
+        )
+        try:
+            await self._handle_failure(error)
+        finally:
+            await self._cleanup(staged=True)
+
+    async def _load_seed(
+        self, artifacts: Optional[dict[str, str]]
+    ) -> Optional[dict]:
+        if artifacts is None:
+            return None
+        return {
+            name: await self._storage_port.load_artifact(key)
+            for name, key in artifacts.items()
+        }
 
     async def _handle_success(self, result: Analysis) -> None:
         await self._analysis_repository.save(result)
+        await self._record_stats(result)
 
-        analysis_schema = AnalysisSchemaMapper.from_model(result)
-        result_json = analysis_schema.model_dump_json(by_alias=True)
+        # Só o resumo e a versão passam pelo Redis; o resultado completo é
+        # lido sob demanda em GET /v2/analysis/{id}.
+        result_event = AnalysisResultMapper.to_event(result)
 
         await self._notification_port.publish(
             analysis_id=self._orchestrator.analysis_id,
             event=SseEvent.ANALYSIS_RESULT,
-            data=result_json,
+            data=result_event.model_dump_json(by_alias=True),
         )
         await self._notification_port.publish(
             analysis_id=self._orchestrator.analysis_id,
@@ -57,6 +92,17 @@ class AsyncAnalysisWorkflowService:
             data=AnalysisStatus.COMPLETED.value,
         )
 
+    async def _record_stats(self, result: Analysis) -> None:
+        # A análise já está salva: uma falha no rollup não deve marcá-la
+        # como falha. O rebuild das estatísticas corrige os buckets.
+        try:
+            await self._stats_repository.record_completed(result)
+        except Exception as e:
+            logger.warning(
+                f'[{self._orchestrator.analysis_id}] '
+                f'Failed to update stats rollups: {e}'
+            )
+
     async def _handle_failure(self, error: Exception) -> None:
         failed_analysis = Analysis(
             id=self._orchestrator.analysis_id,
@@ -73,8 +119,12 @@ class AsyncAnalysisWorkflowService:
             data=AnalysisStatus.FAILED.value,
         )
 
-    async def _cleanup(self) -> None:
-        self._storage_port.cleanup_temporary_file(self._orchestrator.audio_path)
-        logger.info(
-            f'[{self._orchestrator.analysis_id}] Temporary audio file cleaned up'
-        )
+    async def _cleanup(self, staged: bool = False) -> None:
+        await self._storage_port.release_audio(self._orchestrator.audio_key)
+        logger.info(f'[{self._orchestrator.analysis_id}] Audio blob released')
+        if staged:
+            # Também os de grupos que não chegaram a terminar
+            await self._storage_port.delete_artifacts(
+                self._orchestrator.analysis_id,
+                {name for g in STAGE_GROUPS.values() for name in g.targets},
+            )
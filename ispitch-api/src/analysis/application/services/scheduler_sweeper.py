@@ -0,0 +1,46 @@
+import asyncio
+import logging
+from typing import Callable
+
+from ...domain.ports.input import AnalysisSchedulingPort
+
+logger = logging.getLogger(__name__)
+
+
+class SchedulerSweeper:
+    """
+    Chama `sweep` do escalonador periodicamente no processo da API. Sem
+    ele, a vaga de um worker que morreu sem liberá-la só voltaria quando
+    outra análise fosse enviada ou terminasse na mesma fila: num sistema
+    ocioso, nunca. Com várias réplicas, todas varrem; os scripts do
+    escalonador são atômicos, então isso só repete trabalho barato.
+    """
+
+    def __init__(
+        self,
+        scheduling_port: Callable[[], AnalysisSchedulingPort],
+        interval_seconds: float,
+    ):
+        self._scheduling_port = scheduling_port
+        self._interval_seconds = interval_seconds
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+        logger.info('Scheduler sweeper started')
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        logger.info('Scheduler sweeper stopped')
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval_seconds)
+            try:
+                await self._scheduling_port().sweep()
+            except Exception as e:
+                logger.warning(f'Scheduler sweep failed: {e}', exc_info=True)
@@ -1,29 +1,211 @@
-import asyncio
+import gc
 import logging
+import time
+
+from celery.concurrency.thread import TaskPool as ThreadTaskPool
+from celery.signals import (
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+    worker_ready,
+    worker_shutdown,
+)
 
 from ....core.celery_config import celery_app
-from ...infrastructure.context.resource_manager import ResourceManager
-from ..factories.analysis_factory import AsyncAnalysisFactory
+from ....core.config import settings
+from ....core.metrics import (
+    ANALYSES,
+    AUDIO_PROCESSED_SECONDS,
+    QUEUE_WAIT_SECONDS,
+    outcome,
+)
+from ...domain.models.scheduling import QueuedAnalysis, QueueLane
+from ...domain.models.stage_group import STAGE_GROUPS
+from ...infrastructure.context.worker_runtime import worker_runtime
+from ..dependencies import models
+from ..dependencies import worker as deps
+from ..factories.analysis_factory import AnalysisJob, AsyncAnalysisFactory
 
 logger = logging.getLogger(__name__)
 
 
-async def run_async_analysis(
-    analysis_id: str, user_id: str, audio_path: str, filename: str
-) -> None:
-    async with ResourceManager.analysis_resources() as notification_port:
-        workflow_service = AsyncAnalysisFactory.create_workflow_service(
-            analysis_id=analysis_id,
-            user_id=user_id,
-            audio_path=audio_path,
-            filename=filename,
-            notification_port=notification_port,
+@worker_init.connect
+def preload_worker_models(**kwargs) -> None:
+    """
+    No modo prefork, carrega os modelos no processo pai antes do fork: os
+    filhos herdam as páginas dos pesos por copy-on-write e as compartilham
+    enquanto só as lerem. O gc.freeze tira os objetos já carregados das
+    coleções do GC, que de outra forma tocariam (e copiariam) essas páginas.
+    """
+    if not settings.worker_preload_models:
+        return
+
+    logger.info('Preloading analysis models in the parent process...')
+    deps.warm_up_worker_ports()
+    gc.freeze()
+
+
+@worker_process_init.connect
+def init_worker_runtime(**kwargs) -> None:
+    # Disparado no processo que executa as tarefas (o próprio worker no
+    # pool solo, cada filho no prefork).
+    if settings.worker_torch_threads > 0:
+        models.set_torch_threads(settings.worker_torch_threads)
+    worker_runtime.start(warm_up=deps.warm_up_worker_ports)
+
+
+@worker_ready.connect
+def init_thread_pool_runtime(sender=None, **kwargs) -> None:
+    # O pool de threads não dispara worker_process_init: as tarefas rodam
+    # no próprio processo do worker e compartilham o runtime (e o servidor
+    # de batches do Whisper).
+    if isinstance(getattr(sender, 'pool', None), ThreadTaskPool):
+        if settings.worker_torch_threads > 0:
+            models.set_torch_threads(settings.worker_torch_threads)
+        worker_runtime.start(warm_up=deps.warm_up_worker_ports)
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def shutdown_worker_runtime(**kwargs) -> None:
+    worker_runtime.stop()
+
+
+async def release_slot(job: AnalysisJob, succeeded: bool) -> None:
+    """
+    Devolve a vaga da análise ao escalonador, que libera as seguintes. Só as
+    análises bem-sucedidas entram na medida do fator de tempo real.
+    """
+    ANALYSES.inc(lane=job.lane, outcome=outcome(succeeded))
+    AUDIO_PROCESSED_SECONDS.inc(
+        job.duration, lane=job.lane, outcome=outcome(succeeded)
+    )
+    queued = QueuedAnalysis(
+        analysis_id=job.analysis_id,
+        user_id=job.user_id,
+        audio_key=job.audio_key,
+        filename=job.filename,
+        lane=QueueLane(job.lane),
+        duration=job.duration,
+        audio_hash=job.audio_hash,
+        submitted_at=job.submitted_at,
+    )
+    # Sem a liberação, a vaga só volta quando a concessão vencer
+    try:
+        await deps.get_scheduling_port().complete(queued, succeeded)
+    except Exception as e:
+        logger.error(
+            f'[{job.analysis_id}] Failed to release the scheduler slot: {e}',
+            exc_info=True,
         )
-        await workflow_service.execute()
+
+
+def observe_queue_wait(job: AnalysisJob) -> None:
+    """Espera no escalonador e no broker, até a primeira tarefa começar."""
+    if job.submitted_at is not None:
+        QUEUE_WAIT_SECONDS.observe(time.time() - job.submitted_at, lane=job.lane)
+
+
+async def run_async_analysis(job: AnalysisJob) -> None:
+    workflow_service = AsyncAnalysisFactory.create_workflow_service(
+        job=job, notification_port=worker_runtime.notification_port
+    )
+    succeeded = False
+    try:
+        succeeded = await workflow_service.execute()
+    finally:
+        await release_slot(job, succeeded)
 
 
 @celery_app.task(name='run_analysis')
-def run_analysis(analysis_id: str, user_id: str, audio_path: str, filename: str):
-    logger.info(f'[{analysis_id}] Starting async analysis task')
-    asyncio.run(run_async_analysis(analysis_id, user_id, audio_path, filename))
-    logger.info(f'[{analysis_id}] Async analysis task completed')
+def run_analysis(job: dict):
+    logger.info(f'[{job["analysis_id"]}] Starting async analysis task')
+    analysis_job = AnalysisJob(**job)
+    observe_queue_wait(analysis_job)
+    worker_runtime.run(run_async_analysis(analysis_job))
+    logger.info(f'[{job["analysis_id"]}] Async analysis task completed')
+
+
+# Pipeline em estágios (ANALYSIS_PIPELINE=staged): cada grupo de etapas é uma
+# tarefa na fila de mesmo nome, e cada worker carrega só os modelos dos grupos
+# que atende (WORKER_STAGE_GROUPS). Os resultados vão pelo blob store; entre
+# as tarefas passam só as chaves.
+
+
+async def run_stage_group(
+    job: AnalysisJob, group_name: str, artifacts: dict[str, str]
+) -> dict[str, str]:
+    stage_service = AsyncAnalysisFactory.create_stage_service(
+        job=job,
+        notification_port=worker_runtime.notification_port,
+        group=STAGE_GROUPS[group_name],
+    )
+    return await stage_service.execute(artifacts)
+
+
+async def finalize_async_analysis(
+    job: AnalysisJob, artifacts: dict[str, str]
+) -> None:
+    workflow_service = AsyncAnalysisFactory.create_workflow_service(
+        job=job,
+        notification_port=worker_runtime.notification_port,
+        group=STAGE_GROUPS['finalize'],
+    )
+    succeeded = False
+    try:
+        succeeded = await workflow_service.execute(artifacts)
+    finally:
+        await release_slot(job, succeeded)
+
+
+async def fail_async_analysis(job: AnalysisJob, error: Exception) -> None:
+    workflow_service = AsyncAnalysisFactory.create_workflow_service(
+        job=job,
+        notification_port=worker_runtime.notification_port,
+        group=STAGE_GROUPS['finalize'],
+    )
+    try:
+        await workflow_service.fail(error)
+    finally:
+        await release_slot(job, succeeded=False)
+
+
+@celery_app.task(name='analysis.transcribe')
+def transcribe(job: dict) -> dict[str, str]:
+    logger.info(f'[{job["analysis_id"]}] Starting transcribe stage task')
+    analysis_job = AnalysisJob(**job)
+    # Começa junto com prosody; a transcrição é a que está no caminho crítico
+    observe_queue_wait(analysis_job)
+    return worker_runtime.run(run_stage_group(analysis_job, 'transcribe', {}))
+
+
+@celery_app.task(name='analysis.prosody')
+def prosody(job: dict) -> dict[str, str]:
+    logger.info(f'[{job["analysis_id"]}] Starting prosody stage task')
+    return worker_runtime.run(run_stage_group(AnalysisJob(**job), 'prosody', {}))
+
+
+@celery_app.task(name='analysis.nlp')
+def nlp(results: list[dict[str, str]], job: dict) -> dict[str, str]:
+    """Recebe os artefatos de transcribe e prosody (o chord)."""
+    logger.info(f'[{job["analysis_id"]}] Starting nlp stage task')
+    artifacts = {name: key for result in results for name, key in result.items()}
+    return worker_runtime.run(
+        run_stage_group(AnalysisJob(**job), 'nlp', artifacts)
+    )
+
+
+@celery_app.task(name='analysis.finalize')
+def finalize(artifacts: dict[str, str], job: dict) -> None:
+    logger.info(f'[{job["analysis_id"]}] Starting finalize stage task')
+    worker_runtime.run(finalize_async_analysis(AnalysisJob(**job), artifacts))
+    logger.info(f'[{job["analysis_id"]}] Async analysis task completed')
+
+
+@celery_app.task(name='analysis.fail')
+def fail(request, exc, traceback, job: dict) -> None:
+    """
+    Errback do pipeline: chamado uma vez quando qualquer tarefa de etapa
+    falha, no worker dela.
+    """
+    worker_runtime.run(fail_async_analysis(AnalysisJob(**job), exc))
@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from .analysis import AnalysisStatus
+
+
+@dataclass
+class AnalysisSummary:
+    """
+    Scalars of an analysis shown in the history list and on the dashboard,
+    read without the transcription and the prosody contours.
+    """
+
+    id: str
+    status: AnalysisStatus
+    filename: str
+    created_at: datetime
+    user_id: Optional[str] = None
+    score: Optional[int] = 0
+    duration: float = 0.0
+    speech_rate: float = 0.0
+    filler_words_count: int = 0
+    pauses_count: int = 0
+    updated_at: Optional[datetime] = None
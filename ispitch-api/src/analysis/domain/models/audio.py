@@ -0,0 +1,50 @@
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+
+@dataclass
+class AudioContext:
+    """
+    Handle to an audio file decoded for a single analysis.
+
+    Audio adapters extend it with the decoded signal and the objects derived
+    from it, so every prosody step reuses the same decode.
+    """
+
+    audio_path: str
+
+
+@dataclass
+class StoredAudio:
+    """
+    Upload written to the blob store under `key`, with the SHA-256 of its
+    content computed while it was written. `codec` and `duration` come from
+    the header read during the upload; `duration` is None when the header
+    alone does not tell it.
+    """
+
+    key: str
+    content_hash: str
+    size: int
+    filename: Optional[str] = None
+    codec: Optional[str] = None
+    duration: Optional[float] = None
+
+
+@dataclass
+class NormalizedAudio:
+    """
+    Upload (blob `source_path`) decoded once to mono float32 PCM at
+    `sample_rate`, kept on local disk at `pcm_path`. `samples` is the
+    memory-mapped array of that file, shared by transcription, prosody and
+    duration without decoding the upload again.
+    """
+
+    source_path: str
+    pcm_path: str
+    sample_rate: int
+    samples: Any = field(repr=False)
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / self.sample_rate
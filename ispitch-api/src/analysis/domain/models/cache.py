@@ -0,0 +1,23 @@
+import hashlib
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class StageCacheKey:
+    """
+    Identifies the result of one analysis stage for one audio content.
+
+    The same audio analyzed by the same model under the same pipeline
+    version always produces an interchangeable result, so the key ignores
+    the analysis and the user.
+    """
+
+    audio_hash: str
+    stage: str
+    model: str
+    version: str
+
+    @property
+    def digest(self) -> str:
+        raw = f'{self.audio_hash}:{self.stage}:{self.model}:{self.version}'
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
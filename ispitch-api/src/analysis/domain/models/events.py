@@ -4,3 +4,6 @@ from enum import Enum
 class SseEvent(str, Enum):
     STATUS_UPDATE = 'status_update'
     ANALYSIS_RESULT = 'analysis_result'
+    STAGE_UPDATE = 'stage_update'
+    PARTIAL_TRANSCRIPT = 'partial_transcript'
+    QUEUE_UPDATE = 'queue_update'
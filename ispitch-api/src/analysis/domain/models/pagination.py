@@ -0,0 +1,27 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from .analysis_summary import AnalysisSummary
+
+
+@dataclass(frozen=True)
+class AnalysisCursor:
+    """
+    Position of an analysis in the user's list, ordered by (created_at, id)
+    descending. A page requested with a cursor starts right after it.
+    """
+
+    created_at: datetime
+    id: str
+
+    @classmethod
+    def after(cls, analysis: AnalysisSummary) -> 'AnalysisCursor':
+        return cls(created_at=analysis.created_at, id=analysis.id)
+
+
+@dataclass
+class AnalysisPage:
+    analyses: list[AnalysisSummary]
+    total: int
+    next_cursor: Optional[AnalysisCursor] = None
@@ -0,0 +1,69 @@
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+
+class QueueLane(str, Enum):
+    """Fila por duração: os áudios curtos não esperam atrás dos longos."""
+
+    SHORT = 'short'
+    LONG = 'long'
+
+
+@dataclass
+class QueuedAnalysis:
+    """Uma análise aguardando ou ocupando uma vaga do escalonador."""
+
+    analysis_id: str
+    user_id: Optional[str]
+    audio_key: str
+    filename: str
+    lane: QueueLane
+    duration: float
+    audio_hash: Optional[str] = None
+    # Instante (epoch) da submissão, para medir a espera até a execução
+    submitted_at: Optional[float] = None
+
+    @property
+    def tenant(self) -> str:
+        """
+        Quem divide as vagas de forma justa. Sem usuário (v1), cada análise
+        conta como um tenant próprio.
+        """
+        return self.user_id or f'anonymous:{self.analysis_id}'
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), 'lane': self.lane.value}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'QueuedAnalysis':
+        return cls(**{**data, 'lane': QueueLane(data['lane'])})
+
+
+@dataclass
+class QueuePosition:
+    analysis_id: str
+    lane: QueueLane
+    position: int
+    # Segundos de áudio das análises na frente desta, na mesma fila
+    audio_ahead: float
+
+
+@dataclass
+class LaneLoad:
+    # Segundos de áudio aguardando ou em execução na fila
+    audio_seconds: float
+    # Segundos de vaga ocupada por segundo de áudio, medidos nas análises
+    # concluídas (média móvel); None antes da primeira
+    realtime_factor: Optional[float]
+
+
+@dataclass
+class Admission:
+    """Estimativa dada a uma análise aceita."""
+
+    lane: QueueLane
+    estimated_start: datetime
+    estimated_completion: datetime
+    analysis_id: Optional[str] = None
@@ -0,0 +1,38 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class StageGroup:
+    """
+    Etapas executadas juntas por uma tarefa do pipeline em estágios.
+    `inputs` são os resultados de outros grupos que ela recebe prontos.
+    """
+
+    name: str
+    targets: tuple[str, ...]
+    inputs: tuple[str, ...] = ()
+
+
+SPEECH_STAGES = (
+    'silence',
+    'fillers',
+    'vocabulary',
+    'lexical_richness',
+    'topics',
+    'sentiment',
+)
+AUDIO_STAGES = ('duration', 'prosody')
+
+STAGE_GROUPS = {
+    group.name: group
+    for group in (
+        StageGroup('transcribe', targets=('transcription',)),
+        StageGroup('prosody', targets=AUDIO_STAGES),
+        StageGroup('nlp', targets=SPEECH_STAGES, inputs=('transcription',)),
+        StageGroup(
+            'finalize',
+            targets=('score',),
+            inputs=('transcription', *SPEECH_STAGES, *AUDIO_STAGES),
+        ),
+    )
+}
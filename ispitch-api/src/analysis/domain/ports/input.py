@@ -1,15 +1,18 @@
 from abc import ABC, abstractmethod
-from typing import List, Tuple
-
-from fastapi import BackgroundTasks, UploadFile
+from typing import Any, List, Optional, Tuple
 
 from ..models.analysis import Analysis
 from ..models.analysis_stats import AnalysisStats
+from ..models.analysis_summary import AnalysisSummary
+from ..models.audio import AudioContext, NormalizedAudio, StoredAudio
 from ..models.fillerwords import FillerWordsAnalysis
 from ..models.lexical_richness import LexicalRichnessAnalysis
+from ..models.pagination import AnalysisCursor, AnalysisPage
 from ..models.prosody import ProsodyAnalysis
+from ..models.scheduling import Admission, QueuedAnalysis
 from ..models.sentiment import SentimentAnalysis
 from ..models.silence import SilenceAnalysis
+from ..models.stage_group import StageGroup
 from ..models.time_range import TimeRange
 from ..models.topic import TopicAnalysis
 from ..models.transcription import Transcription
@@ -18,13 +21,13 @@ from ..models.vocabulary import VocabularyAnalysis
 
 class AnalysisOrchestratorPort(ABC):
     @abstractmethod
-    def initiate(
-        self, file: UploadFile, background_tasks: BackgroundTasks
-    ) -> str:
+    def initiate(self, audio: StoredAudio) -> str:
         pass
 
     @abstractmethod
-    def initiate_analysis(self, file: UploadFile, user_id: str) -> str:
+    def initiate_analysis(
+        self, audio: StoredAudio, user_id: Optional[str]
+    ) -> Admission:
         pass
 
     @abstractmethod
@@ -34,17 +37,61 @@ class AnalysisOrchestratorPort(ABC):
     @abstractmethod
     async def get_by_user_id(
         self, user_id: str, page: int, page_size: int
-    ) -> Tuple[List[Analysis], int]:
+    ) -> Tuple[List[AnalysisSummary], int]:
+        pass
+
+    @abstractmethod
+    async def get_page_by_user_id(
+        self, user_id: str, page_size: int, cursor: Optional[AnalysisCursor]
+    ) -> AnalysisPage:
+        pass
+
+    @abstractmethod
+    async def find_recent_by_user_id(self, user_id: str) -> AnalysisSummary:
         pass
 
+
+class AnalysisSchedulingPort(ABC):
     @abstractmethod
-    async def find_recent_by_user_id(self, user_id: str) -> Analysis:
+    async def admit(self, duration: Optional[float]) -> Admission:
+        """
+        Estima a espera de uma análise do áudio de `duration` segundos ou a
+        recusa se a fila estiver cheia.
+        """
+        pass
+
+    @abstractmethod
+    async def submit(
+        self, analysis_id: str, user_id: Optional[str], audio: StoredAudio
+    ) -> None:
+        """
+        Só levanta exceção se a análise não entrou no escalonador: depois
+        disso, ela é de responsabilidade dele.
+        """
+        pass
+
+    @abstractmethod
+    async def complete(self, job: QueuedAnalysis, succeeded: bool) -> None:
+        pass
+
+    @abstractmethod
+    async def sweep(self) -> None:
+        """
+        Redistribui as vagas de todas as filas: recupera as de workers que
+        morreram sem liberá-las e atualiza as posições publicadas.
+        """
         pass
 
 
 class AsyncAnalysisOrchestratorPort(ABC):
     @abstractmethod
-    async def execute(self) -> Analysis:
+    async def execute(self, seed: Optional[dict[str, Any]] = None) -> Analysis:
+        pass
+
+    @abstractmethod
+    async def execute_group(
+        self, group: StageGroup, seed: dict[str, Any]
+    ) -> dict[str, Any]:
         pass
 
 
@@ -63,10 +110,14 @@ class SpeechAnalysisPort(ABC):
 
 
 class AudioAnalysisPort(ABC):
+    @abstractmethod
+    def load_audio(self, audio: NormalizedAudio) -> AudioContext:
+        pass
+
     @abstractmethod
     def get_audio_duration(
         self,
-        audio_path: str,
+        audio: AudioContext,
     ) -> float:
         pass
 
@@ -81,7 +132,7 @@ class AudioAnalysisPort(ABC):
         pass
 
     @abstractmethod
-    def get_prosody_analysis(self, audio_path: str) -> ProsodyAnalysis:
+    def get_prosody_analysis(self, audio: AudioContext) -> ProsodyAnalysis:
         pass
 
 
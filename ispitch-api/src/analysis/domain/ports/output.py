@@ -1,37 +1,131 @@
 from abc import ABC, abstractmethod
-from typing import List, Tuple
-
-from fastapi import UploadFile
+from typing import (
+    Any,
+    AsyncIterable,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 from src.analysis.domain.models.analysis import Analysis
 
 from ..models.analysis_stats import AnalysisStats
+from ..models.analysis_summary import AnalysisSummary
+from ..models.audio import AudioContext, NormalizedAudio, StoredAudio
+from ..models.cache import StageCacheKey
 from ..models.events import SseEvent
 from ..models.fillerwords import FillerWordsAnalysis
+from ..models.pagination import AnalysisCursor
 from ..models.prosody import (
     IntensityAnalysis,
     PitchAnalysis,
     VocalQualityAnalysis,
 )
+from ..models.scheduling import (
+    LaneLoad,
+    QueuedAnalysis,
+    QueueLane,
+    QueuePosition,
+)
 from ..models.sentiment import SentimentAnalysis
 from ..models.time_range import TimeRange
 from ..models.topic import TopicAnalysis
 from ..models.transcription import Transcription
 
+PartialTranscriptCallback = Callable[[Transcription], None]
+
 
 class TranscriptionPort(ABC):
     @abstractmethod
-    def transcribe(self, audio_path: str) -> Transcription:
+    def transcribe(
+        self,
+        audio: NormalizedAudio,
+        on_partial: Optional[PartialTranscriptCallback] = None,
+    ) -> Transcription:
         pass
 
 
 class StoragePort(ABC):
     @abstractmethod
-    def save_temporary_audio(self, file: UploadFile) -> str:
+    async def save_temporary_audio(
+        self, chunks: AsyncIterable[bytes], suffix: str
+    ) -> StoredAudio:
+        pass
+
+    @abstractmethod
+    def read_audio(self, key: str) -> Iterator[bytes]:
+        pass
+
+    @abstractmethod
+    async def release_audio(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    async def save_artifact(
+        self, analysis_id: str, name: str, value: Any
+    ) -> str:
+        """Guarda o resultado de uma etapa e devolve a chave dele."""
+        pass
+
+    @abstractmethod
+    async def load_artifact(self, key: str) -> Any:
+        pass
+
+    @abstractmethod
+    async def delete_artifacts(
+        self, analysis_id: str, names: Iterable[str]
+    ) -> None:
+        pass
+
+
+class BlobWriter(ABC):
+    """Escrita de um blob cuja chave só é conhecida no fim."""
+
+    @abstractmethod
+    def write(self, data: bytes) -> None:
+        pass
+
+    @abstractmethod
+    def commit(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def abort(self) -> None:
+        pass
+
+
+class BlobStorePort(ABC):
+    @abstractmethod
+    def open_writer(self) -> BlobWriter:
+        pass
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        pass
+
+    @abstractmethod
+    def size(self, key: str) -> int:
+        pass
+
+    @abstractmethod
+    def read_range(self, key: str, start: int, length: int) -> bytes:
         pass
 
     @abstractmethod
-    def cleanup_temporary_file(self, file_path: str):
+    def delete(self, key: str) -> None:
+        pass
+
+
+class AudioNormalizationPort(ABC):
+    @abstractmethod
+    def normalize(self, source: str, chunks: Iterable[bytes]) -> NormalizedAudio:
+        pass
+
+    @abstractmethod
+    def release(self, audio: NormalizedAudio) -> None:
         pass
 
 
@@ -43,19 +137,23 @@ class FillerWordsAnalysisPort(ABC):
 
 class AudioPort(ABC):
     @abstractmethod
-    def get_audio_duration(self, audio_path: str) -> float:
+    def load_audio(self, audio: NormalizedAudio) -> AudioContext:
         pass
 
     @abstractmethod
-    def get_pitch_analysis(cls, audio_path: str) -> PitchAnalysis:
+    def get_audio_duration(self, audio: AudioContext) -> float:
         pass
 
     @abstractmethod
-    def get_intensity_analysis(cls, audio_path: str) -> IntensityAnalysis:
+    def get_pitch_analysis(cls, audio: AudioContext) -> PitchAnalysis:
         pass
 
     @abstractmethod
-    def get_vocal_quality(cls, audio_path: str) -> VocalQualityAnalysis:
+    def get_intensity_analysis(cls, audio: AudioContext) -> IntensityAnalysis:
+        pass
+
+    @abstractmethod
+    def get_vocal_quality(cls, audio: AudioContext) -> VocalQualityAnalysis:
         pass
 
 
@@ -68,14 +166,32 @@ class AnalysisRepositoryPort(ABC):
     def find_by_id(self, analysis_id: str) -> Analysis:
         pass
 
+    @abstractmethod
+    async def find_summary_by_id(
+        self, analysis_id: str
+    ) -> Optional[AnalysisSummary]:
+        pass
+
     @abstractmethod
     async def find_by_user_id(
         self, user_id: str, page: int, page_size: int
-    ) -> Tuple[List[Analysis], int]:
+    ) -> Tuple[List[AnalysisSummary], int]:
         pass
 
     @abstractmethod
-    async def find_recent_by_user_id(self, user_id: str) -> Analysis:
+    async def find_after_cursor(
+        self, user_id: str, limit: int, cursor: Optional[AnalysisCursor]
+    ) -> List[AnalysisSummary]:
+        pass
+
+    @abstractmethod
+    async def count_by_user_id(self, user_id: str) -> int:
+        pass
+
+    @abstractmethod
+    async def find_recent_by_user_id(
+        self, user_id: str
+    ) -> Optional[AnalysisSummary]:
         pass
 
     @abstractmethod
@@ -94,12 +210,94 @@ class NotificationPort(ABC):
     ) -> None:
         pass
 
+    @abstractmethod
+    async def publish_many(
+        self, events: list[tuple[str, SseEvent, str]]
+    ) -> None:
+        """Publica vários eventos (analysis_id, evento, dados) de uma vez."""
+        pass
+
 
 class TaskQueuePort(ABC):
     @abstractmethod
-    def enqueue_analysis(
-        self, analysis_id: str, user_id: str, audio_path: str, filename: str
-    ) -> None:
+    def enqueue_analysis(self, job: QueuedAnalysis) -> None:
+        pass
+
+
+class AnalysisSchedulerPort(ABC):
+    """
+    Vagas de execução de cada fila, divididas de forma justa entre os
+    tenants. `submit` e `complete` retornam as análises que ganharam vaga e
+    devem ir para a fila de tarefas.
+    """
+
+    @abstractmethod
+    async def submit(self, job: QueuedAnalysis) -> list[QueuedAnalysis]:
+        pass
+
+    @abstractmethod
+    async def complete(
+        self, job: QueuedAnalysis, succeeded: bool
+    ) -> list[QueuedAnalysis]:
+        pass
+
+    @abstractmethod
+    async def dispatch(self, lane: QueueLane) -> list[QueuedAnalysis]:
+        """Recupera as concessões vencidas e preenche as vagas livres."""
+        pass
+
+    @abstractmethod
+    async def requeue(self, job: QueuedAnalysis) -> None:
+        """
+        Devolve uma análise que ganhou vaga mas não chegou à fila de
+        tarefas: a vaga é liberada e ela volta para o início da fila do seu
+        tenant, sem redistribuir as vagas na hora.
+        """
+        pass
+
+    @abstractmethod
+    async def positions(self, lane: QueueLane) -> list[QueuePosition]:
+        pass
+
+    @abstractmethod
+    async def claim_positions_update(
+        self, lane: QueueLane, interval_seconds: float
+    ) -> bool:
+        """
+        Se cabe a quem chama publicar as posições da fila agora: no máximo
+        uma vez a cada `interval_seconds`, entre todos os processos.
+        """
+        pass
+
+    @abstractmethod
+    async def load(self, lane: QueueLane) -> LaneLoad:
+        pass
+
+
+class RateLimiterPort(ABC):
+    @abstractmethod
+    async def acquire(self, key: str) -> float:
+        """
+        Consome uma permissão de `key`. Retorna 0 se havia uma disponível
+        ou, se não, em quantos segundos haverá.
+        """
+        pass
+
+
+class MetricsStorePort(ABC):
+    """Snapshots das métricas dos workers, lidos pelo /metrics/workers da API."""
+
+    @abstractmethod
+    async def push(self, process: str, snapshot: dict) -> None:
+        pass
+
+    @abstractmethod
+    async def remove(self, process: str) -> None:
+        pass
+
+    @abstractmethod
+    async def collect(self) -> dict[str, dict]:
+        """Os snapshots ainda válidos, indexados pelo processo."""
         pass
 
 
@@ -122,8 +320,38 @@ class AnalysisStatsRepositoryPort(ABC):
     ) -> AnalysisStats:
         pass
 
+    @abstractmethod
+    async def record_completed(self, analysis: Analysis) -> None:
+        """Adds a completed analysis to the user's statistics rollups."""
+        pass
+
+    @abstractmethod
+    async def rebuild(self, user_id: Optional[str] = None) -> int:
+        """
+        Recomputes the rollups from the stored analyses, for one user or for
+        everyone, and returns the number of buckets written.
+        """
+        pass
+
 
 class SentimentAnalysisPort(ABC):
     @abstractmethod
     def analyze(self, text: str) -> SentimentAnalysis:
         pass
+
+    @abstractmethod
+    def analyze_batch(self, texts: list[str]) -> list[SentimentAnalysis]:
+        """Analisa vários textos de uma vez, na mesma ordem da entrada."""
+        pass
+
+
+class AnalysisCachePort(ABC):
+    """Cache of stage results shared by analyses of the same audio."""
+
+    @abstractmethod
+    async def get(self, key: StageCacheKey) -> Optional[Any]:
+        pass
+
+    @abstractmethod
+    async def set(self, key: StageCacheKey, value: Any) -> None:
+        pass
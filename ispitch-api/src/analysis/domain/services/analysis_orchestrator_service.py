@@ -1,94 +1,98 @@
+import asyncio
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from ....core.exceptions import NotFoundException
-from ..models.analysis import (
-    Analysis,
-    AnalysisStatus,
-    AudioAnalysis,
-    SpeechAnalysis,
-)
-from ..models.transcription import Transcription
-from ..ports.input import (
-    AnalysisOrchestratorPort,
-    AudioAnalysisPort,
-    SpeechAnalysisPort,
-)
-from ..ports.output import (
-    AnalysisRepositoryPort,
-    StoragePort,
-    TaskQueuePort,
-    TranscriptionPort,
-)
+from ..models.analysis import Analysis, AnalysisStatus
+from ..models.analysis_summary import AnalysisSummary
+from ..models.audio import StoredAudio
+from ..models.pagination import AnalysisCursor, AnalysisPage
+from ..models.scheduling import Admission
+from ..ports.input import AnalysisOrchestratorPort, AnalysisSchedulingPort
+from ..ports.output import AnalysisRepositoryPort, StoragePort
 
 logger = logging.getLogger(__name__)
 
 
 @dataclass
 class AnalysisOrchestratorDependencies:
-    transcription_port: TranscriptionPort
     storage_port: StoragePort
-    speech_analysis_port: SpeechAnalysisPort
-    audio_analysis_port: AudioAnalysisPort
     analysis_repository_port: AnalysisRepositoryPort
-    task_queue_port: TaskQueuePort
+    scheduling_port: AnalysisSchedulingPort
 
 
 class AnalysisOrchestratorService(AnalysisOrchestratorPort):
+    """
+    Creates, enqueues and reads analyses. The analysis itself runs in the
+    Celery worker, so this service needs no model.
+    """
+
     def __init__(self, deps: AnalysisOrchestratorDependencies):
-        self.transcription_port = deps.transcription_port
         self.storage_port = deps.storage_port
-        self.speech_analysis_port = deps.speech_analysis_port
-        self.audio_analysis_port = deps.audio_analysis_port
         self.analysis_repository_port = deps.analysis_repository_port
-        self.task_queue_port = deps.task_queue_port
+        self.scheduling_port = deps.scheduling_port
 
-    async def initiate_analysis(self, file, user_id: str) -> str:
+    async def initiate_analysis(
+        self, audio: StoredAudio, user_id: Optional[str]
+    ) -> Admission:
         analysis = Analysis(
             id=None,
             user_id=user_id,
             status=AnalysisStatus.PENDING,
-            filename=file.filename,
+            filename=audio.filename,
             created_at=datetime.now(timezone.utc),
             updated_at=datetime.now(timezone.utc),
             transcription=None,
             speech_analysis=None,
             audio_analysis=None,
         )
-        new_analysis = await self.analysis_repository_port.save(analysis)
-
-        temp_audio_path = self.storage_port.save_temporary_audio(file)
-
-        self.task_queue_port.enqueue_analysis(
-            analysis_id=new_analysis.id,
-            user_id=user_id,
-            audio_path=temp_audio_path,
-            filename=file.filename,
-        )
-
-        return new_analysis.id
+        # O áudio já foi salvo durante o upload; se a análise não chegar ao
+        # escalonador (ou for recusada), nenhum worker vai liberar a
+        # referência dele
+        try:
+            # Antes de criar o documento: uma análise recusada não existe
+            admission = await self.scheduling_port.admit(audio.duration)
+            new_analysis = await self.analysis_repository_port.save(analysis)
+        except Exception:
+            await self.storage_port.release_audio(audio.key)
+            raise
 
-    async def initiate(self, file, background_tasks) -> str:
-        analysis = await self.analysis_repository_port.save(
-            Analysis(
-                id=None,
-                status=AnalysisStatus.PENDING,
-                filename=file.filename,
-                transcription=None,
-                speech_analysis=None,
-                audio_analysis=None,
+        # `submit` só falha antes de o escalonador aceitar a análise; depois
+        # disso, o áudio é dela
+        try:
+            await self.scheduling_port.submit(
+                analysis_id=new_analysis.id, user_id=user_id, audio=audio
             )
-        )
+        except Exception:
+            await self._fail_unsubmitted(new_analysis, audio)
+            raise
 
-        temp_audio_path = self.storage_port.save_temporary_audio(file)
+        return replace(admission, analysis_id=new_analysis.id)
 
-        background_tasks.add_task(
-            self._run_analysis, analysis.id, temp_audio_path, file.filename
-        )
+    async def _fail_unsubmitted(
+        self, analysis: Analysis, audio: StoredAudio
+    ) -> None:
+        await self.storage_port.release_audio(audio.key)
+        try:
+            await self.analysis_repository_port.save(
+                replace(
+                    analysis,
+                    status=AnalysisStatus.FAILED,
+                    updated_at=datetime.now(timezone.utc),
+                )
+            )
+        except Exception as e:
+            logger.error(
+                f'[{analysis.id}] Failed to mark the unsubmitted analysis '
+                f'as failed: {e}'
+            )
 
-        return analysis.id
+    async def initiate(self, audio: StoredAudio) -> str:
+        # A v1 não tem usuário autenticado e responde só com o ID
+        admission = await self.initiate_analysis(audio, user_id=None)
+        return admission.analysis_id
 
     async def get_by_id(self, analysis_id: str) -> Analysis:
         """
@@ -118,13 +122,13 @@ class AnalysisOrchestratorService(AnalysisOrchestratorPort):
 
     async def get_by_user_id(
         self, user_id: str, page: int, page_size: int
-    ) -> Tuple[List[Analysis], int]:
+    ) -> Tuple[List[AnalysisSummary], int]:
         """
         Retrieves all analyses for a specific user by their user ID.
         Args:
             user_id (str): The unique ID of the user.
         Returns:
-            List[Analysis]: A list of analyses associated with the user.
+            List[AnalysisSummary]: Summaries of the user's analyses.
         """
         try:
             analyses = await self.analysis_repository_port.find_by_user_id(
@@ -135,94 +139,43 @@ class AnalysisOrchestratorService(AnalysisOrchestratorPort):
             logger.error(f'Error retrieving analyses {user_id}: {str(e)}')
             raise
 
-    async def find_recent_by_user_id(self, user_id: str) -> Analysis:
-        analysis = await self.analysis_repository_port.find_recent_by_user_id(
-            user_id
-        )
-
-        if analysis is None:
-            raise NotFoundException('Analysis')
-
-        return analysis
-
-    async def _run_analysis(
-        self, analysis_id: str, audio_path: str, filename: str
-    ):
-        try:
-            transcription = self._run_transcription(
-                analysis_id=analysis_id,
-                audio_path=audio_path,
-            )
-            speech_analysis = self._run_speech_analysis(
-                analysis_id=analysis_id,
-                transcription=transcription,
-            )
-            audio_analysis = self._run_audio_analysis(
-                analysis_id=analysis_id,
-                audio_path=audio_path,
-                transcription=transcription,
-                speech_analysis=speech_analysis,
-            )
-
-            result = Analysis(
-                id=analysis_id,
-                status=AnalysisStatus.COMPLETED,
-                filename=filename,
-                transcription=transcription,
-                speech_analysis=speech_analysis,
-                audio_analysis=audio_analysis,
-            )
-            await self.analysis_repository_port.save(result)
-        finally:
-            self.storage_port.cleanup_temporary_file(audio_path)
-
-    def _run_transcription(self, analysis_id: str, audio_path: str):
-        logger.info(f'[{analysis_id}] Starting transcription')
-        transcription_result = self.transcription_port.transcribe(audio_path)
-        logger.info(f'[{analysis_id}] Transcription completed')
-
-        return transcription_result
-
-    def _run_speech_analysis(
-        self, analysis_id: str, transcription: Transcription
-    ) -> SpeechAnalysis:
-        logger.info(f'[{analysis_id}] Detecting silences in transcription')
-        silence_analysis = self.speech_analysis_port.detect_silences(
-            transcription
+    async def get_page_by_user_id(
+        self, user_id: str, page_size: int, cursor: Optional[AnalysisCursor]
+    ) -> AnalysisPage:
+        """
+        Retrieves the page of a user's analyses that follows `cursor` (the
+        first page when it is None), without skipping over earlier pages.
+        Args:
+            user_id (str): The unique ID of the user.
+            page_size (int): Maximum number of analyses in the page.
+            cursor (AnalysisCursor): Last analysis of the previous page.
+        Returns:
+            AnalysisPage: The analyses, the user's total and the cursor of
+            the next page, if there is one.
+        """
+        # Um item a mais indica se existe próxima página
+        analyses, total = await asyncio.gather(
+            self.analysis_repository_port.find_after_cursor(
+                user_id, page_size + 1, cursor
+            ),
+            self.analysis_repository_port.count_by_user_id(user_id),
         )
-        logger.info(f'[{analysis_id}] Silences detection completed')
 
-        logger.info(f'[{analysis_id}] Starting filler words analysis')
-        fillerwords_analysis = self.speech_analysis_port.detect_fillerwords(
-            transcription
-        )
-        logger.info(f'[{analysis_id}] Filler words analysis completed')
+        next_cursor = None
+        if len(analyses) > page_size:
+            analyses = analyses[:page_size]
+            next_cursor = AnalysisCursor.after(analyses[-1])
 
-        return SpeechAnalysis(
-            silence_analysis=silence_analysis,
-            fillerwords_analysis=fillerwords_analysis,
+        return AnalysisPage(
+            analyses=analyses, total=total, next_cursor=next_cursor
         )
 
-    def _run_audio_analysis(
-        self,
-        analysis_id: str,
-        audio_path: str,
-        transcription: Transcription,
-        speech_analysis: SpeechAnalysis,
-    ) -> AudioAnalysis:
-        logger.info(f'[{analysis_id}] Calculating speech rate')
-
-        prosody_analysis = self.audio_analysis_port.get_prosody_analysis(
-            audio_path
+    async def find_recent_by_user_id(self, user_id: str) -> AnalysisSummary:
+        analysis = await self.analysis_repository_port.find_recent_by_user_id(
+            user_id
         )
 
-        speech_rate = self.audio_analysis_port.get_speech_rate(
-            audio_path=audio_path,
-            transcription=transcription.text,
-            silence_duration=speech_analysis.silence_analysis.duration,
-        )
-        logger.info(f'[{analysis_id}] Speech rate calculated: {speech_rate} WPM')
+        if analysis is None:
+            raise NotFoundException('Analysis')
 
-        return AudioAnalysis(
-            speech_rate=speech_rate, prosody_analysis=prosody_analysis
-        )
+        return analysis
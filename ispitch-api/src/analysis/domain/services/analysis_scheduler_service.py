@@ -0,0 +1,223 @@
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from ....core.exceptions import TooManyRequestsException
+from ..models.audio import StoredAudio
+from ..models.events import SseEvent
+from ..models.scheduling import (
+    Admission,
+    QueuedAnalysis,
+    QueueLane,
+    QueuePosition,
+)
+from ..ports.input import AnalysisSchedulingPort
+from ..ports.output import (
+    AnalysisSchedulerPort,
+    NotificationPort,
+    TaskQueuePort,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SchedulerConfig:
+    # Duração máxima de um áudio da fila curta
+    short_max_seconds: float
+    # Segundos de processamento por segundo de áudio, até haver medidas
+    realtime_factor: float
+    # Vagas de cada fila: a concorrência dos workers que a consomem
+    lane_slots: dict[QueueLane, int]
+    # Espera estimada acima da qual uma nova análise é recusada
+    max_wait_seconds: dict[QueueLane, float]
+    # Intervalo mínimo entre as publicações das posições de uma fila
+    positions_interval_seconds: float
+
+
+class AnalysisSchedulerService(AnalysisSchedulingPort):
+    """
+    Separa as análises por duração em duas filas e as libera para o Celery
+    conforme o escalonador dá vagas, de forma justa entre os usuários. A
+    cada mudança, publica a posição e o início estimado das que aguardam,
+    no máximo uma vez por `positions_interval_seconds`: publicar todas a
+    cada envio custaria um evento por análise na fila, justo sob carga.
+
+    As estimativas usam o áudio na fila vezes o fator de tempo real medido
+    pelos workers, dividido pelas vagas. Com a espera acima do limite da
+    fila, `admit` recusa a análise em vez de deixar a fila crescer.
+
+    Depois que o escalonador aceita uma análise, as falhas ao enviá-la ao
+    Celery ou ao publicar as posições só são registradas: a análise que não
+    chegou à fila de tarefas volta para a fila do escalonador e a varredura
+    periódica tenta de novo.
+    """
+
+    def __init__(
+        self,
+        scheduler_port: AnalysisSchedulerPort,
+        task_queue_port: TaskQueuePort,
+        notification_port: NotificationPort,
+        config: SchedulerConfig,
+    ):
+        self._scheduler_port = scheduler_port
+        self._task_queue_port = task_queue_port
+        self._notification_port = notification_port
+        self._config = config
+
+    def lane_for(self, duration: Optional[float]) -> QueueLane:
+        # Sem duração no cabeçalho, o áudio pode ser de qualquer tamanho
+        if duration is not None and duration <= self._config.short_max_seconds:
+            return QueueLane.SHORT
+        return QueueLane.LONG
+
+    async def admit(self, duration: Optional[float]) -> Admission:
+        lane = self.lane_for(duration)
+        realtime_factor, wait = await self._estimate_wait(lane)
+        max_wait = self._config.max_wait_seconds[lane]
+        if wait > max_wait:
+            logger.warning(
+                f'Rejected upload for the {lane.value} lane: estimated wait '
+                f'{wait:.0f}s over {max_wait:.0f}s'
+            )
+            raise TooManyRequestsException(
+                message='Muitas análises na fila. Tente novamente mais tarde.',
+                # Quando a fila, sem novas entradas, volta ao limite
+                retry_after=wait - max_wait,
+            )
+
+        now = datetime.now(timezone.utc)
+        estimated_start = now + timedelta(seconds=wait)
+        return Admission(
+            lane=lane,
+            estimated_start=estimated_start,
+            estimated_completion=estimated_start
+            + timedelta(seconds=(duration or 0.0) * realtime_factor),
+        )
+
+    async def submit(
+        self, analysis_id: str, user_id: Optional[str], audio: StoredAudio
+    ) -> None:
+        job = QueuedAnalysis(
+            analysis_id=analysis_id,
+            user_id=user_id,
+            audio_key=audio.key,
+            filename=audio.filename,
+            lane=self.lane_for(audio.duration),
+            duration=audio.duration or 0.0,
+            audio_hash=audio.content_hash,
+            submitted_at=time.time(),
+        )
+        dispatched = await self._scheduler_port.submit(job)
+        logger.info(f'[{analysis_id}] Submitted to the {job.lane.value} lane')
+        await self._dispatch(dispatched)
+        await self._publish_positions(job.lane)
+
+    async def complete(self, job: QueuedAnalysis, succeeded: bool) -> None:
+        # Redistribui as duas filas: o limite por usuário vale para ambas
+        dispatched = await self._scheduler_port.complete(job, succeeded)
+        await self._dispatch(dispatched)
+        for lane in QueueLane:
+            await self._publish_positions(lane)
+
+    async def sweep(self) -> None:
+        for lane in QueueLane:
+            dispatched = await self._scheduler_port.dispatch(lane)
+            if dispatched:
+                logger.info(
+                    f'Sweep dispatched {len(dispatched)} analyses in the '
+                    f'{lane.value} lane'
+                )
+            await self._dispatch(dispatched)
+            await self._publish_positions(lane)
+
+    async def _estimate_wait(self, lane: QueueLane) -> tuple[float, float]:
+        """
+        O fator de tempo real da fila e a espera estimada para uma nova
+        análise: o áudio aguardando ou em execução, dividido entre as vagas.
+        """
+        load = await self._scheduler_port.load(lane)
+        realtime_factor = load.realtime_factor or self._config.realtime_factor
+        wait = (
+            load.audio_seconds * realtime_factor / self._config.lane_slots[lane]
+        )
+        return realtime_factor, wait
+
+    async def _dispatch(self, dispatched: list[QueuedAnalysis]) -> None:
+        enqueued = [job for job in dispatched if await self._enqueue(job)]
+        # As que começaram sabem na hora, sem esperar o intervalo
+        try:
+            await self._notification_port.publish_many([
+                self._position_event(
+                    QueuePosition(job.analysis_id, job.lane, 0, audio_ahead=0),
+                    self._config.realtime_factor,
+                )
+                for job in enqueued
+            ])
+        except Exception as e:
+            logger.warning(f'Failed to publish the started analyses: {e}')
+
+    async def _enqueue(self, job: QueuedAnalysis) -> bool:
+        try:
+            self._task_queue_port.enqueue_analysis(job)
+            return True
+        except Exception as e:
+            logger.error(
+                f'[{job.analysis_id}] Failed to enqueue, returning it to '
+                f'the {job.lane.value} lane: {e}'
+            )
+
+        try:
+            await self._scheduler_port.requeue(job)
+        except Exception as e:
+            # A vaga volta quando a concessão vencer
+            logger.error(f'[{job.analysis_id}] Failed to requeue: {e}')
+        return False
+
+    async def _publish_positions(self, lane: QueueLane) -> None:
+        try:
+            await self._publish_lane_positions(lane)
+        except Exception as e:
+            logger.warning(
+                f'Failed to publish the {lane.value} lane positions: {e}'
+            )
+
+    async def _publish_lane_positions(self, lane: QueueLane) -> None:
+        if not await self._scheduler_port.claim_positions_update(
+            lane, self._config.positions_interval_seconds
+        ):
+            return
+        positions = await self._scheduler_port.positions(lane)
+        if not positions:
+            return
+        realtime_factor = (
+            await self._scheduler_port.load(lane)
+        ).realtime_factor or self._config.realtime_factor
+        await self._notification_port.publish_many([
+            self._position_event(position, realtime_factor)
+            for position in positions
+        ])
+
+    def _position_event(
+        self, position: QueuePosition, realtime_factor: float
+    ) -> tuple[str, SseEvent, str]:
+        # Estimativa: o áudio na frente, dividido entre as vagas da fila,
+        # sem contar o que ainda falta das análises em execução
+        wait = (
+            position.audio_ahead
+            * realtime_factor
+            / self._config.lane_slots[position.lane]
+        )
+        estimated_start = datetime.now(timezone.utc) + timedelta(seconds=wait)
+        return (
+            position.analysis_id,
+            SseEvent.QUEUE_UPDATE,
+            json.dumps({
+                'lane': position.lane.value,
+                'position': position.position,
+                'estimated_start': estimated_start.isoformat(),
+            }),
+        )
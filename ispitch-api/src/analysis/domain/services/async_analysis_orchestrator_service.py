@@ -1,6 +1,9 @@
+import asyncio
+import json
 import logging
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field, replace
 from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Optional
 
 from ..models.analysis import (
     Analysis,
@@ -8,7 +11,11 @@ from ..models.analysis import (
     AudioAnalysis,
     SpeechAnalysis,
 )
+from ..models.audio import AudioContext, NormalizedAudio
+from ..models.cache import StageCacheKey
 from ..models.events import SseEvent
+from ..models.stage_group import StageGroup
+from ..models.transcription import Transcription
 from ..ports.input import (
     AsyncAnalysisOrchestratorPort,
     AudioAnalysisPort,
@@ -18,7 +25,14 @@ from ..ports.input import (
     TopicAnalysisPort,
     VocabularyAnalysisPort,
 )
-from ..ports.output import NotificationPort, TranscriptionPort
+from ..ports.output import (
+    AnalysisCachePort,
+    AudioNormalizationPort,
+    NotificationPort,
+    StoragePort,
+    TranscriptionPort,
+)
+from ..utils.stage_graph import Stage, StageGraph, StageState
 
 logger = logging.getLogger(__name__)
 
@@ -26,30 +40,45 @@ logger = logging.getLogger(__name__)
 @dataclass
 class AnalysisConfig:
     analysis_id: str
-    user_id: str
-    audio_path: str
+    user_id: Optional[str]
+    audio_key: str
     filename: str
+    max_workers: int = 4
+    audio_hash: Optional[str] = None
+    cache_version: str = '1'
+    # Etapas cacheáveis e o nome do modelo que produz cada uma delas
+    stage_models: dict[str, str] = field(default_factory=dict)
 
 
 @dataclass
 class AnalysisPort:
-    transcription_port: TranscriptionPort
-    speech_analysis_port: SpeechAnalysisPort
-    audio_analysis_port: AudioAnalysisPort
-    vocabulary_analysis_port: VocabularyAnalysisPort
-    lexical_richness_port: LexicalRichnessPort
-    topic_analysis_port: TopicAnalysisPort
+    """
+    Portas usadas pelas etapas. Um worker que executa só um grupo de etapas
+    (STAGE_GROUPS) recebe só as portas desse grupo; as demais ficam None e
+    os modelos delas nunca são carregados.
+    """
+
     notification_port: NotificationPort
-    score_calculation_port: ScoreCalculationPort
+    audio_normalization_port: Optional[AudioNormalizationPort] = None
+    transcription_port: Optional[TranscriptionPort] = None
+    speech_analysis_port: Optional[SpeechAnalysisPort] = None
+    audio_analysis_port: Optional[AudioAnalysisPort] = None
+    vocabulary_analysis_port: Optional[VocabularyAnalysisPort] = None
+    lexical_richness_port: Optional[LexicalRichnessPort] = None
+    topic_analysis_port: Optional[TopicAnalysisPort] = None
+    score_calculation_port: Optional[ScoreCalculationPort] = None
+    analysis_cache_port: Optional[AnalysisCachePort] = None
+    storage_port: Optional[StoragePort] = None
 
 
 @dataclass
 class AsyncAnalysisOrchestratorService(AsyncAnalysisOrchestratorPort):
     def __init__(self, config: AnalysisConfig, ports: AnalysisPort):
         self.analysis_id = config.analysis_id
-        self.audio_path = config.audio_path
+        self.audio_key = config.audio_key
         self.filename = config.filename
         self.user_id = config.user_id
+        self._audio_normalization_port = ports.audio_normalization_port
         self._transcription_port = ports.transcription_port
         self._speech_analysis_port = ports.speech_analysis_port
         self._audio_analysis_port = ports.audio_analysis_port
@@ -58,78 +87,225 @@ class AsyncAnalysisOrchestratorService(AsyncAnalysisOrchestratorPort):
         self._topic_analysis_port = ports.topic_analysis_port
         self._notification_port = ports.notification_port
         self._score_calculation_port = ports.score_calculation_port
+        self.max_workers = config.max_workers
+        self.audio_hash = config.audio_hash
+        self._cache_version = config.cache_version
+        self._stage_models = config.stage_models
+        self._analysis_cache_port = ports.analysis_cache_port
+        self._storage_port = ports.storage_port
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._partial_count = 0
+        self._normalized_audio: Optional[NormalizedAudio] = None
 
-    async def execute(self) -> Analysis:
-        transcription = await self._transcribe_audio()
-        speech_analysis = await self._analyze_speech(transcription=transcription)
-        audio_analysis = await self._analyze_audio(
-            transcription=transcription, speech_analysis=speech_analysis
-        )
+    async def execute(self, seed: Optional[dict[str, Any]] = None) -> Analysis:
+        results = await self._run_stages(['score'], seed)
+        logger.info(f'[{self.analysis_id}] Analysis stages completed')
+        return results['score']
 
-        analysis = self._build_result(
-            transcription=transcription,
-            speech_analysis=speech_analysis,
-            audio_analysis=audio_analysis,
+    async def execute_group(
+        self, group: StageGroup, seed: dict[str, Any]
+    ) -> dict[str, Any]:
+        """
+        Executa só as etapas de `group`, com os resultados de `group.inputs`
+        vindos de `seed`, e retorna os resultados de `group.targets`.
+        """
+        results = await self._run_stages(group.targets, seed)
+        logger.info(f'[{self.analysis_id}] Stage group {group.name} completed')
+        return {name: results[name] for name in group.targets}
+
+    async def _run_stages(
+        self, targets: Iterable[str], seed: Optional[dict[str, Any]]
+    ) -> dict[str, Any]:
+        self._loop = asyncio.get_running_loop()
+        graph = StageGraph(
+            stages=self._build_stages(),
+            max_workers=self.max_workers,
+            on_stage=self._on_stage,
+            cache=self._analysis_cache_port,
         )
+        try:
+            return await graph.run(targets=targets, seed=seed)
+        finally:
+            if self._normalized_audio is not None:
+                self._audio_normalization_port.release(self._normalized_audio)
 
-        analysis.score = self._score_calculation_port.execute(analysis=analysis)
+    def _build_stages(self) -> list[Stage]:
+        """
+        normalize -> {transcription, audio}; transcription -> {silence,
+        fillers, vocabulary, lexical_richness, topics, sentiment}; audio ->
+        {duration, prosody}; speech_rate e score dependem dos dois ramos.
 
-        return analysis
+        As portas são lidas só quando a etapa roda: um worker de um grupo
+        não tem as portas das etapas dos outros.
+        """
+        stages = [
+            Stage('normalize', self._normalize_audio),
+            Stage(
+                'transcription',
+                lambda normalize: self._transcription_port.transcribe(
+                    normalize, on_partial=self._on_partial_transcript
+                ),
+                ('normalize',),
+            ),
+            Stage('audio', self._load_audio, ('normalize',)),
+            Stage(
+                'silence',
+                self._port_call('_speech_analysis_port', 'detect_silences'),
+                ('transcription',),
+            ),
+            Stage(
+                'fillers',
+                self._port_call('_speech_analysis_port', 'detect_fillerwords'),
+                ('transcription',),
+            ),
+            Stage(
+                'vocabulary',
+                self._port_call('_vocabulary_analysis_port', 'analyze'),
+                ('transcription',),
+            ),
+            Stage(
+                'lexical_richness',
+                self._port_call('_lexical_richness_port', 'analyze'),
+                ('transcription',),
+            ),
+            Stage(
+                'topics',
+                self._port_call('_topic_analysis_port', 'analyze'),
+                ('transcription',),
+            ),
+            Stage(
+                'sentiment',
+                self._port_call('_speech_analysis_port', 'analyze_sentiment'),
+                ('transcription',),
+            ),
+            Stage(
+                'duration',
+                self._port_call('_audio_analysis_port', 'get_audio_duration'),
+                ('audio',),
+            ),
+            Stage(
+                'prosody',
+                self._port_call('_audio_analysis_port', 'get_prosody_analysis'),
+                ('audio',),
+            ),
+            Stage(
+                'speech_rate',
+                self._calculate_speech_rate,
+                ('transcription', 'duration', 'silence'),
+            ),
+            Stage(
+                'score',
+                self._score_analysis,
+                (
+                    'transcription',
+                    'silence',
+                    'fillers',
+                    'vocabulary',
+                    'lexical_richness',
+                    'topics',
+                    'sentiment',
+                    'duration',
+                    'speech_rate',
+                    'prosody',
+                ),
+            ),
+        ]
+
+        return [
+            replace(stage, cache_key=self._cache_key(stage.name))
+            for stage in stages
+        ]
 
-    async def _transcribe_audio(self):
-        await self._publish_status(AnalysisStatus.TRANSCRIBING)
-        transcription = self._transcription_port.transcribe(self.audio_path)
-        logger.info(f'[{self.analysis_id}] Transcription completed')
-        return transcription
-
-    async def _analyze_speech(self, transcription) -> SpeechAnalysis:
-        await self._publish_status(AnalysisStatus.ANALYZING_SPEECH)
-
-        silence = self._speech_analysis_port.detect_silences(transcription)
-        filler = self._speech_analysis_port.detect_fillerwords(transcription)
-        vocabulary = self._vocabulary_analysis_port.analyze(transcription)
-        lexical_richness = self._lexical_richness_port.analyze(transcription)
-        topics = self._topic_analysis_port.analyze(transcription)
-        sentiment = self._speech_analysis_port.analyze_sentiment(transcription)
-
-        logger.info(f'[{self.analysis_id}] Speech analysis completed')
-        return SpeechAnalysis(
-            silence_analysis=silence,
-            fillerwords_analysis=filler,
-            vocabulary_analysis=vocabulary,
-            lexical_richness_analysis=lexical_richness,
-            topic_analysis=topics,
-            sentiment_analysis=sentiment,
+    def _normalize_audio(self) -> NormalizedAudio:
+        # Guardado para liberar o PCM mesmo se uma etapa seguinte falhar
+        self._normalized_audio = self._audio_normalization_port.normalize(
+            self.audio_key, self._storage_port.read_audio(self.audio_key)
         )
+        return self._normalized_audio
 
-    async def _analyze_audio(
-        self, transcription, speech_analysis: SpeechAnalysis
-    ) -> AudioAnalysis:
-        await self._publish_status(AnalysisStatus.ANALYZING_AUDIO)
+    def _port_call(self, port: str, method: str) -> Callable[..., Any]:
+        def run(**kwargs):
+            return getattr(getattr(self, port), method)(**kwargs)
 
-        audio_duration = self._audio_analysis_port.get_audio_duration(
-            audio_path=self.audio_path
+        return run
+
+    def _load_audio(self, normalize: NormalizedAudio) -> AudioContext:
+        return self._audio_analysis_port.load_audio(normalize)
+
+    def _cache_key(self, stage: str) -> Optional[StageCacheKey]:
+        model = self._stage_models.get(stage)
+        if self.audio_hash is None or model is None:
+            return None
+        return StageCacheKey(
+            audio_hash=self.audio_hash,
+            stage=stage,
+            model=model,
+            version=self._cache_version,
         )
-        speech_rate = self._audio_analysis_port.get_speech_rate(
+
+    def _calculate_speech_rate(self, transcription, duration, silence) -> float:
+        return self._audio_analysis_port.get_speech_rate(
             transcription=transcription.text,
-            audio_duration=audio_duration,
-            silence_duration=speech_analysis.silence_analysis.duration,
+            audio_duration=duration,
+            silence_duration=silence.duration,
         )
 
-        logger.info(f'[{self.analysis_id}] Audio analysis completed')
-
-        prosody_analysis = self._audio_analysis_port.get_prosody_analysis(
-            self.audio_path
+    def _score_analysis(self, **results) -> Analysis:
+        analysis = self._build_result(
+            transcription=results['transcription'],
+            speech_analysis=SpeechAnalysis(
+                silence_analysis=results['silence'],
+                fillerwords_analysis=results['fillers'],
+                vocabulary_analysis=results['vocabulary'],
+                lexical_richness_analysis=results['lexical_richness'],
+                topic_analysis=results['topics'],
+                sentiment_analysis=results['sentiment'],
+            ),
+            audio_analysis=AudioAnalysis(
+                duration=results['duration'],
+                speech_rate=results['speech_rate'],
+                prosody_analysis=results['prosody'],
+            ),
         )
+        analysis.score = self._score_calculation_port.execute(analysis=analysis)
+        return analysis
 
-        logger.info(f'[{self.analysis_id}] Prosody analysis completed')
+    def _on_partial_transcript(self, partial: Transcription) -> None:
+        """
+        Chamado na thread da transcrição a cada trecho concluído; a
+        publicação é agendada no event loop sem bloquear o Whisper.
+        """
+        data = json.dumps({'chunk': self._partial_count, **asdict(partial)})
+        self._partial_count += 1
+        asyncio.run_coroutine_threadsafe(
+            self._notification_port.publish(
+                analysis_id=self.analysis_id,
+                event=SseEvent.PARTIAL_TRANSCRIPT,
+                data=data,
+            ),
+            self._loop,
+        )
 
-        return AudioAnalysis(
-            duration=audio_duration,
-            speech_rate=speech_rate,
-            prosody_analysis=prosody_analysis,
+    async def _on_stage(self, stage: str, state: StageState) -> None:
+        logger.info(f'[{self.analysis_id}] Stage {stage} {state.value}')
+        await self._notification_port.publish(
+            analysis_id=self.analysis_id,
+            event=SseEvent.STAGE_UPDATE,
+            data=json.dumps({'stage': stage, 'state': state.value}),
         )
 
+        # Os status agregados continuam monotônicos para os clientes antigos,
+        # mesmo com as etapas de áudio rodando desde o início e com os grupos
+        # de etapas em workers diferentes.
+        if stage == 'transcription' and state == StageState.RUNNING:
+            await self._publish_status(AnalysisStatus.TRANSCRIBING)
+        if state != StageState.COMPLETED:
+            return
+        if stage == 'transcription':
+            await self._publish_status(AnalysisStatus.ANALYZING_SPEECH)
+        elif stage == 'speech_rate':
+            await self._publish_status(AnalysisStatus.ANALYZING_AUDIO)
+
     def _build_result(
         self,
         transcription,
@@ -1,3 +1,5 @@
+from ....core.metrics import timed
+from ..models.audio import AudioContext, NormalizedAudio
 from ..models.prosody import ProsodyAnalysis
 from ..ports.input import AudioAnalysisPort
 from ..ports.output import AudioPort
@@ -7,8 +9,11 @@ class AudioAnalysisService(AudioAnalysisPort):
     def __init__(self, audio_port: AudioPort):
         self.audio_port = audio_port
 
-    def get_audio_duration(self, audio_path):
-        return self.audio_port.get_audio_duration(audio_path)
+    def load_audio(self, audio: NormalizedAudio) -> AudioContext:
+        return self.audio_port.load_audio(audio)
+
+    def get_audio_duration(self, audio: AudioContext) -> float:
+        return self.audio_port.get_audio_duration(audio)
 
     @classmethod
     def get_speech_rate(
@@ -43,10 +48,13 @@ class AudioAnalysisService(AudioAnalysisPort):
 
         return round(words_per_minute, 2)
 
-    def get_prosody_analysis(self, audio_path: str) -> ProsodyAnalysis:
-        pitch_analysis = self.audio_port.get_pitch_analysis(audio_path)
-        intensity_analysis = self.audio_port.get_intensity_analysis(audio_path)
-        vocal_quality = self.audio_port.get_vocal_quality(audio_path)
+    def get_prosody_analysis(self, audio: AudioContext) -> ProsodyAnalysis:
+        with timed('prosody.pitch'):
+            pitch_analysis = self.audio_port.get_pitch_analysis(audio)
+        with timed('prosody.intensity'):
+            intensity_analysis = self.audio_port.get_intensity_analysis(audio)
+        with timed('prosody.vocal_quality'):
+            vocal_quality = self.audio_port.get_vocal_quality(audio)
 
         return ProsodyAnalysis(
             pitch_analysis=pitch_analysis,
@@ -14,7 +14,7 @@ class SentimentAnalysisService(SentimentAnalysisInputPort):
     ) -> SentimentAnalysis:
         """
         Orquestra a análise de sentimento da transcrição, segmentando o texto
-        e analisando cada segmento individualmente.
+        e analisando todos os segmentos em lote.
         """
         all_words = [
             word for segment in transcription.segments for word in segment.words
@@ -23,21 +23,21 @@ class SentimentAnalysisService(SentimentAnalysisInputPort):
         if not all_words:
             return SentimentAnalysis(timeline=[])
 
-        timeline: list[SentimentSegment] = []
-
-        # Itera sobre os segmentos gerados pela nossa nova função
-        for segment in segment_transcription(all_words):
-            text_to_analyze = str(segment['text'])
-
-            # Pula segmentos vazios
-            if not text_to_analyze.strip():
-                continue
+        # Pula segmentos vazios
+        segments = [
+            segment
+            for segment in segment_transcription(all_words)
+            if str(segment['text']).strip()
+        ]
 
-            # Delega a análise do texto do segmento para o adaptador
-            analysis_result = self.sentiment_analysis_port.analyze(
-                text_to_analyze
-            )
+        # Delega a análise de todos os segmentos para o adaptador de uma vez,
+        # que agrupa os textos em batches
+        analysis_results = self.sentiment_analysis_port.analyze_batch([
+            str(segment['text']) for segment in segments
+        ])
 
+        timeline: list[SentimentSegment] = []
+        for segment, analysis_result in zip(segments, analysis_results):
             for result_segment in analysis_result.timeline:
                 timeline.append(
                     SentimentSegment(
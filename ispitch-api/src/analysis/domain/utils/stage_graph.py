@@ -0,0 +1,212 @@
+import asyncio
+import inspect
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import partial
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from ....core.metrics import STAGE_CACHE_HITS, STAGE_SECONDS
+from ..models.cache import StageCacheKey
+from ..ports.output import AnalysisCachePort
+
+logger = logging.getLogger(__name__)
+
+
+class StageState(str, Enum):
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+
+
+StageCallback = Callable[[str, StageState], Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    Uma etapa do grafo de análise.
+
+    `run` recebe os resultados das etapas listadas em `depends_on` como
+    argumentos nomeados. Funções síncronas rodam no pool de threads do grafo;
+    corrotinas são aguardadas diretamente no event loop.
+
+    Com `cache_key`, o resultado é buscado no cache do grafo antes de
+    resolver as dependências e salvo nele depois de calculado.
+    """
+
+    name: str
+    run: Callable[..., Any]
+    depends_on: tuple[str, ...] = field(default_factory=tuple)
+    cache_key: Optional[StageCacheKey] = None
+
+
+class StageGraph:
+    """
+    Executa um grafo de etapas sob demanda: cada etapa começa assim que suas
+    dependências terminam, então etapas independentes rodam em paralelo e o
+    tempo total fica limitado pelo caminho crítico do grafo.
+    """
+
+    def __init__(
+        self,
+        stages: Iterable[Stage],
+        max_workers: int,
+        on_stage: Optional[StageCallback] = None,
+        cache: Optional[AnalysisCachePort] = None,
+    ):
+        self._stages = {stage.name: stage for stage in stages}
+        self._max_workers = max_workers
+        self._on_stage = on_stage
+        self._cache = cache
+        self._validate()
+
+    async def run(
+        self,
+        targets: Optional[Iterable[str]] = None,
+        seed: Optional[dict[str, Any]] = None,
+    ) -> dict[str, Any]:
+        """
+        Executa as etapas necessárias para `targets` (por padrão, todas) e
+        retorna os resultados indexados pelo nome da etapa. Se uma etapa
+        falhar, as demais são canceladas e a exceção é propagada.
+
+        As etapas em `seed` já têm resultado (calculado em outro worker, por
+        exemplo) e não são executadas: quem depende delas recebe o valor
+        dado.
+        """
+        names = list(targets) if targets is not None else list(self._stages)
+        seed = seed or {}
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(
+            max_workers=self._max_workers, thread_name_prefix='stage'
+        )
+        tasks: dict[str, asyncio.Future] = {}
+
+        def resolve(name: str) -> asyncio.Future:
+            if name in tasks:
+                return tasks[name]
+            if name in seed:
+                tasks[name] = loop.create_future()
+                tasks[name].set_result(seed[name])
+            else:
+                tasks[name] = asyncio.create_task(
+                    self._run_stage(self._stages[name], resolve, executor),
+                    name=name,
+                )
+            return tasks[name]
+
+        try:
+            await asyncio.gather(*(resolve(name) for name in names))
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return {name: task.result() for name, task in tasks.items()}
+
+    async def _run_stage(
+        self,
+        stage: Stage,
+        resolve: Callable[[str], asyncio.Future],
+        executor: ThreadPoolExecutor,
+    ) -> Any:
+        cached = await self._cache_get(stage)
+        if cached is not None:
+            STAGE_CACHE_HITS.inc(stage=stage.name)
+            await self._notify(stage.name, StageState.COMPLETED)
+            return cached
+
+        dependencies = stage.depends_on
+        results = await asyncio.gather(*(resolve(dep) for dep in dependencies))
+        kwargs = dict(zip(dependencies, results))
+
+        await self._notify(stage.name, StageState.RUNNING)
+        # Inclui a espera por uma thread livre do pool: é o tempo que a etapa
+        # acrescenta ao caminho crítico
+        start = time.perf_counter()
+        # Cancelada quando outra etapa falha
+        stage_outcome = 'cancelled'
+        try:
+            result = await self._execute(stage, kwargs, executor)
+            stage_outcome = 'success'
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            stage_outcome = 'failure'
+            await self._notify(stage.name, StageState.FAILED)
+            raise
+        finally:
+            STAGE_SECONDS.observe(
+                time.perf_counter() - start,
+                stage=stage.name,
+                outcome=stage_outcome,
+            )
+
+        await self._cache_set(stage, result)
+        await self._notify(stage.name, StageState.COMPLETED)
+        return result
+
+    @staticmethod
+    async def _execute(
+        stage: Stage, kwargs: dict[str, Any], executor: ThreadPoolExecutor
+    ) -> Any:
+        if inspect.iscoroutinefunction(stage.run):
+            return await stage.run(**kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, partial(stage.run, **kwargs))
+
+    async def _cache_get(self, stage: Stage) -> Any:
+        if self._cache is None or stage.cache_key is None:
+            return None
+        try:
+            result = await self._cache.get(stage.cache_key)
+        except Exception as e:
+            logger.warning(f'Cache lookup failed for {stage.name}: {e}')
+            return None
+        if result is not None:
+            logger.info(f'Stage {stage.name} served from cache')
+        return result
+
+    async def _cache_set(self, stage: Stage, result: Any) -> None:
+        if self._cache is None or stage.cache_key is None or result is None:
+            return
+        try:
+            await self._cache.set(stage.cache_key, result)
+        except Exception as e:
+            logger.warning(f'Cache store failed for {stage.name}: {e}')
+
+    async def _notify(self, name: str, state: StageState) -> None:
+        if self._on_stage is not None:
+            await self._on_stage(name, state)
+
+    def _validate(self) -> None:
+        for stage in self._stages.values():
+            unknown = set(stage.depends_on) - set(self._stages)
+            if unknown:
+                raise ValueError(
+                    f'Stage {stage.name!r} depends on unknown stages: '
+                    f'{sorted(unknown)}'
+                )
+
+        visiting: set[str] = set()
+        visited: set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f'Cycle detected at stage {name!r}')
+            visiting.add(name)
+            for dep in self._stages[name].depends_on:
+                visit(dep)
+            visiting.remove(name)
+            visited.add(name)
+
+        for name in self._stages:
+            visit(name)
@@ -1,17 +1,24 @@
-from .audio.audio_adapter import AudioAdapter
-from .notification.redis_adapter import RedisNotificationAdapter
-from .speech.fillerwords_analysis_adapter import FillerWordsAnalysisAdapter
-from .task_queue.celery_adapter import CeleryTaskQueueAdapter
-from .topics.huggingface_adapter import HuggingFaceTopicAdapter
-from .transcription.whisper_adapter import WhisperAdapter
-from .vocabulary.nltk_adapter import NltkSynonymProviderAdapter
+import importlib
 
-__all__ = [
-    'AudioAdapter',
-    'RedisNotificationAdapter',
-    'FillerWordsAnalysisAdapter',
-    'CeleryTaskQueueAdapter',
-    'WhisperAdapter',
-    'NltkSynonymProviderAdapter',
-    'HuggingFaceTopicAdapter',
-]
+# Os adapters são importados no primeiro acesso: a API usa só o de fila e
+# não deve carregar whisper, torch, transformers e spaCy junto com ele.
+_ADAPTER_MODULES = {
+    'AudioAdapter': '.audio.audio_adapter',
+    'PcmNormalizerAdapter': '.audio.pcm_normalizer_adapter',
+    'RedisNotificationAdapter': '.notification.redis_adapter',
+    'FillerWordsAnalysisAdapter': '.speech.fillerwords_analysis_adapter',
+    'SentimentAnalysisAdapter': '.speech.sentiment_analysis_adapter',
+    'CeleryTaskQueueAdapter': '.task_queue.celery_adapter',
+    'HuggingFaceTopicAdapter': '.topics.huggingface_adapter',
+    'WhisperAdapter': '.transcription.whisper_adapter',
+    'NltkSynonymProviderAdapter': '.vocabulary.nltk_adapter',
+}
+
+__all__ = list(_ADAPTER_MODULES)
+
+
+def __getattr__(name: str):
+    if name not in _ADAPTER_MODULES:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    module = importlib.import_module(_ADAPTER_MODULES[name], __name__)
+    return getattr(module, name)
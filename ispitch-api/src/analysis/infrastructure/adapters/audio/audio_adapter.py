@@ -2,11 +2,11 @@ import math
 import warnings
 from typing import List, Optional
 
-import librosa
 import numpy as np
 import parselmouth
 from parselmouth.praat import call as praat_call
 
+from ....domain.models.audio import NormalizedAudio
 from ....domain.models.prosody import (
     IntensityAnalysis,
     IntensityContour,
@@ -15,87 +15,69 @@ from ....domain.models.prosody import (
     VocalQualityAnalysis,
 )
 from ....domain.ports.output import AudioPort
+from . import praat_frames
+from .audio_context import ParselmouthAudioContext
 
 
 class AudioAdapter(AudioPort):
     @classmethod
-    def get_audio_duration(cls, audio_path: str) -> float:
+    def load_audio(cls, audio: NormalizedAudio) -> ParselmouthAudioContext:
         """
-        Get the duration of an audio file in seconds.
+        Wrap the normalized PCM samples in a Praat sound for the whole
+        prosody pipeline.
 
-        :param audio_path: Path to the audio file.
-        :return: Duration of the audio file in seconds.
+        :param audio: Audio normalized by the normalization stage.
+        :return: Context holding the sound and its derived objects.
         """
         try:
-            return librosa.get_duration(path=audio_path)
+            return ParselmouthAudioContext.from_normalized(audio)
         except Exception as e:
-            raise RuntimeError(f'Error getting audio duration: {e}')
-
-    @classmethod
-    def get_filtered_audio(cls, audio_path: str) -> parselmouth.Sound:
-        LOWCUT = 80
-        HIGHCUT = 8000
-        SMOOTH = 300
-
-        sound = parselmouth.Sound(audio_path)
-
-        filtered_sound = praat_call(
-            sound,
-            'Filter (pass Hann band)',
-            LOWCUT,
-            HIGHCUT,
-            SMOOTH,
-        )
-
-        return filtered_sound
+            raise RuntimeError(f'Error loading audio: {e}')
 
     @classmethod
-    def get_pitch(
-        cls,
-        sound: parselmouth.Sound,
-        time_step: float,
-        pitch_floor: float = 75,
-        pitch_ceiling: float = 600,
-    ) -> parselmouth.Pitch:
-        return praat_call(
-            sound, 'To Pitch', time_step, pitch_floor, pitch_ceiling
-        )
+    def get_audio_duration(cls, audio: ParselmouthAudioContext) -> float:
+        """
+        Get the duration of the decoded audio in seconds.
 
-    @classmethod
-    def get_intensity(
-        cls,
-        sound: parselmouth.Sound,
-        time_step: float,
-        minimum_pitch: float = 75,
-    ) -> parselmouth.Intensity:
-        return praat_call(sound, 'To Intensity', minimum_pitch, time_step)
+        :param audio: Decoded audio context.
+        :return: Duration of the audio in seconds.
+        """
+        try:
+            return audio.duration
+        except Exception as e:
+            raise RuntimeError(f'Error getting audio duration: {e}')
 
     @staticmethod
     def is_valid_value(value: float) -> bool:
         return not (math.isnan(value) or math.isinf(value))
 
     @staticmethod
+    def _to_optional_list(values: np.ndarray) -> List[Optional[float]]:
+        return [None if np.isnan(v) else float(v) for v in values]
+
+    @classmethod
     def _downsample_data(
-        time_values: List[float],
-        y_values: List[Optional[float]],
+        cls,
+        time_values: np.ndarray,
+        y_values: np.ndarray,
         target_points: int = 800,
     ) -> tuple[List[float], List[Optional[float]]]:
-        total_points = len(time_values)
+        """
+        Average the frames into at most `target_points` buckets. Missing
+        values are NaN in `y_values` and None in the returned list.
+        """
+        t_np = np.asarray(time_values, dtype=float)
+        y_np = np.asarray(y_values, dtype=float)
+        total_points = len(t_np)
 
         if total_points <= target_points:
-            return time_values, y_values
+            return t_np.tolist(), cls._to_optional_list(y_np)
 
         indices = np.linspace(0, total_points, target_points + 1).astype(int)
 
         new_times = []
         new_values = []
 
-        y_np = np.array(
-            [v if v is not None else np.nan for v in y_values], dtype=float
-        )
-
-        t_np = np.array(time_values, dtype=float)
-
         for i in range(len(indices) - 1):
             start_idx = indices[i]
             end_idx = indices[i + 1]
@@ -121,10 +103,9 @@ class AudioAdapter(AudioPort):
         return new_times, new_values
 
     @classmethod
-    def get_pitch_analysis(cls, audio_path: str) -> PitchAnalysis:
+    def get_pitch_analysis(cls, audio: ParselmouthAudioContext) -> PitchAnalysis:
         try:
-            sound = cls.get_filtered_audio(audio_path)
-            pitch = cls.get_pitch(sound, 0.0)
+            pitch = audio.pitch
 
             mean_pitch = praat_call(pitch, 'Get mean', 0, 0, 'Hertz')
 
@@ -149,7 +130,7 @@ class AudioAdapter(AudioPort):
                 pitch, reference_freq=mean_pitch
             )
 
-            pitch_contour = cls.get_pitch_contour(audio_path)
+            pitch_contour = cls.get_pitch_contour(audio)
 
             return PitchAnalysis(
                 mean_pitch=mean_pitch,
@@ -169,11 +150,8 @@ class AudioAdapter(AudioPort):
     ) -> float:
         try:
             MIN_VOICED_VALUE_LENGTH = 2
-            pitch_values = pitch.selected_array['frequency']
-
-            voiced_f0_values = pitch_values[
-                (pitch_values > 0) & (~np.isnan(pitch_values))
-            ]
+            _, pitch_values = praat_frames.pitch_frames(pitch)
+            voiced_f0_values = pitch_values[~np.isnan(pitch_values)]
 
             if len(voiced_f0_values) < MIN_VOICED_VALUE_LENGTH:
                 return 0.0
@@ -192,34 +170,17 @@ class AudioAdapter(AudioPort):
             raise RuntimeError(f'Error calculating pitch in semitones: {e}')
 
     @classmethod
-    def get_pitch_contour(cls, audio_path: str) -> List[PitchContour]:
+    def get_pitch_contour(
+        cls, audio: ParselmouthAudioContext
+    ) -> List[PitchContour]:
         try:
-            sound = cls.get_filtered_audio(audio_path)
-
-            pitch = cls.get_pitch(sound, 0.01)
+            times, f0_values = praat_frames.pitch_frames(audio.contour_pitch)
+            pitch_values = np.round(f0_values, 2)
 
             contour = []
-            time_values = []
-            pitch_values = []
-
-            frames = praat_call(pitch, 'Get number of frames')
-            for i in range(1, frames + 1):
-                time = praat_call(pitch, 'Get time from frame number', i)
-
-                f0_value = praat_call(
-                    pitch, 'Get value at time', time, 'Hertz', 'Linear'
-                )
-
-                pitch_value = None
-
-                if not (np.isnan(f0_value) or f0_value == 0):
-                    pitch_value = round(f0_value, 2)
-
-                time_values.append(time)
-                pitch_values.append(pitch_value)
 
             downsampled_times, downsampled_pitches = cls._downsample_data(
-                time_values, pitch_values, target_points=500
+                times, pitch_values, target_points=500
             )
 
             for time, pitch_val in zip(downsampled_times, downsampled_pitches):
@@ -231,23 +192,22 @@ class AudioAdapter(AudioPort):
             raise RuntimeError(f'Error extracting pitch contour: {e}')
 
     @classmethod
-    def get_intensity_analysis(cls, audio_path: str) -> IntensityAnalysis:
+    def get_intensity_analysis(
+        cls, audio: ParselmouthAudioContext
+    ) -> IntensityAnalysis:
         try:
-            sound = parselmouth.Sound(audio_path)
-
-            intensity = sound.to_intensity(minimum_pitch=75.0)
-
-            pitch = sound.to_pitch(pitch_floor=75.0, pitch_ceiling=600.0)
-
-            voiced_intensity_values = []
+            times, values = praat_frames.intensity_frames(audio.intensity)
+            pitch_times, f0_values = praat_frames.pitch_frames(
+                audio.voicing_pitch
+            )
+            f0_at_frames = praat_frames.interpolate_at(
+                times, pitch_times, f0_values
+            )
 
-            for t in intensity.xs():
-                if pitch.get_value_at_time(t) > 0:
-                    value = intensity.get_value(t)
-                    if value != -np.inf:
-                        voiced_intensity_values.append(value)
+            is_voiced = f0_at_frames > 0
+            voiced_intensity_values = values[is_voiced & np.isfinite(values)]
 
-            if not voiced_intensity_values:
+            if voiced_intensity_values.size == 0:
                 return IntensityAnalysis(
                     mean_intensity=0.0,
                     min_intensity=0.0,
@@ -261,7 +221,7 @@ class AudioAdapter(AudioPort):
             max_intensity = np.max(voiced_intensity_values)
             stdev_intensity = np.std(voiced_intensity_values)
 
-            intensity_contour = cls.get_intensity_contour(audio_path)
+            intensity_contour = cls.get_intensity_contour(audio)
             return IntensityAnalysis(
                 mean_intensity=float(mean_intensity),
                 min_intensity=float(min_intensity),
@@ -274,37 +234,22 @@ class AudioAdapter(AudioPort):
             raise RuntimeError(f'Error analyzing intensity: {e}')
 
     @classmethod
-    def get_intensity_contour(cls, audio_path: str) -> List[IntensityContour]:
+    def get_intensity_contour(
+        cls, audio: ParselmouthAudioContext
+    ) -> List[IntensityContour]:
         try:
-            sound = cls.get_filtered_audio(audio_path)
-
-            intensity = cls.get_intensity(sound, 0.01)
-
-            n_frames = praat_call(intensity, 'Get number of frames')
+            times, db_values = praat_frames.intensity_frames(
+                audio.contour_intensity
+            )
+            is_missing = ~np.isfinite(db_values) | (db_values == 0)
+            intensity_values = np.where(
+                is_missing, np.nan, np.round(db_values, 2)
+            )
 
             contour = []
-            time_values = []
-            intensity_values = []
-
-            for frame_number in range(1, n_frames + 1):
-                time = praat_call(
-                    intensity, 'Get time from frame number', frame_number
-                )
-
-                db_value = praat_call(
-                    intensity, 'Get value in frame', frame_number
-                )
-
-                volume_value = None
-
-                if not (np.isnan(db_value) or db_value == 0):
-                    volume_value = round(db_value, 2)
-
-                time_values.append(time)
-                intensity_values.append(volume_value)
 
             downsampled_times, downsampled_volumes = cls._downsample_data(
-                time_values, intensity_values, target_points=500
+                times, intensity_values, target_points=500
             )
 
             for time, volume in zip(downsampled_times, downsampled_volumes):
@@ -315,19 +260,17 @@ class AudioAdapter(AudioPort):
             raise RuntimeError(f'Error analyzing intensity contour: {e}')
 
     @classmethod
-    def get_vocal_quality(cls, audio_path: str) -> VocalQualityAnalysis:
+    def get_vocal_quality(
+        cls, audio: ParselmouthAudioContext
+    ) -> VocalQualityAnalysis:
         try:
-            sound = cls.get_filtered_audio(audio_path)
-            praat_call(sound, 'Scale intensity', 70.0)
+            pitch = audio.pitch
 
-            pitch = cls.get_pitch(sound, 0.0)
-            pulses = cls._get_pulses(sound, pitch)
-
-            hnr = cls._calculate_hnr(sound, pitch)
+            hnr = cls._calculate_hnr(audio.harmonicity, pitch)
             voiced_segments = cls._get_voiced_segments(pitch)
 
             jitter, shimmer = cls._calculate_jitter_shimmer_optimized(
-                sound, pulses, voiced_segments
+                audio.vocal_sound, audio.pulses, voiced_segments
             )
 
             return VocalQualityAnalysis(
@@ -338,81 +281,23 @@ class AudioAdapter(AudioPort):
         except Exception as e:
             raise RuntimeError(f'Error analyzing vocal quality: {e}')
 
-    @classmethod
-    def _get_pulses(cls, sound: parselmouth.Sound, pitch: parselmouth.Pitch):
-        """Get point process (pulses) from sound and pitch."""
-        try:
-            return praat_call(
-                [sound, pitch], 'To PointProcess (peaks)', 'yes', 'no'
-            )
-        except Exception:
-            return praat_call([sound, pitch], 'To PointProcess (cc)')
-
     @classmethod
     def _calculate_hnr(
-        cls, sound: parselmouth.Sound, pitch: parselmouth.Pitch
+        cls, harmonicity: parselmouth.Harmonicity, pitch: parselmouth.Pitch
     ) -> float:
         """Calculate harmonics-to-noise ratio."""
         MIN_HNR_VALUE = -10.0
 
-        harmonicity = praat_call(
-            sound, 'To Harmonicity (cc)', 0.01, 75, 0.1, 1.0
-        )
-
-        hnr_values = []
-        num_frames = praat_call(pitch, 'Get number of frames')
-
-        for i in range(1, num_frames + 1):
-            time = praat_call(pitch, 'Get time from frame number', i)
-            f0 = praat_call(pitch, 'Get value in frame', i, 'Hertz')
-
-            if not (f0 > 0 and not np.isnan(f0)):
-                continue
-
-            hnr_val = praat_call(harmonicity, 'Get value at time', time, 'cubic')
-
-            if not np.isnan(hnr_val) and hnr_val > MIN_HNR_VALUE:
-                hnr_values.append(hnr_val)
-
-        return np.mean(hnr_values) if hnr_values else 0.0
-
-    # Manter a versão antiga para referência temporariamente
-    @classmethod
-    def _get_voiced_segments_old(cls, pitch: parselmouth.Pitch) -> List[tuple]:
-        """Extract voiced segments from pitch."""
-        MIN_VOICED_SEGMENT_DURATION = 0.4
-        MAX_GAP = 0.1
-
-        voiced_segments = []
-        segment_start = None
-        last_voiced_time = None
-        num_frames = praat_call(pitch, 'Get number of frames')
-
-        for i in range(1, num_frames + 1):
-            time = praat_call(pitch, 'Get time from frame number', i)
-            f0 = praat_call(pitch, 'Get value in frame', i, 'Hertz')
-
-            is_voiced = f0 > 0 and not np.isnan(f0)
+        pitch_times, f0_values = praat_frames.pitch_frames(pitch)
+        voiced_times = pitch_times[f0_values > 0]
 
-            if not is_voiced:
-                continue
-
-            if segment_start is None:
-                segment_start = time
-            elif last_voiced_time and (time - last_voiced_time) > MAX_GAP:
-                duration = last_voiced_time - segment_start
-                if duration >= MIN_VOICED_SEGMENT_DURATION:
-                    voiced_segments.append((segment_start, last_voiced_time))
-                segment_start = time
-
-            last_voiced_time = time
-
-        if segment_start and last_voiced_time:
-            duration = last_voiced_time - segment_start
-            if duration >= MIN_VOICED_SEGMENT_DURATION:
-                voiced_segments.append((segment_start, last_voiced_time))
+        hnr_times, hnr_frames = praat_frames.harmonicity_frames(harmonicity)
+        hnr_values = praat_frames.interpolate_at(
+            voiced_times, hnr_times, hnr_frames
+        )
+        hnr_values = hnr_values[hnr_values > MIN_HNR_VALUE]
 
-        return voiced_segments
+        return float(np.mean(hnr_values)) if hnr_values.size else 0.0
 
     @classmethod
     def _get_voiced_segments(cls, pitch: parselmouth.Pitch) -> List[tuple]:
@@ -474,18 +359,7 @@ class AudioAdapter(AudioPort):
     @classmethod
     def _extract_pitch_frames(cls, pitch: parselmouth.Pitch) -> tuple:
         """Extract time and f0 values from pitch object."""
-        num_frames = praat_call(pitch, 'Get number of frames')
-
-        times = []
-        f0_values = []
-
-        for i in range(1, num_frames + 1):
-            time = praat_call(pitch, 'Get time from frame number', i)
-            f0 = praat_call(pitch, 'Get value in frame', i, 'Hertz')
-            times.append(time)
-            f0_values.append(f0)
-
-        return np.array(times), np.array(f0_values)
+        return praat_frames.pitch_frames(pitch)
 
     @classmethod
     def _calculate_jitter_shimmer_optimized(
@@ -502,16 +376,11 @@ class AudioAdapter(AudioPort):
             return 0.0, 0.0
 
         # Otimização: Extrair todos os tempos de pulsos de uma vez só
-        num_pulses = praat_call(pulses, 'Get number of points')
+        pulse_times = praat_frames.pulse_times(pulses)
 
-        if num_pulses < MIN_VALID_PULSES:
+        if len(pulse_times) < MIN_VALID_PULSES:
             return 0.0, 0.0
 
-        pulse_times = np.array([
-            praat_call(pulses, 'Get time from index', p)
-            for p in range(1, num_pulses + 1)
-        ])
-
         jitter_values = []
         shimmer_values = []
         durations = []
@@ -573,76 +442,3 @@ class AudioAdapter(AudioPort):
         )
 
         return jitter, shimmer
-
-    # Manter a versão antiga para referência temporariamente
-    @classmethod
-    def _calculate_jitter_shimmer_old(
-        cls, sound: parselmouth.Sound, pulses, voiced_segments: List[tuple]
-    ) -> tuple[float, float]:
-        """Calculate jitter and shimmer values."""
-        MAX_JITTER = 0.05
-        MAX_SHIMMER = 0.15
-        min_valid_pulses = 10
-
-        num_pulses = praat_call(pulses, 'Get number of points')
-        jitter_values = []
-        shimmer_values = []
-        durations = []
-
-        for start, end in voiced_segments:
-            duration = end - start
-
-            # Count pulses in segment
-            pulses_count = 0
-            for p in range(1, num_pulses + 1):
-                pulse_time = praat_call(pulses, 'Get time from index', p)
-                if start <= pulse_time <= end:
-                    pulses_count += 1
-
-            if pulses_count < min_valid_pulses:
-                continue
-
-            try:
-                jitter = praat_call(
-                    pulses, 'Get jitter (rap)', start, end, 0.0001, 0.02, 1.3
-                )
-
-                shimmer = praat_call(
-                    [sound, pulses],
-                    'Get shimmer (apq3)',
-                    start,
-                    end,
-                    0.0001,
-                    0.02,
-                    1.3,
-                    1.6,
-                )
-
-                if (
-                    not np.isnan(jitter)
-                    and 0 < jitter < MAX_JITTER
-                    and not np.isnan(shimmer)
-                    and 0 < shimmer < MAX_SHIMMER
-                ):
-                    jitter_values.append(jitter)
-                    shimmer_values.append(shimmer)
-                    durations.append(duration)
-
-            except Exception:
-                continue
-
-        if not durations:
-            return 0.0, 0.0
-
-        total_dur = sum(durations)
-
-        if total_dur == 0:
-            return 0.0, 0.0
-
-        sum_jitter = sum(j * d for j, d in zip(jitter_values, durations))
-        jitter = sum_jitter / total_dur
-
-        sum_shimmer = sum(s * d for s, d in zip(shimmer_values, durations))
-        shimmer = sum_shimmer / total_dur
-
-        return jitter, shimmer
@@ -0,0 +1,116 @@
+from dataclasses import dataclass
+from functools import cached_property
+
+import parselmouth
+from parselmouth.praat import call as praat_call
+
+from ....domain.models.audio import AudioContext, NormalizedAudio
+
+LOWCUT = 80
+HIGHCUT = 8000
+SMOOTH = 300
+
+PITCH_FLOOR = 75.0
+PITCH_CEILING = 600.0
+CONTOUR_TIME_STEP = 0.01
+VOCAL_QUALITY_INTENSITY = 70.0
+
+
+@dataclass
+class ParselmouthAudioContext(AudioContext):
+    """
+    Normalized PCM wrapped once in a Praat Sound. The filtered signal and
+    the derived Pitch, Intensity, Harmonicity and PointProcess objects are
+    computed on first access and shared by every prosody step of the
+    analysis.
+    """
+
+    sound: parselmouth.Sound
+
+    @classmethod
+    def from_normalized(
+        cls, audio: NormalizedAudio
+    ) -> 'ParselmouthAudioContext':
+        sound = parselmouth.Sound(
+            audio.samples, sampling_frequency=audio.sample_rate
+        )
+        return cls(audio_path=audio.source_path, sound=sound)
+
+    @property
+    def duration(self) -> float:
+        return self.sound.get_total_duration()
+
+    @cached_property
+    def filtered_sound(self) -> parselmouth.Sound:
+        return praat_call(
+            self.sound, 'Filter (pass Hann band)', LOWCUT, HIGHCUT, SMOOTH
+        )
+
+    @cached_property
+    def pitch(self) -> parselmouth.Pitch:
+        """Pitch of the filtered signal with Praat's automatic time step."""
+        return praat_call(
+            self.filtered_sound, 'To Pitch', 0.0, PITCH_FLOOR, PITCH_CEILING
+        )
+
+    @cached_property
+    def contour_pitch(self) -> parselmouth.Pitch:
+        return praat_call(
+            self.filtered_sound,
+            'To Pitch',
+            CONTOUR_TIME_STEP,
+            PITCH_FLOOR,
+            PITCH_CEILING,
+        )
+
+    @cached_property
+    def contour_intensity(self) -> parselmouth.Intensity:
+        return praat_call(
+            self.filtered_sound, 'To Intensity', PITCH_FLOOR, CONTOUR_TIME_STEP
+        )
+
+    @cached_property
+    def intensity(self) -> parselmouth.Intensity:
+        """Intensity of the raw signal, used for the intensity statistics."""
+        return self.sound.to_intensity(minimum_pitch=PITCH_FLOOR)
+
+    @cached_property
+    def voicing_pitch(self) -> parselmouth.Pitch:
+        """Pitch of the raw signal, used to select voiced intensity frames."""
+        return self.sound.to_pitch(
+            pitch_floor=PITCH_FLOOR, pitch_ceiling=PITCH_CEILING
+        )
+
+    @cached_property
+    def vocal_sound(self) -> parselmouth.Sound:
+        """
+        Copy of the filtered signal scaled to a fixed intensity. 'Scale
+        intensity' works in place, so the shared filtered sound is not used.
+        """
+        sound = self.filtered_sound.copy()
+        praat_call(sound, 'Scale intensity', VOCAL_QUALITY_INTENSITY)
+        return sound
+
+    @cached_property
+    def harmonicity(self) -> parselmouth.Harmonicity:
+        return praat_call(
+            self.vocal_sound, 'To Harmonicity (cc)', 0.01, PITCH_FLOOR, 0.1, 1.0
+        )
+
+    @cached_property
+    def pulses(self) -> parselmouth.Data:
+        """
+        Glottal pulses of the scaled signal. Pitch is scale invariant, so the
+        filtered pitch is reused instead of tracking the scaled copy again.
+        """
+        try:
+            return praat_call(
+                [self.vocal_sound, self.pitch],
+                'To PointProcess (peaks)',
+                'yes',
+                'no',
+            )
+        except Exception:
+            return praat_call(
+                [self.vocal_sound, self.pitch], 'To PointProcess (cc)'
+            )
@@ -0,0 +1,194 @@
+import struct
+from dataclasses import dataclass
+from typing import Optional
+
+# Quanto do início do arquivo o probe aceita guardar procurando o cabeçalho
+# (fora uma tag ID3, que é só contada e descartada)
+MAX_HEADER_BYTES = 1024 * 1024
+MP3_FRAME_SEARCH_BYTES = 64 * 1024
+
+MPEG1_LAYER3_BITRATES = (
+    0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320,
+)  # fmt: skip
+MPEG2_LAYER3_BITRATES = (
+    0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160,
+)  # fmt: skip
+MPEG1_SAMPLE_RATES = (44100, 48000, 32000)
+# Bits de versão do cabeçalho: 00 MPEG 2.5, 10 MPEG 2, 11 MPEG 1
+MPEG_VERSION_DIVISORS = {0b00: 4, 0b10: 2, 0b11: 1}
+LAYER3 = 0b01
+MONO = 0b11
+STEREO_CHANNELS = 2
+FRAME_SYNC = 0x7FF
+XING_FRAMES_FLAG = 0x1
+VBRI_OFFSET = 36
+
+WAV_PCM_HEADER = struct.Struct('<HHIIHH')
+UNKNOWN_DATA_SIZES = {0, 0xFFFFFFFF}
+
+
+class UnsupportedAudioError(ValueError):
+    """O conteúdo não começa com um cabeçalho WAV ou MP3 reconhecível."""
+
+
+@dataclass
+class AudioHeader:
+    codec: str
+    sample_rate: int
+    channels: int
+    duration: Optional[float]
+
+
+class AudioHeaderProbe:
+    """
+    Lê o cabeçalho de um WAV ou MP3 à medida que os bytes chegam, sem
+    esperar o arquivo inteiro, e estima a duração:
+
+    - WAV: tamanho do chunk `data` dividido pela taxa de bytes do `fmt `;
+    - MP3 VBR: número de frames do cabeçalho Xing/Info ou VBRI;
+    - MP3 CBR: tamanho esperado do arquivo (`expected_size`) pelo bitrate.
+
+    A duração fica None quando não dá para estimá-la pelo cabeçalho (um WAV
+    gravado em streaming, ou um CBR sem tamanho esperado).
+    """
+
+    def __init__(self, expected_size: Optional[int] = None):
+        self.expected_size = expected_size
+        self.header: Optional[AudioHeader] = None
+        self._buffer = bytearray()
+        self._skip = 0
+        self._consumed = 0
+
+    def feed(self, chunk: bytes) -> Optional[AudioHeader]:
+        """Devolve o cabeçalho assim que ele é reconhecido."""
+        if self.header is not None:
+            return self.header
+
+        if self._skip:
+            skipped = min(self._skip, len(chunk))
+            self._skip -= skipped
+            self._consumed += skipped
+            chunk = chunk[skipped:]
+        self._buffer += chunk
+
+        if len(self._buffer) >= 4:  # noqa: PLR2004
+            self.header = self._parse()
+        if self.header is None and len(self._buffer) > MAX_HEADER_BYTES:
+            raise UnsupportedAudioError('Cabeçalho de áudio não encontrado')
+        return self.header
+
+    def _parse(self) -> Optional[AudioHeader]:
+        data = bytes(self._buffer)
+        if data.startswith(b'RIFF'):
+            return self._parse_wav(data)
+        if data.startswith(b'ID3') or data[0] == 0xFF:  # noqa: PLR2004
+            return self._parse_mp3(data)
+        raise UnsupportedAudioError('O arquivo não é WAV nem MP3')
+
+    def _parse_wav(self, data: bytes) -> Optional[AudioHeader]:
+        if len(data) < 12:  # noqa: PLR2004
+            return None
+        if data[8:12] != b'WAVE':
+            raise UnsupportedAudioError('Arquivo RIFF sem formato WAVE')
+
+        offset = 12
+        fmt = None
+        while offset + 8 <= len(data):
+            chunk_id = data[offset : offset + 4]
+            (chunk_size,) = struct.unpack_from('<I', data, offset + 4)
+            body = offset + 8
+            if chunk_id == b'fmt ':
+                if body + WAV_PCM_HEADER.size > len(data):
+                    return None
+                fmt = WAV_PCM_HEADER.unpack_from(data, body)
+            elif chunk_id == b'data':
+                if fmt is None:
+                    raise UnsupportedAudioError('WAV sem chunk fmt')
+                _, channels, sample_rate, byte_rate, _, _ = fmt
+                if chunk_size in UNKNOWN_DATA_SIZES and self.expected_size:
+                    chunk_size = self.expected_size - body
+                duration = (
+                    chunk_size / byte_rate
+                    if byte_rate and chunk_size not in UNKNOWN_DATA_SIZES
+                    else None
+                )
+                return AudioHeader('wav', sample_rate, channels, duration)
+            # Chunks têm tamanho par; o byte de padding não entra no size
+            offset = body + chunk_size + (chunk_size & 1)
+        return None
+
+    def _parse_mp3(self, data: bytes) -> Optional[AudioHeader]:
+        if data.startswith(b'ID3'):
+            if len(data) < 10:  # noqa: PLR2004
+                return None
+            size = 0
+            for byte in data[6:10]:
+                size = (size << 7) | (byte & 0x7F)
+            tag_size = 10 + size + (10 if data[5] & 0x10 else 0)
+            # A tag (capa do álbum, às vezes) é contada, não guardada
+            self._consumed += min(tag_size, len(data))
+            self._skip = max(tag_size - len(data), 0)
+            del self._buffer[: min(tag_size, len(data))]
+            return self._parse_mp3(bytes(self._buffer)) if self._buffer else None
+
+        frame_offset = self._find_frame(data)
+        if frame_offset is None:
+            if len(data) > MP3_FRAME_SEARCH_BYTES:
+                raise UnsupportedAudioError('Nenhum frame MP3 encontrado')
+            return None
+        if frame_offset + VBRI_OFFSET + 18 > len(data):
+            return None
+        return self._read_frame(data, frame_offset)
+
+    @staticmethod
+    def _find_frame(data: bytes) -> Optional[int]:
+        offset = data.find(b'\xff')
+        while 0 <= offset < len(data) - 3:
+            (header,) = struct.unpack_from('>I', data, offset)
+            if (
+                header >> 21 == FRAME_SYNC
+                and (header >> 19) & 0b11 in MPEG_VERSION_DIVISORS
+                and (header >> 17) & 0b11 == LAYER3
+                and 0 < (header >> 12) & 0xF < 0xF  # noqa: PLR2004
+                and (header >> 10) & 0b11 < 0b11  # noqa: PLR2004
+            ):
+                return offset
+            offset = data.find(b'\xff', offset + 1)
+        return None
+
+    def _read_frame(self, data: bytes, offset: int) -> AudioHeader:
+        (header,) = struct.unpack_from('>I', data, offset)
+        version = (header >> 19) & 0b11
+        mpeg1 = version == 0b11  # noqa: PLR2004
+        bitrates = MPEG1_LAYER3_BITRATES if mpeg1 else MPEG2_LAYER3_BITRATES
+        bitrate = bitrates[(header >> 12) & 0xF] * 1000
+        sample_rate = (
+            MPEG1_SAMPLE_RATES[(header >> 10) & 0b11]
+            // MPEG_VERSION_DIVISORS[version]
+        )
+        channels = 1 if (header >> 6) & 0b11 == MONO else 2
+        samples_per_frame = 1152 if mpeg1 else 576
+
+        # O cabeçalho Xing/Info fica logo depois do side info do frame
+        stereo = channels == STEREO_CHANNELS
+        if mpeg1:
+            side_info = 32 if stereo else 17
+        else:
+            side_info = 17 if stereo else 9
+        frames = None
+        xing = offset + 4 + side_info
+        if data[xing : xing + 4] in {b'Xing', b'Info'}:
+            (flags,) = struct.unpack_from('>I', data, xing + 4)
+            if flags & XING_FRAMES_FLAG:
+                (frames,) = struct.unpack_from('>I', data, xing + 8)
+        elif data[offset + VBRI_OFFSET : offset + VBRI_OFFSET + 4] == b'VBRI':
+            (frames,) = struct.unpack_from('>I', data, offset + VBRI_OFFSET + 14)
+
+        if frames:
+            duration = frames * samples_per_frame / sample_rate
+        elif self.expected_size:
+            audio_bytes = self.expected_size - self._consumed - offset
+            duration = audio_bytes * 8 / bitrate
+        else:
+            duration = None
+        return AudioHeader('mp3', sample_rate, channels, duration)
@@ -0,0 +1,118 @@
+import logging
+import os
+import pathlib
+import subprocess
+import tempfile
+from typing import Iterable
+
+import numpy as np
+
+from ....domain.models.audio import NormalizedAudio
+from ....domain.ports.output import AudioNormalizationPort
+
+logger = logging.getLogger(__name__)
+
+# Taxa de entrada do Whisper; o Praat e a duração usam o mesmo buffer
+SAMPLE_RATE = 16000
+PCM_SUFFIX = '.f32'
+
+
+class PcmNormalizerAdapter(AudioNormalizationPort):
+    """
+    Decodes the upload once with ffmpeg into raw mono float32 PCM in a local
+    scratch file, and memory-maps the result. The upload is piped into
+    ffmpeg as it is read from the blob store, so it never needs a local
+    copy. The map is copy-on-write, so consumers that need a writable array
+    (torch.from_numpy) get one without touching the file or copying pages
+    they only read.
+    """
+
+    @classmethod
+    def normalize(cls, source: str, chunks: Iterable[bytes]) -> NormalizedAudio:
+        """
+        Decode the audio to 16 kHz mono float32 PCM.
+
+        :param source: Blob key of the uploaded mp3/wav file.
+        :param chunks: Content of the upload, in order.
+        :return: The normalized audio with its memory-mapped samples.
+        """
+        fd, pcm_path = tempfile.mkstemp(suffix=PCM_SUFFIX)
+        os.close(fd)
+        command = [
+            'ffmpeg',
+            '-nostdin',
+            '-threads',
+            '0',
+            '-i',
+            'pipe:0',
+            '-f',
+            'f32le',
+            '-ac',
+            '1',
+            '-acodec',
+            'pcm_f32le',
+            '-ar',
+            str(SAMPLE_RATE),
+            '-y',
+            pcm_path,
+        ]
+        try:
+            cls._run_ffmpeg(command, chunks)
+        except BaseException:
+            pathlib.Path(pcm_path).unlink(missing_ok=True)
+            raise
+
+        return NormalizedAudio(
+            source_path=source,
+            pcm_path=pcm_path,
+            sample_rate=SAMPLE_RATE,
+            samples=cls._map_samples(pcm_path),
+        )
+
+    @staticmethod
+    def _run_ffmpeg(command: list[str], chunks: Iterable[bytes]) -> None:
+        # stderr vai para um arquivo: um pipe cheio travaria o ffmpeg
+        # enquanto ainda estamos escrevendo no stdin dele
+        with tempfile.TemporaryFile() as stderr:
+            process = subprocess.Popen(
+                command,
+                bufsize=0,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=stderr,
+            )
+            try:
+                for chunk in chunks:
+                    process.stdin.write(chunk)
+            except BrokenPipeError:
+                # O ffmpeg saiu antes do fim; o código de saída diz por quê
+                pass
+            except BaseException:
+                process.kill()
+                process.wait()
+                raise
+            finally:
+                process.stdin.close()
+
+            if process.wait() != 0:
+                stderr.seek(0)
+                raise RuntimeError(
+                    'Error normalizing audio: '
+                    f'{stderr.read().decode(errors="replace")}'
+                )
+
+    @staticmethod
+    def _map_samples(pcm_path: str) -> np.ndarray:
+        # np.memmap não aceita arquivos vazios
+        if os.path.getsize(pcm_path) == 0:
+            return np.zeros(0, dtype=np.float32)
+        return np.memmap(pcm_path, dtype=np.float32, mode='c')
+
+    @staticmethod
+    def release(audio: NormalizedAudio) -> None:
+        """Deletes the PCM file; the map stays valid until collected."""
+        try:
+            os.remove(audio.pcm_path)
+            logger.info(f'Normalized audio {audio.pcm_path} deleted.')
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,86 @@
+"""
+NumPy access to the frames of Praat objects.
+
+Every helper reads a whole object in one call instead of issuing one
+``praat_call`` per frame or pulse. Undefined values (unvoiced pitch frames,
+silent harmonicity frames) are returned as ``NaN``.
+"""
+
+import numpy as np
+import parselmouth
+from parselmouth.praat import call as praat_call
+
+UNDEFINED_HARMONICITY = -200.0
+HALF_FRAME = 0.5
+
+
+def pitch_frames(pitch: parselmouth.Pitch) -> tuple[np.ndarray, np.ndarray]:
+    """Frame times and f0 values in Hertz."""
+    f0_values = np.array(pitch.selected_array['frequency'], dtype=float)
+    f0_values[f0_values <= 0] = np.nan
+    return np.asarray(pitch.xs(), dtype=float), f0_values
+
+
+def intensity_frames(
+    intensity: parselmouth.Intensity,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Frame times and intensity values in dB."""
+    return (
+        np.asarray(intensity.xs(), dtype=float),
+        np.array(intensity.values[0], dtype=float),
+    )
+
+
+def harmonicity_frames(
+    harmonicity: parselmouth.Harmonicity,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Frame times and harmonics-to-noise values in dB."""
+    hnr_values = np.array(harmonicity.values[0], dtype=float)
+    hnr_values[hnr_values <= UNDEFINED_HARMONICITY] = np.nan
+    return np.asarray(harmonicity.xs(), dtype=float), hnr_values
+
+
+def pulse_times(pulses: parselmouth.Data) -> np.ndarray:
+    """Times of every point of a PointProcess."""
+    if praat_call(pulses, 'Get number of points') == 0:
+        return np.empty(0)
+    return np.array(praat_call(pulses, 'To Matrix').values[0], dtype=float)
+
+
+def interpolate_at(
+    times: np.ndarray, frame_times: np.ndarray, frame_values: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorized equivalent of Praat's 'Get value at time' with linear
+    interpolation: undefined when the nearest frame is undefined or the time
+    is outside the frames, the nearest value when a neighbour is undefined,
+    and the linear interpolation of both neighbours otherwise.
+    """
+    times = np.asarray(times, dtype=float)
+    n_frames = len(frame_times)
+
+    if n_frames == 0:
+        return np.full(times.shape, np.nan)
+    if n_frames == 1:
+        return np.full(times.shape, frame_values[0])
+
+    time_step = (frame_times[-1] - frame_times[0]) / (n_frames - 1)
+    index = (times - frame_times[0]) / time_step
+
+    near = np.clip(np.floor(index + HALF_FRAME).astype(int), 0, n_frames - 1)
+    left = np.floor(index).astype(int)
+    right = left + 1
+
+    padded = np.concatenate([[np.nan], frame_values, [np.nan]])
+    near_values = frame_values[near]
+    left_values = padded[np.clip(left, -1, n_frames) + 1]
+    right_values = padded[np.clip(right, -1, n_frames) + 1]
+
+    phase = index - left
+    values = left_values + phase * (right_values - left_values)
+    values = np.where(
+        np.isnan(left_values) | np.isnan(right_values), near_values, values
+    )
+
+    outside = (index < -HALF_FRAME) | (index > n_frames - HALF_FRAME)
+    return np.where(outside | np.isnan(near_values), np.nan, values)
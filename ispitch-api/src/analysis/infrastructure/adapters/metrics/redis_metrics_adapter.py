@@ -0,0 +1,48 @@
+import json
+from typing import Callable
+
+import redis.asyncio as aioredis
+
+from ....domain.ports.output import MetricsStorePort
+
+KEY_PREFIX = 'metrics:process:'
+
+
+class RedisMetricsAdapter(MetricsStorePort):
+    """
+    Stand-in for a Prometheus pushgateway: each worker process overwrites
+    its snapshot every `push_interval_seconds` and the key expires a few
+    intervals after it stops, so a dead worker's series leave
+    /metrics/workers while a couple of failed pushes do not.
+
+    `redis_client` is resolved on each call, as in RedisBlobReferences.
+    """
+
+    def __init__(
+        self,
+        redis_client: Callable[[], aioredis.Redis],
+        push_interval_seconds: int,
+    ):
+        self._redis_client = redis_client
+        self._ttl_seconds = 4 * push_interval_seconds
+
+    async def push(self, process: str, snapshot: dict) -> None:
+        await self._redis_client().set(
+            f'{KEY_PREFIX}{process}', json.dumps(snapshot), ex=self._ttl_seconds
+        )
+
+    async def remove(self, process: str) -> None:
+        await self._redis_client().delete(f'{KEY_PREFIX}{process}')
+
+    async def collect(self) -> dict[str, dict]:
+        redis_client = self._redis_client()
+        keys = [key async for key in redis_client.scan_iter(f'{KEY_PREFIX}*')]
+        if not keys:
+            return {}
+        snapshots = await redis_client.mget(keys)
+        return {
+            key.decode().removeprefix(KEY_PREFIX): json.loads(snapshot)
+            for key, snapshot in zip(keys, snapshots)
+            # Expirou entre o SCAN e o MGET
+            if snapshot is not None
+        }
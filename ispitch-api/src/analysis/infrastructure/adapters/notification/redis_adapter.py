@@ -1,27 +1,82 @@
-import json
 import logging
 
 import redis.asyncio as aioredis
 
 from src.analysis.domain.ports.output import NotificationPort
 
+from .....core.config import settings
+from .....core.metrics import timed
 from ....domain.models.events import SseEvent
 
 logger = logging.getLogger(__name__)
 
+# Grava o evento no stream da análise (limitado e com expiração) e avisa os
+# processos da API pelo pubsub, já com o ID do stream, em uma só ida ao
+# Redis. O ID é o que o cliente SSE devolve em Last-Event-ID ao reconectar.
+PUBLISH_SCRIPT = """
+local id = redis.call(
+    'XADD', KEYS[1], 'MAXLEN', '~', ARGV[1], '*',
+    'event', ARGV[3], 'data', ARGV[4]
+)
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+redis.call('PUBLISH', ARGV[5], cjson.encode({
+    id = id, event = ARGV[3], data = ARGV[4]
+}))
+return id
+"""
+
+
+def channel_name(analysis_id: str) -> str:
+    return f'analysis:{analysis_id}'
+
+
+def stream_key(analysis_id: str) -> str:
+    return f'analysis:{analysis_id}:events'
+
 
 class RedisNotificationAdapter(NotificationPort):
     def __init__(self, redis_client: aioredis.Redis):
         self.redis_client = redis_client
+        self._publish_script = redis_client.register_script(PUBLISH_SCRIPT)
 
     async def publish(
         self, analysis_id: str, event: SseEvent, data: str
     ) -> None:
-        channel = f'analysis:{analysis_id}'
-        message = json.dumps({'event': event.value, 'data': data})
-        await self.redis_client.publish(channel, message)
+        with timed('redis.publish'):
+            await self._publish_script(
+                **self._script_args(analysis_id, event, data)
+            )
 
         if event == SseEvent.STATUS_UPDATE:
             logger.info(f'[{analysis_id}] Published status: {data}')
         else:
             logger.info(f'[{analysis_id}] Published event: {event.value}')
+
+    async def publish_many(
+        self, events: list[tuple[str, SseEvent, str]]
+    ) -> None:
+        """Os scripts vão num só pipeline: uma ida ao Redis para todos."""
+        if not events:
+            return
+        with timed('redis.publish_many'):
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for analysis_id, event, data in events:
+                    await self._publish_script(
+                        **self._script_args(analysis_id, event, data),
+                        client=pipe,
+                    )
+                await pipe.execute()
+        logger.info(f'Published {len(events)} events')
+
+    @staticmethod
+    def _script_args(analysis_id: str, event: SseEvent, data: str) -> dict:
+        return {
+            'keys': [stream_key(analysis_id)],
+            'args': [
+                settings.analysis_events_max_len,
+                settings.analysis_events_ttl_seconds,
+                event.value,
+                data,
+                channel_name(analysis_id),
+            ],
+        }
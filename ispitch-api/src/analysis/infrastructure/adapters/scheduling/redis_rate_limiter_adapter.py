@@ -0,0 +1,53 @@
+import time
+from typing import Callable
+
+import redis.asyncio as aioredis
+
+from ....domain.ports.output import RateLimiterPort
+
+# Token bucket: recarrega `rate` permissões por segundo até `capacity`. O
+# saldo volta como string, já que o Redis truncaria um número do Lua.
+ACQUIRE_SCRIPT = """
+local capacity, rate = tonumber(ARGV[1]), tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+-- Cheio de novo, o bucket equivale a um que não existe
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisRateLimiterAdapter(RateLimiterPort):
+    """
+    Per-key token bucket in Redis, shared by every API process.
+
+    `redis_client` is resolved on each call, as in RedisBlobReferences.
+    """
+
+    def __init__(
+        self,
+        redis_client: Callable[[], aioredis.Redis],
+        capacity: int,
+        rate_per_second: float,
+    ):
+        self._redis_client = redis_client
+        self._capacity = capacity
+        self._rate_per_second = rate_per_second
+
+    async def acquire(self, key: str) -> float:
+        wait = await self._redis_client().register_script(ACQUIRE_SCRIPT)(
+            keys=[f'ratelimit:{key}'],
+            args=[self._capacity, self._rate_per_second, time.time()],
+        )
+        return float(wait)
@@ -0,0 +1,304 @@
+import itertools
+import json
+import time
+from typing import Callable
+
+import redis.asyncio as aioredis
+
+from ....domain.models.scheduling import (
+    LaneLoad,
+    QueuedAnalysis,
+    QueueLane,
+    QueuePosition,
+)
+from ....domain.ports.output import AnalysisSchedulerPort
+
+# Cada fila tem uma lista circular de tenants com análises aguardando e uma
+# lista de análises por tenant. As vagas ocupadas ficam em sorted sets (da
+# fila e de cada tenant, somando as filas) com o fim da concessão como score:
+# a vaga de um worker que morreu sem liberá-la volta quando a concessão vence.
+# Cada fila também soma os segundos de áudio aguardando ou em execução e
+# guarda a média móvel do tempo de vaga por segundo de áudio, medida no fim
+# de cada análise, que o controle de admissão usa.
+#
+# Os scripts montam as chaves dos tenants a partir dos prefixos, então
+# pressupõem um Redis sem cluster, como o resto da aplicação.
+SCRIPT_ARGS = """
+local tenants, running, running_jobs = KEYS[1], KEYS[2], KEYS[3]
+local audio, realtime_factor = KEYS[4], KEYS[5]
+local lane_prefix, tenant_prefix = ARGV[1], ARGV[2]
+local now, slots = tonumber(ARGV[3]), tonumber(ARGV[4])
+local tenant_slots, lease = tonumber(ARGV[5]), tonumber(ARGV[6])
+local tenant, value, duration = ARGV[7], ARGV[8], tonumber(ARGV[9])
+
+local function release(analysis_id)
+    local started = redis.call('HGET', running_jobs, analysis_id)
+    if started then
+        started = cjson.decode(started)
+        redis.call('HDEL', running_jobs, analysis_id)
+        redis.call('INCRBYFLOAT', audio, -started['duration'])
+    end
+    return started
+end
+"""
+
+SUBMIT = """
+if redis.call('RPUSH', lane_prefix .. ':pending:' .. tenant, value) == 1 then
+    redis.call('RPUSH', tenants, tenant)
+end
+redis.call('INCRBYFLOAT', audio, duration)
+"""
+
+# ARGV[10]: '1' se a análise terminou bem (as falhas não entram na média);
+# ARGV[11]: peso da nova medida na média móvel
+COMPLETE = """
+local started = release(value)
+if started and ARGV[10] == '1' and started['duration'] > 0 then
+    local sample = (now - started['started']) / started['duration']
+    local current = tonumber(redis.call('GET', realtime_factor))
+    if current then
+        sample = current + tonumber(ARGV[11]) * (sample - current)
+    end
+    redis.call('SET', realtime_factor, sample)
+end
+redis.call('ZREM', running, value)
+redis.call('ZREM', tenant_prefix .. tenant, value)
+"""
+
+# Cada vaga vai para o tenant com menos análises em execução (somando as
+# filas), abaixo do próprio limite; no empate, o que está há mais tempo sem
+# ser atendido, pela ordem da lista. O atendido vai para o fim da lista.
+DISPATCH = """
+for _, analysis_id in ipairs(
+    redis.call('ZRANGEBYSCORE', running, '-inf', now)
+) do
+    release(analysis_id)
+end
+redis.call('ZREMRANGEBYSCORE', running, '-inf', now)
+
+local dispatched = {}
+while redis.call('ZCARD', running) < slots do
+    local chosen, fewest = nil, tenant_slots
+    for _, candidate in ipairs(redis.call('LRANGE', tenants, 0, -1)) do
+        local candidate_running = tenant_prefix .. candidate
+        redis.call('ZREMRANGEBYSCORE', candidate_running, '-inf', now)
+        local count = redis.call('ZCARD', candidate_running)
+        if count < fewest then
+            chosen, fewest = candidate, count
+        end
+    end
+    if not chosen then
+        break
+    end
+
+    local pending = lane_prefix .. ':pending:' .. chosen
+    local job = redis.call('LPOP', pending)
+    redis.call('LREM', tenants, 1, chosen)
+    if redis.call('LLEN', pending) > 0 then
+        redis.call('RPUSH', tenants, chosen)
+    end
+    if job then
+        local data = cjson.decode(job)
+        local chosen_running = tenant_prefix .. chosen
+        redis.call('ZADD', running, lease, data['analysis_id'])
+        redis.call('ZADD', chosen_running, lease, data['analysis_id'])
+        redis.call('EXPIREAT', chosen_running, math.ceil(lease))
+        redis.call('HSET', running_jobs, data['analysis_id'], cjson.encode({
+            started = now, duration = data['duration']
+        }))
+        table.insert(dispatched, job)
+    end
+end
+
+-- Fila vazia: zera a soma, sem o resíduo dos INCRBYFLOAT
+if redis.call('LLEN', tenants) == 0 and redis.call('ZCARD', running) == 0 then
+    redis.call('SET', audio, 0)
+end
+return dispatched
+"""
+
+# Desfaz o despacho de uma análise que não chegou à fila de tarefas: ela
+# volta para o início da fila do tenant (e o tenant para o início da lista)
+REQUEUE = """
+local data = cjson.decode(value)
+release(data['analysis_id'])
+redis.call('ZREM', running, data['analysis_id'])
+redis.call('ZREM', tenant_prefix .. tenant, data['analysis_id'])
+if redis.call('LPUSH', lane_prefix .. ':pending:' .. tenant, value) == 1 then
+    redis.call('LREM', tenants, 0, tenant)
+    redis.call('LPUSH', tenants, tenant)
+end
+redis.call('INCRBYFLOAT', audio, duration)
+return {}
+"""
+
+SUBMIT_SCRIPT = SCRIPT_ARGS + SUBMIT + DISPATCH
+COMPLETE_SCRIPT = SCRIPT_ARGS + COMPLETE + DISPATCH
+DISPATCH_SCRIPT = SCRIPT_ARGS + DISPATCH
+REQUEUE_SCRIPT = SCRIPT_ARGS + REQUEUE
+
+# Sem análises aguardando não há posições a publicar, e o intervalo não é
+# consumido
+CLAIM_POSITIONS_SCRIPT = """
+if redis.call('LLEN', KEYS[1]) == 0 then
+    return 0
+end
+return redis.call('SET', KEYS[2], 1, 'NX', 'PX', ARGV[1]) and 1 or 0
+"""
+
+KEY_PREFIX = 'scheduler'
+# Peso de cada análise concluída na média móvel do fator de tempo real
+REALTIME_FACTOR_WEIGHT = 0.2
+
+
+def lane_prefix(lane: QueueLane) -> str:
+    return f'{KEY_PREFIX}:{lane.value}'
+
+
+def tenant_running_prefix() -> str:
+    return f'{KEY_PREFIX}:running:'
+
+
+class RedisSchedulerAdapter(AnalysisSchedulerPort):
+    """
+    Fair-share scheduler kept in Redis and shared by the API (which submits
+    analyses) and the workers (which free their slot at the end). Each lane
+    has a fixed number of slots, the concurrency of the workers consuming
+    it; an analysis only reaches the Celery queue once it holds one, so the
+    broker queues stay short and the order is decided here.
+
+    The per-tenant limit spans both lanes, so a completion re-dispatches
+    every lane: a tenant at its limit may have analyses waiting in the
+    other one.
+
+    `redis_client` is resolved on each call, as in RedisBlobReferences.
+    """
+
+    def __init__(
+        self,
+        redis_client: Callable[[], aioredis.Redis],
+        lane_slots: dict[QueueLane, int],
+        tenant_slots: int,
+        lease_seconds: int,
+    ):
+        self._redis_client = redis_client
+        self._lane_slots = lane_slots
+        self._tenant_slots = tenant_slots
+        self._lease_seconds = lease_seconds
+
+    async def submit(self, job: QueuedAnalysis) -> list[QueuedAnalysis]:
+        return await self._run(
+            SUBMIT_SCRIPT,
+            job.lane,
+            [job.tenant, json.dumps(job.to_dict()), job.duration],
+        )
+
+    async def complete(
+        self, job: QueuedAnalysis, succeeded: bool
+    ) -> list[QueuedAnalysis]:
+        dispatched = await self._run(
+            COMPLETE_SCRIPT,
+            job.lane,
+            [
+                job.tenant,
+                job.analysis_id,
+                job.duration,
+                '1' if succeeded else '0',
+                REALTIME_FACTOR_WEIGHT,
+            ],
+        )
+        for lane in QueueLane:
+            if lane != job.lane:
+                dispatched += await self.dispatch(lane)
+        return dispatched
+
+    async def dispatch(self, lane: QueueLane) -> list[QueuedAnalysis]:
+        return await self._run(DISPATCH_SCRIPT, lane, ['', '', 0])
+
+    async def requeue(self, job: QueuedAnalysis) -> None:
+        await self._run(
+            REQUEUE_SCRIPT,
+            job.lane,
+            [job.tenant, json.dumps(job.to_dict()), job.duration],
+        )
+
+    async def claim_positions_update(
+        self, lane: QueueLane, interval_seconds: float
+    ) -> bool:
+        # Um processo por intervalo, entre todos os da API e os workers
+        prefix = lane_prefix(lane)
+        claimed = await self._redis_client().register_script(
+            CLAIM_POSITIONS_SCRIPT
+        )(
+            keys=[f'{prefix}:tenants', f'{prefix}:positions_published'],
+            args=[max(1, int(interval_seconds * 1000))],
+        )
+        return bool(claimed)
+
+    async def load(self, lane: QueueLane) -> LaneLoad:
+        prefix = lane_prefix(lane)
+        audio, realtime_factor = await self._redis_client().mget(
+            f'{prefix}:audio', f'{prefix}:realtime_factor'
+        )
+        return LaneLoad(
+            audio_seconds=max(0.0, float(audio or 0)),
+            realtime_factor=(
+                float(realtime_factor) if realtime_factor is not None else None
+            ),
+        )
+
+    async def positions(self, lane: QueueLane) -> list[QueuePosition]:
+        """
+        Posição aproximada de cada análise aguardando na fila: a ordem em
+        que uma volta por tenant de cada vez as atenderia.
+        """
+        redis_client = self._redis_client()
+        prefix = lane_prefix(lane)
+        tenants = await redis_client.lrange(f'{prefix}:tenants', 0, -1)
+        async with redis_client.pipeline(transaction=True) as pipe:
+            for tenant in tenants:
+                pipe.lrange(f'{prefix}:pending:{tenant.decode()}', 0, -1)
+            queues = await pipe.execute()
+
+        positions = []
+        audio_ahead = 0.0
+        for job in itertools.chain.from_iterable(itertools.zip_longest(*queues)):
+            if job is None:
+                continue
+            data = json.loads(job)
+            positions.append(
+                QueuePosition(
+                    analysis_id=data['analysis_id'],
+                    lane=lane,
+                    position=len(positions) + 1,
+                    audio_ahead=audio_ahead,
+                )
+            )
+            audio_ahead += data['duration']
+        return positions
+
+    async def _run(
+        self, script: str, lane: QueueLane, job_args: list[object]
+    ) -> list[QueuedAnalysis]:
+        """`job_args`: ARGV[7] em diante (tenant, valor, duração...)."""
+        now = time.time()
+        prefix = lane_prefix(lane)
+        dispatched = await self._redis_client().register_script(script)(
+            keys=[
+                f'{prefix}:tenants',
+                f'{prefix}:running',
+                f'{prefix}:running_jobs',
+                f'{prefix}:audio',
+                f'{prefix}:realtime_factor',
+            ],
+            args=[
+                prefix,
+                tenant_running_prefix(),
+                now,
+                self._lane_slots[lane],
+                self._tenant_slots,
+                now + self._lease_seconds,
+                *job_args,
+            ],
+        )
+        return [QueuedAnalysis.from_dict(json.loads(job)) for job in dispatched]
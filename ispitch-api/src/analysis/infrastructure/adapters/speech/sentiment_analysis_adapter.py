@@ -1,5 +1,7 @@
 import logging
+from collections import defaultdict
 
+import torch
 from transformers import pipeline
 
 from ....domain.models.sentiment import SentimentAnalysis, SentimentSegment
@@ -7,9 +9,34 @@ from ....domain.ports.output import SentimentAnalysisPort
 
 logger = logging.getLogger(__name__)
 
+MODEL_NAME = 'pysentimiento/bertweet-pt-sentiment'
+
+DEFAULT_BATCH_SIZE = 32
+DEFAULT_MAX_LENGTH = 128
+DEFAULT_WINDOW_STRIDE = 32
+
+LABELS = {'POS': 'positivo', 'NEG': 'negativo', 'NEU': 'neutro'}
+
 
 class SentimentAnalysisAdapter(SentimentAnalysisPort):
-    def __init__(self):
+    def __init__(
+        self,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_length: int = DEFAULT_MAX_LENGTH,
+        window_stride: int = DEFAULT_WINDOW_STRIDE,
+    ):
+        """
+        Args:
+            batch_size: Quantidade de janelas por forward pass.
+            max_length: Tamanho máximo de uma janela, em tokens, incluindo os
+                tokens especiais (o BERTweet aceita no máximo 128).
+            window_stride: Sobreposição, em tokens, entre janelas
+                consecutivas de um texto maior que `max_length`.
+        """
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.window_stride = window_stride
+
         try:
             # Carrega um modelo de pipeline focado em sentimento para português.
             # Este modelo é baseado em BERT e entende contexto.
@@ -18,7 +45,7 @@ class SentimentAnalysisAdapter(SentimentAnalysisPort):
                 'Carregando modelo de análise de sentimento (Hugging Face)...'
             )
             self.sentiment_pipeline = pipeline(
-                'sentiment-analysis', model='pysentimiento/bertweet-pt-sentiment'
+                'sentiment-analysis', model=MODEL_NAME
             )
             logger.info('Modelo de análise de sentimento carregado com sucesso.')
         except Exception as e:
@@ -37,39 +64,98 @@ class SentimentAnalysisAdapter(SentimentAnalysisPort):
         Returns:
             Um objeto SentimentAnalysis contendo a timeline do sentimento.
         """
+        return self.analyze_batch([text])[0]
+
+    def analyze_batch(self, texts: list[str]) -> list[SentimentAnalysis]:
+        """
+        Analisa o sentimento de vários textos em mini-batches.
+
+        Cada texto é dividido em janelas de no máximo `max_length` tokens.
+        As janelas de todos os textos são ordenadas por tamanho e agrupadas
+        em batches com padding dinâmico, e as probabilidades das janelas de
+        um mesmo texto são combinadas pela média.
+
+        Returns:
+            Um SentimentAnalysis por texto, na ordem de entrada. Textos que
+            não puderam ser analisados recebem uma timeline vazia.
+        """
         if self.sentiment_pipeline is None:
             logger.warning(
                 'Pipeline de sentimento não está disponível. Pulando análise.'
             )
-            return SentimentAnalysis(timeline=[])
+            return [SentimentAnalysis(timeline=[]) for _ in texts]
 
         try:
-            # O pipeline retorna uma lista de resultados. Pega o primeiro.
-            # Ex: [{'label': 'POS', 'score': 0.98}]
-            result = self.sentiment_pipeline(text)[0]
-
-            label = result['label']
-            score = result['score']
+            probabilities = self._predict(texts)
+        except Exception as e:
+            logger.error(
+                f'Erro durante a análise de sentimento: {e}', exc_info=True
+            )
+            return [SentimentAnalysis(timeline=[]) for _ in texts]
 
-            # Converte a label do modelo para o nosso formato de domínio
-            if label == 'POS':
-                sentiment = 'positivo'
-            elif label == 'NEG':
-                sentiment = 'negativo'
-            else:  # (NEU)
-                sentiment = 'neutro'
+        id2label = self.sentiment_pipeline.model.config.id2label
+        results = []
+        for index in range(len(texts)):
+            if index not in probabilities:
+                results.append(SentimentAnalysis(timeline=[]))
+                continue
 
+            label_id = int(torch.argmax(probabilities[index]))
             segment = SentimentSegment(
                 start_time=0,
                 end_time=0,
-                sentiment=sentiment,
-                score=round(score, 4),
+                sentiment=LABELS.get(id2label[label_id], 'neutro'),
+                score=round(float(probabilities[index][label_id]), 4),
             )
+            results.append(SentimentAnalysis(timeline=[segment]))
 
-            return SentimentAnalysis(timeline=[segment])
+        return results
 
-        except Exception as e:
-            logger.error(
-                f'Erro durante a análise de sentimento: {e}', exc_info=True
-            )
-            return SentimentAnalysis(timeline=[])
+    def _predict(self, texts: list[str]) -> dict[int, torch.Tensor]:
+        """Probabilidade média das janelas de cada texto, por índice."""
+        tokenizer = self.sentiment_pipeline.tokenizer
+        model = self.sentiment_pipeline.model
+
+        windows = [
+            (index, window)
+            for index, text in enumerate(texts)
+            for window in self._split_windows(text)
+        ]
+        windows.sort(key=lambda item: len(item[1]))
+
+        totals: dict[int, torch.Tensor] = {}
+        counts: dict[int, int] = defaultdict(int)
+
+        with torch.inference_mode():
+            for start in range(0, len(windows), self.batch_size):
+                batch = windows[start : start + self.batch_size]
+                inputs = tokenizer.pad(
+                    {'input_ids': [window for _, window in batch]},
+                    return_tensors='pt',
+                ).to(model.device)
+                scores = torch.softmax(model(**inputs).logits, dim=-1).cpu()
+
+                for (index, _), score in zip(batch, scores):
+                    totals[index] = totals.get(index, 0) + score
+                    counts[index] += 1
+
+        return {index: totals[index] / counts[index] for index in totals}
+
+    def _split_windows(self, text: str) -> list[list[int]]:
+        """Ids de cada janela do texto, já com os tokens especiais."""
+        tokenizer = self.sentiment_pipeline.tokenizer
+        ids = tokenizer(text, add_special_tokens=False)['input_ids']
+        if not ids:
+            return []
+
+        body = self.max_length - tokenizer.num_special_tokens_to_add()
+        step = max(body - self.window_stride, 1)
+
+        starts = list(range(0, max(len(ids) - body, 0) + 1, step))
+        if starts[-1] + body < len(ids):
+            starts.append(len(ids) - body)
+
+        return [
+            tokenizer.build_inputs_with_special_tokens(ids[i : i + body])
+            for i in starts
+        ]
@@ -1,12 +1,48 @@
+from celery import chain, chord
+
+from src.analysis.domain.models.scheduling import QueuedAnalysis
 from src.analysis.domain.ports.output import TaskQueuePort
-from src.core.celery_config import celery_app
+from src.core.celery_config import celery_app, lane_queue
+from src.core.config import settings
 
 
 class CeleryTaskQueueAdapter(TaskQueuePort):
     @classmethod
-    def enqueue_analysis(
-        self, analysis_id: str, user_id: str, audio_path: str, filename: str
-    ) -> None:
+    def enqueue_analysis(cls, job: QueuedAnalysis) -> None:
+        if settings.analysis_pipeline == 'staged':
+            cls._enqueue_stages(job.to_dict())
+            return
+
         celery_app.send_task(
-            'run_analysis', args=[analysis_id, user_id, audio_path, filename]
+            'run_analysis',
+            args=[job.to_dict()],
+            queue=lane_queue('run_analysis', job.lane.value),
+        )
+
+    @staticmethod
+    def _enqueue_stages(job: dict) -> None:
+        """
+        transcribe e prosody em paralelo; nlp recebe os dois resultados e
+        finalize o de nlp. Uma falha em qualquer tarefa dispara analysis.fail.
+        """
+
+        # Por nome: a API não importa os módulos das tarefas. Só os grupos
+        # iniciais ignoram o resultado da tarefa anterior.
+        def task(name: str, immutable: bool = False):
+            task_name = f'analysis.{name}'
+            return celery_app.signature(
+                task_name,
+                args=(job,),
+                immutable=immutable,
+                queue=lane_queue(task_name, job['lane']),
+            )
+
+        workflow = chain(
+            chord(
+                [task('transcribe', True), task('prosody', True)],
+                task('nlp'),
+            ),
+            task('finalize'),
         )
+        workflow.on_error(task('fail'))
+        workflow.apply_async()
@@ -1,5 +1,10 @@
 import logging
 import re
+import threading
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
 
 import nltk
 import torch
@@ -29,6 +34,35 @@ FILLER_REGEX = re.compile('|'.join(FILLER_WORDS_TO_REMOVE), re.IGNORECASE)
 
 PROMPT_STYLE = PromptStyle.DETAILED
 
+DEFAULT_BATCH_SIZE = 8
+DEFAULT_NUM_BEAMS = 4
+DEFAULT_CACHE_SIZE = 256
+# Os limites de tamanho dos resumos são arredondados para baixo a múltiplos
+# disto: segmentos de tamanhos próximos caem no mesmo lote
+SUMMARY_LENGTH_STEP = 10
+
+
+class DecodingMode(str, Enum):
+    SAMPLE = 'sample'
+    GREEDY = 'greedy'
+    BEAM = 'beam'
+
+
+@dataclass(frozen=True)
+class GenerationConfig:
+    """
+    decoding: 'sample' keeps the original sampled summaries; 'greedy' and
+        'beam' are reproducible and their summaries are cached.
+    num_beams: Beams used by the 'beam' mode.
+    batch_size: Segments summarized per `generate` call.
+    cache_size: Summaries kept in the LRU cache (deterministic modes).
+    """
+
+    decoding: DecodingMode = DecodingMode.SAMPLE
+    num_beams: int = DEFAULT_NUM_BEAMS
+    batch_size: int = DEFAULT_BATCH_SIZE
+    cache_size: int = DEFAULT_CACHE_SIZE
+
 
 def WHITESPACE_HANDLER(k):
     return re.sub(r'\s+', ' ', re.sub(r'\n+', ' ', k.strip()))
@@ -41,13 +75,24 @@ class HuggingFaceTopicAdapter(TopicModelPort):
     """
 
     def __init__(
-        self, tokenizer: T5Tokenizer, model: T5ForConditionalGeneration
+        self,
+        tokenizer: T5Tokenizer,
+        model: T5ForConditionalGeneration,
+        generation: Optional[GenerationConfig] = None,
     ):
         self.tokenizer = tokenizer
         self.model = model
         self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
         self.model.to(self.device)
 
+        generation = generation or GenerationConfig()
+        self.decoding = DecodingMode(generation.decoding)
+        self.num_beams = generation.num_beams
+        self.batch_size = generation.batch_size
+        self.cache_size = generation.cache_size
+        self._cache: OrderedDict[tuple, str] = OrderedDict()
+        self._cache_lock = threading.Lock()
+
     def extract_topics(self, text: str) -> TopicAnalysis:
         if not text or len(text.split()) < MIN_WORDS_FOR_TOPIC_ANALYSIS:
             return TopicAnalysis(topics=[])
@@ -62,8 +107,7 @@ class HuggingFaceTopicAdapter(TopicModelPort):
 
         segments = self._segment_text(processed_text)
 
-        topics = []
-
+        requests = []
         for segment in segments:
             segment_word_count = len(segment.split())
 
@@ -78,10 +122,16 @@ class HuggingFaceTopicAdapter(TopicModelPort):
 
             max_len = min(150, max(50, int(segment_word_count * 0.5)))
             min_len = max(30, int(segment_word_count * 0.2))
-            summary_text = self._run_summarization(
-                segment_text, max_tokens=max_len, min_tokens=min_len
-            )
+            requests.append((
+                segment_text,
+                self._round_length(max_len),
+                self._round_length(min_len),
+            ))
+
+        summaries = self._run_summarization_batch(requests)
 
+        topics = []
+        for (segment_text, _, _), summary_text in zip(requests, summaries):
             if (
                 not summary_text
                 or len(summary_text.split()) < MIN_WORDS_FOR_SUMMARY
@@ -124,13 +174,12 @@ class HuggingFaceTopicAdapter(TopicModelPort):
 
         return segments
 
-    def _run_summarization(
-        self, text_to_summarize: str, max_tokens: int, min_tokens: int
-    ) -> str:
-        """
-        Handles tokenization, generation, and decoding with proper prompts.
-        """
+    @staticmethod
+    def _round_length(tokens: int) -> int:
+        return tokens - tokens % SUMMARY_LENGTH_STEP
 
+    @staticmethod
+    def _build_prompt(text_to_summarize: str) -> str:
         if 'ptt5' in MODEL_NAME.lower() or 't5' in MODEL_NAME.lower():
             prompt = f'summarize: {text_to_summarize}'
         elif 'mbart' in MODEL_NAME.lower():
@@ -138,38 +187,112 @@ class HuggingFaceTopicAdapter(TopicModelPort):
         else:
             prompt = text_to_summarize
 
-        cleaned_text = WHITESPACE_HANDLER(prompt)
+        return WHITESPACE_HANDLER(prompt)
 
-        input_ids = self.tokenizer(
-            [cleaned_text],
+    def _run_summarization_batch(
+        self, requests: list[tuple[str, int, int]]
+    ) -> list[str]:
+        """
+        Summarizes (text, max_tokens, min_tokens) requests, returning the
+        summaries in the same order.
+
+        Requests are grouped by their length limits, so every summary is
+        generated with its own limits and the cache key describes it. Each
+        group is sorted by prompt length and generated in mini-batches
+        padded to their longest prompt. In deterministic modes, cached
+        summaries are reused and new ones are stored.
+        """
+        prompts = [self._build_prompt(text) for text, _, _ in requests]
+        keys = [
+            (prompt, max_tokens, min_tokens)
+            for prompt, (_, max_tokens, min_tokens) in zip(prompts, requests)
+        ]
+
+        summaries: list[str | None] = [self._cache_get(key) for key in keys]
+        pending: defaultdict[tuple[int, int], list[int]] = defaultdict(list)
+        for i, summary in enumerate(summaries):
+            if summary is None:
+                pending[keys[i][1:]].append(i)
+
+        for (max_tokens, min_tokens), indexes in pending.items():
+            indexes.sort(key=lambda i: len(prompts[i]))
+            for start in range(0, len(indexes), self.batch_size):
+                batch = indexes[start : start + self.batch_size]
+                outputs = self._generate(
+                    [prompts[i] for i in batch],
+                    max_tokens=max_tokens,
+                    min_tokens=min_tokens,
+                )
+                for i, summary in zip(batch, outputs):
+                    summaries[i] = summary
+                    self._cache_put(keys[i], summary)
+
+        return summaries
+
+    def _generate(
+        self, prompts: list[str], max_tokens: int, min_tokens: int
+    ) -> list[str]:
+        """
+        Handles tokenization, generation, and decoding of one batch.
+        """
+        inputs = self.tokenizer(
+            prompts,
             return_tensors='pt',
-            padding='max_length',
+            padding=True,
             truncation=True,
             max_length=512,
-        )['input_ids'].to(self.device)
-
-        output_ids = self.model.generate(
-            input_ids=input_ids,
-            max_length=max_tokens,
-            min_length=min_tokens,
-            do_sample=True,
-            temperature=0.8,
-            top_p=0.9,
-            no_repeat_ngram_size=3,
-        )[0]
-
-        summary = self.tokenizer.decode(
+        ).to(self.device)
+
+        with torch.inference_mode():
+            output_ids = self.model.generate(
+                input_ids=inputs['input_ids'],
+                attention_mask=inputs['attention_mask'],
+                max_length=max_tokens,
+                min_length=min_tokens,
+                no_repeat_ngram_size=3,
+                **self._decoding_kwargs(),
+            )
+
+        summaries = self.tokenizer.batch_decode(
             output_ids,
             skip_special_tokens=True,
             clean_up_tokenization_spaces=False,
         )
 
         # Remove o prompt se ele aparecer no output
-        summary = (
+        return [
             summary.replace('summarize:', '').replace('Resumir:', '').strip()
-        )
-
-        return summary
+            for summary in summaries
+        ]
+
+    def _decoding_kwargs(self) -> dict:
+        if self.decoding == DecodingMode.GREEDY:
+            return {'do_sample': False, 'num_beams': 1}
+        if self.decoding == DecodingMode.BEAM:
+            return {
+                'do_sample': False,
+                'num_beams': self.num_beams,
+                'early_stopping': True,
+            }
+        return {'do_sample': True, 'temperature': 0.8, 'top_p': 0.9}
+
+    def _cache_get(self, key: tuple) -> str | None:
+        if self.decoding == DecodingMode.SAMPLE:
+            return None
+        with self._cache_lock:
+            summary = self._cache.get(key)
+            if summary is not None:
+                self._cache.move_to_end(key)
+            return summary
+
+    def _cache_put(self, key: tuple, summary: str) -> None:
+        if self.decoding == DecodingMode.SAMPLE or self.cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._cache[key] = summary
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
 
     @staticmethod
     def _build_summarization_prompt(text: str) -> str:
@@ -0,0 +1,117 @@
+"""
+Divisão de áudios longos em janelas limitadas por silêncio, para transcrever
+em partes com memória limitada e publicar cada parte assim que termina.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+FRAME_SECONDS = 0.03
+
+
+@dataclass(frozen=True)
+class AudioChunk:
+    """
+    Janela [`start`, `end`) do áudio, em segundos, transcrita com `overlap`
+    segundos de contexto de cada lado. Só as palavras que começam dentro
+    da janela pertencem a ela.
+    """
+
+    index: int
+    start: float
+    end: float
+    overlap: float
+
+    @property
+    def padded_start(self) -> float:
+        return max(self.start - self.overlap, 0.0)
+
+    @property
+    def padded_end(self) -> float:
+        return self.end + self.overlap
+
+
+def find_chunks(
+    audio: np.ndarray,
+    sample_rate: int,
+    chunk_seconds: float,
+    search_seconds: float,
+    overlap_seconds: float,
+) -> list[AudioChunk]:
+    """
+    Corta o áudio a cada ~`chunk_seconds`, no frame de menor energia dos
+    últimos `search_seconds` de cada janela, para não cortar palavras.
+    """
+    duration = len(audio) / sample_rate
+    frame = max(int(FRAME_SECONDS * sample_rate), 1)
+    frame_seconds = frame / sample_rate
+    search_seconds = min(search_seconds, chunk_seconds / 2)
+
+    n_frames = len(audio) // frame
+    energy = np.sqrt(
+        np.mean(
+            np.square(audio[: n_frames * frame].reshape(n_frames, frame)),
+            axis=1,
+        )
+    )
+
+    cuts = [0.0]
+    while duration - cuts[-1] > chunk_seconds:
+        target = cuts[-1] + chunk_seconds
+        first = int((target - search_seconds) / frame_seconds)
+        last = int(target / frame_seconds)
+        window = energy[max(first, 0) : last]
+        if len(window) == 0:
+            cuts.append(target)
+            continue
+        quietest = max(first, 0) + int(np.argmin(window))
+        cuts.append((quietest + 0.5) * frame_seconds)
+    cuts.append(duration)
+
+    return [
+        AudioChunk(index=i, start=start, end=end, overlap=overlap_seconds)
+        for i, (start, end) in enumerate(zip(cuts, cuts[1:]))
+    ]
+
+
+def slice_chunk(
+    audio: np.ndarray, sample_rate: int, chunk: AudioChunk
+) -> np.ndarray:
+    start = int(chunk.padded_start * sample_rate)
+    end = int(chunk.padded_end * sample_rate)
+    return audio[start:end]
+
+
+def stitch_chunk_result(result: dict, chunk: AudioChunk, first_id: int) -> dict:
+    """
+    Desloca os tempos do resultado do Whisper para a linha do tempo do áudio
+    completo e descarta as palavras da sobreposição. Os segmentos mantêm a
+    numeração contínua a partir de `first_id`.
+    """
+    offset = chunk.padded_start
+    segments = []
+
+    for segment in result.get('segments', []):
+        words = []
+        for word in segment.get('words', []):
+            start = word.get('start', 0.0) + offset
+            if chunk.start <= start < chunk.end:
+                words.append({
+                    'word': word.get('word', ''),
+                    'start': round(start, 3),
+                    'end': round(word.get('end', 0.0) + offset, 3),
+                })
+
+        if not words:
+            continue
+
+        segments.append({
+            'id': first_id + len(segments),
+            'start': words[0]['start'],
+            'text': ''.join(word['word'] for word in words),
+            'words': words,
+        })
+
+    text = ''.join(segment['text'] for segment in segments)
+    return {'text': text, 'segments': segments}
@@ -0,0 +1,76 @@
+import logging
+from typing import Optional
+
+from faster_whisper import BatchedInferencePipeline, WhisperModel
+
+from ....domain.mappers.transcription_mapper import TranscriptionMapper
+from ....domain.models.audio import NormalizedAudio
+from ....domain.models.transcription import Transcription
+from ....domain.ports.output import PartialTranscriptCallback, TranscriptionPort
+from .prompt import VERBATIM_PROMPT
+
+logger = logging.getLogger(__name__)
+
+
+class FasterWhisperAdapter(TranscriptionPort):
+    """
+    Transcription with faster-whisper (CTranslate2).
+
+    The model runs quantized (int8 by default) and the batched pipeline
+    decodes several VAD-bounded windows per beam search call. The result
+    goes through the same TranscriptionMapper as the openai-whisper backend.
+    Each decoded segment is reported through `on_partial`.
+
+    Requires the optional `faster-whisper` dependency.
+    """
+
+    def __init__(
+        self,
+        model: WhisperModel,
+        beam_size: int = 5,
+        batch_size: int = 8,
+    ):
+        self.model = model
+        self.pipeline = BatchedInferencePipeline(model=model)
+        self.beam_size = beam_size
+        self.batch_size = batch_size
+
+    def transcribe(
+        self,
+        audio: NormalizedAudio,
+        on_partial: Optional[PartialTranscriptCallback] = None,
+    ) -> Transcription:
+        # O pipeline aceita o array de 16 kHz sem decodificar de novo
+        segments, _ = self.pipeline.transcribe(
+            audio.samples,
+            beam_size=self.beam_size,
+            batch_size=self.batch_size,
+            word_timestamps=True,
+            initial_prompt=VERBATIM_PROMPT,
+        )
+
+        result_segments = []
+        for segment in segments:
+            result_segment = {
+                'id': len(result_segments),
+                'start': segment.start,
+                'text': segment.text,
+                'words': [
+                    {'word': word.word, 'start': word.start, 'end': word.end}
+                    for word in segment.words or []
+                ],
+            }
+            result_segments.append(result_segment)
+
+            if on_partial is not None:
+                on_partial(
+                    TranscriptionMapper.from_whisper_result({
+                        'text': segment.text,
+                        'segments': [result_segment],
+                    })
+                )
+
+        return TranscriptionMapper.from_whisper_result({
+            'text': ''.join(segment['text'] for segment in result_segments),
+            'segments': result_segments,
+        })
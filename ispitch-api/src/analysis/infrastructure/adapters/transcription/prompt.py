@@ -0,0 +1,23 @@
+# Prompt inicial compartilhado pelos backends de transcrição baseados no Whisper
+VERBATIM_PROMPT = (
+    'Você é um especialista em transcrição verbatim (literal). '
+    'Sua tarefa é transcrever o áudio a seguir com a máxima '
+    'fidelidade ao que foi dito, seguindo rigorosamente estas '
+    'diretrizes:\n\n'
+    '1.  **Transcrição Estritamente Literal:** Preserve '
+    'absolutamente todas as palavras, incluindo hesitações, '
+    'repetições, falsos começos e interjeições.\n'
+    '2.  **Manter Palavras de Preenchimento:** Não remova ou '
+    'edite vícios de linguagem e pausas preenchidas. Mantenha '
+    'explicitamente termos como:\n'
+    '    * `hã`, `ãh`, `hum`\n'
+    '    * `né`, `tipo`, `sabe`\n'
+    '    * `então`, `aí`, `assim`\n'
+    '    * `bom`, `certo`, `ok`, `tá`\n'
+    '3.  **Não Realizar Correções:** Não corrija erros '
+    'gramaticais, de concordância ou de pronúncia. '
+    'Transcreva exatamente o que foi falado.\n\n'
+    '**Exemplo do Formato Esperado:**\n'
+    '"Bom, então, tipo, ãh... eu acho que a gente precisa, '
+    'sabe... focar nisso aí, né? Tá?"\n'
+)
@@ -1,54 +1,110 @@
+import logging
+from typing import Optional
+
+import whisper
 from whisper import Whisper
 
 from ....domain.mappers.transcription_mapper import TranscriptionMapper
-from ....domain.ports.output import TranscriptionPort
+from ....domain.models.audio import NormalizedAudio
+from ....domain.models.transcription import Transcription
+from ....domain.ports.output import PartialTranscriptCallback, TranscriptionPort
+from .chunking import find_chunks, slice_chunk, stitch_chunk_result
+from .prompt import VERBATIM_PROMPT
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = whisper.audio.SAMPLE_RATE
 
 
 class WhisperAdapter(TranscriptionPort):
     """
     Service responsible for handling audio transcription
     using the Whisper model.
+
+    With a positive `chunk_seconds`, audio longer than one chunk is
+    transcribed in silence-bounded windows and every finished window is
+    reported through `on_partial`.
     """
 
-    def __init__(self, whisper: Whisper):
+    def __init__(
+        self,
+        whisper: Whisper,
+        chunk_seconds: float = 0,
+        chunk_overlap_seconds: float = 1.0,
+        chunk_search_seconds: float = 5.0,
+    ):
         self.whisper = whisper
+        self.chunk_seconds = chunk_seconds
+        self.chunk_overlap_seconds = chunk_overlap_seconds
+        self.chunk_search_seconds = chunk_search_seconds
 
-    def transcribe(self, audio_path: str):
+    def transcribe(
+        self,
+        audio: NormalizedAudio,
+        on_partial: Optional[PartialTranscriptCallback] = None,
+    ) -> Transcription:
         """
-        Transcribe the audio file at the given path using the Whisper model.
+        Transcribe the normalized audio using the Whisper model.
 
         Args:
-        audio_path: Path to the audio file to be transcribed
+        audio: 16 kHz mono samples from the normalization stage
+        on_partial: Called with the transcription of each finished chunk
 
         Returns:
-        str: The transcribed text from the audio file.
+        Transcription: The transcribed text and word timestamps.
         """
+        samples = audio.samples
+        if (
+            self.chunk_seconds <= 0
+            or len(samples) <= self.chunk_seconds * SAMPLE_RATE
+        ):
+            return self._transcribe_whole(samples, on_partial)
 
-        prompt = (
-            'Você é um especialista em transcrição verbatim (literal). '
-            'Sua tarefa é transcrever o áudio a seguir com a máxima '
-            'fidelidade ao que foi dito, seguindo rigorosamente estas '
-            'diretrizes:\n\n'
-            '1.  **Transcrição Estritamente Literal:** Preserve '
-            'absolutamente todas as palavras, incluindo hesitações, '
-            'repetições, falsos começos e interjeições.\n'
-            '2.  **Manter Palavras de Preenchimento:** Não remova ou '
-            'edite vícios de linguagem e pausas preenchidas. Mantenha '
-            'explicitamente termos como:\n'
-            '    * `hã`, `ãh`, `hum`\n'
-            '    * `né`, `tipo`, `sabe`\n'
-            '    * `então`, `aí`, `assim`\n'
-            '    * `bom`, `certo`, `ok`, `tá`\n'
-            '3.  **Não Realizar Correções:** Não corrija erros '
-            'gramaticais, de concordância ou de pronúncia. '
-            'Transcreva exatamente o que foi falado.\n\n'
-            '**Exemplo do Formato Esperado:**\n'
-            '"Bom, então, tipo, ãh... eu acho que a gente precisa, '
-            'sabe... focar nisso aí, né? Tá?"\n'
-        )
+        return self._transcribe_chunked(samples, on_partial)
 
+    def _transcribe_whole(
+        self, audio, on_partial: Optional[PartialTranscriptCallback]
+    ) -> Transcription:
         result = self.whisper.transcribe(
-            audio_path, fp16=False, word_timestamps=True, initial_prompt=prompt
+            audio,
+            fp16=False,
+            word_timestamps=True,
+            initial_prompt=VERBATIM_PROMPT,
         )
 
-        return TranscriptionMapper.from_whisper_result(result)
+        transcription = TranscriptionMapper.from_whisper_result(result)
+        if on_partial is not None:
+            on_partial(transcription)
+        return transcription
+
+    def _transcribe_chunked(
+        self, audio, on_partial: Optional[PartialTranscriptCallback]
+    ) -> Transcription:
+        chunks = find_chunks(
+            audio,
+            sample_rate=SAMPLE_RATE,
+            chunk_seconds=self.chunk_seconds,
+            search_seconds=self.chunk_search_seconds,
+            overlap_seconds=self.chunk_overlap_seconds,
+        )
+        logger.info(f'Transcribing audio in {len(chunks)} chunks')
+
+        text = ''
+        segments = []
+        for chunk in chunks:
+            result = self.whisper.transcribe(
+                slice_chunk(audio, SAMPLE_RATE, chunk),
+                fp16=False,
+                word_timestamps=True,
+                initial_prompt=VERBATIM_PROMPT,
+            )
+            partial = TranscriptionMapper.from_whisper_result(
+                stitch_chunk_result(result, chunk, first_id=len(segments))
+            )
+
+            text += partial.text
+            segments.extend(partial.segments)
+            if on_partial is not None:
+                on_partial(partial)
+
+        return Transcription(text=text, segments=segments)
@@ -0,0 +1,259 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field, replace
+from typing import Optional
+
+import torch
+import whisper
+from whisper import Whisper
+from whisper.timing import find_alignment
+from whisper.tokenizer import get_tokenizer
+
+from .prompt import VERBATIM_PROMPT
+
+logger = logging.getLogger(__name__)
+
+# Os mesmos padrões de whisper.transcribe: uma janela que parece repetição
+# (compressão alta) ou tem baixa confiança é decodificada de novo com
+# temperatura maior, a não ser que seja silêncio
+TEMPERATURES = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+COMPRESSION_RATIO_THRESHOLD = 2.4
+NO_SPEECH_THRESHOLD = 0.6
+LOGPROB_THRESHOLD = -1.0
+
+
+@dataclass
+class WindowRequest:
+    mel: torch.Tensor
+    num_frames: int
+    future: Future = field(default_factory=Future)
+
+
+@dataclass
+class WindowResult:
+    """Texto de uma janela e suas palavras, com tempos relativos à janela."""
+
+    text: str
+    words: list[dict]
+
+
+class WhisperBatchServer:
+    """
+    Servidor de inferência do Whisper compartilhado pelas tarefas de um
+    processo de worker.
+
+    Cada tarefa envia suas janelas de até 30 s (mel) com `submit` e aguarda
+    os futures. Uma única thread junta janelas de várias tarefas em um batch
+    de até `max_batch_size`, esperando no máximo `max_wait_ms` depois da
+    primeira, e roda encoder e decoder uma vez para o batch todo. Cada
+    tarefa tem sua própria fila e o batch é preenchido uma janela por tarefa
+    de cada vez: as janelas de uma gravação longa não passam na frente das
+    de um áudio curto que chegou depois.
+    O alinhamento das palavras roda na mesma thread, porque instala hooks
+    no modelo.
+
+    `result` espera uma janela por no máximo `timeout_seconds`: se a thread
+    do servidor morrer, a tarefa falha em vez de esperar para sempre.
+
+    A thread só é criada no primeiro `submit` do processo. Com
+    WORKER_PRELOAD_MODELS no prefork, o servidor é montado no processo pai,
+    e threads não sobrevivem ao fork: cada filho cria a sua, com filas
+    próprias, ao receber a primeira janela.
+    """
+
+    def __init__(
+        self,
+        model: Whisper,
+        max_batch_size: int,
+        max_wait_ms: int,
+        timeout_seconds: float,
+    ):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.timeout_seconds = timeout_seconds
+        self._options = whisper.DecodingOptions(
+            task='transcribe',
+            temperature=0.0,
+            without_timestamps=True,
+            fp16=False,
+            prompt=VERBATIM_PROMPT,
+        )
+        self._start_lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pending = threading.Condition()
+        # Uma fila de janelas por tarefa, na ordem da próxima vez de cada uma
+        self._jobs: deque[deque[WindowRequest]] = deque()
+
+    def submit(self, windows: list[tuple[torch.Tensor, int]]) -> list[Future]:
+        """Janelas (mel, num_frames) de uma tarefa, um future para cada."""
+        self._ensure_serving()
+        requests = deque(
+            WindowRequest(mel=mel, num_frames=num_frames)
+            for mel, num_frames in windows
+        )
+        futures = [request.future for request in requests]
+        if requests:
+            with self._pending:
+                self._jobs.append(requests)
+                self._pending.notify()
+        return futures
+
+    def result(self, future: Future) -> 'WindowResult':
+        try:
+            return future.result(timeout=self.timeout_seconds)
+        except FutureTimeoutError:
+            alive = (
+                'alive'
+                if self._thread is not None and self._thread.is_alive()
+                else 'dead'
+            )
+            raise RuntimeError(
+                f'Whisper window not decoded after {self.timeout_seconds:g}s '
+                f'(batch server thread {alive})'
+            ) from None
+
+    def _ensure_serving(self) -> None:
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            # Num filho do fork, as filas herdadas não têm consumidor
+            self._pending = threading.Condition()
+            self._jobs = deque()
+            self._thread = threading.Thread(
+                target=self._serve, name='whisper-batch-server', daemon=True
+            )
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _serve(self) -> None:
+        while True:
+            batch = self._collect_batch()
+            try:
+                results = self._run_batch(batch)
+            except Exception as e:
+                logger.error(f'Whisper batch failed: {e}', exc_info=True)
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+
+            for request, result in zip(batch, results):
+                request.future.set_result(result)
+
+    def _collect_batch(self) -> list[WindowRequest]:
+        batch = []
+        with self._pending:
+            while not self._jobs:
+                self._pending.wait()
+            deadline = time.monotonic() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                if self._jobs:
+                    # Uma janela da tarefa da vez, que volta para o fim
+                    job = self._jobs.popleft()
+                    batch.append(job.popleft())
+                    if job:
+                        self._jobs.append(job)
+                    continue
+
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                self._pending.wait(timeout)
+
+        return batch
+
+    def _run_batch(self, batch: list[WindowRequest]) -> list[WindowResult]:
+        mel = torch.stack([request.mel for request in batch]).to(
+            self.model.device
+        )
+        logger.debug(f'Decoding Whisper batch of {len(batch)} windows')
+        decoded = self._decode_with_fallback(mel)
+
+        return [
+            self._to_window_result(request, result)
+            for request, result in zip(batch, decoded)
+        ]
+
+    def _decode_with_fallback(
+        self, mel: torch.Tensor
+    ) -> list[whisper.DecodingResult]:
+        """
+        Decodifica o batch com temperatura 0 e redecodifica, juntas e com a
+        temperatura seguinte, só as janelas reprovadas.
+        """
+        decoded: list[Optional[whisper.DecodingResult]] = [None] * len(mel)
+        pending = list(range(len(mel)))
+        for temperature in TEMPERATURES:
+            options = replace(self._options, temperature=temperature)
+            with torch.inference_mode():
+                results = whisper.decode(self.model, mel[pending], options)
+
+            retry = []
+            for index, result in zip(pending, results):
+                decoded[index] = result
+                if self._needs_fallback(result):
+                    retry.append(index)
+            if retry and temperature != TEMPERATURES[-1]:
+                logger.debug(
+                    f'Retrying {len(retry)} Whisper windows above '
+                    f'temperature {temperature}'
+                )
+            pending = retry
+            if not pending:
+                break
+        return decoded
+
+    @staticmethod
+    def _needs_fallback(result: whisper.DecodingResult) -> bool:
+        if (
+            result.no_speech_prob > NO_SPEECH_THRESHOLD
+            and result.avg_logprob < LOGPROB_THRESHOLD
+        ):
+            return False
+        return (
+            result.compression_ratio > COMPRESSION_RATIO_THRESHOLD
+            or result.avg_logprob < LOGPROB_THRESHOLD
+        )
+
+    def _to_window_result(
+        self, request: WindowRequest, result: whisper.DecodingResult
+    ) -> WindowResult:
+        if (
+            result.no_speech_prob > NO_SPEECH_THRESHOLD
+            and result.avg_logprob < LOGPROB_THRESHOLD
+        ):
+            return WindowResult(text='', words=[])
+
+        tokenizer = get_tokenizer(
+            self.model.is_multilingual,
+            num_languages=self.model.num_languages,
+            language=result.language,
+            task='transcribe',
+        )
+        text_tokens = [token for token in result.tokens if token < tokenizer.eot]
+        timings = find_alignment(
+            self.model,
+            tokenizer,
+            text_tokens,
+            request.mel.to(self.model.device),
+            request.num_frames,
+        )
+
+        words = [
+            {
+                'word': timing.word,
+                'start': float(timing.start),
+                'end': float(timing.end),
+            }
+            for timing in timings
+        ]
+        return WindowResult(text=result.text, words=words)
@@ -0,0 +1,90 @@
+import logging
+from typing import Optional
+
+import whisper
+
+from ....domain.mappers.transcription_mapper import TranscriptionMapper
+from ....domain.models.audio import NormalizedAudio
+from ....domain.models.transcription import Transcription
+from ....domain.ports.output import PartialTranscriptCallback, TranscriptionPort
+from .chunking import find_chunks, slice_chunk, stitch_chunk_result
+from .whisper_batch_server import WhisperBatchServer
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = whisper.audio.SAMPLE_RATE
+HOP_LENGTH = whisper.audio.HOP_LENGTH
+WINDOW_SECONDS = whisper.audio.CHUNK_LENGTH
+
+
+class WhisperBatchedAdapter(TranscriptionPort):
+    """
+    Transcription through a shared WhisperBatchServer.
+
+    The audio is cut in silence-bounded windows that fit, with their
+    overlap, in one 30 s Whisper input. All windows of the job are submitted
+    at once, so the server can decode them together with the windows of the
+    other tasks running in the same worker process; the server takes them
+    in turns with the other jobs, not in arrival order.
+    """
+
+    def __init__(
+        self,
+        server: WhisperBatchServer,
+        chunk_seconds: float = 0,
+        chunk_overlap_seconds: float = 1.0,
+        chunk_search_seconds: float = 5.0,
+    ):
+        self.server = server
+        max_chunk_seconds = WINDOW_SECONDS - 2 * chunk_overlap_seconds
+        self.chunk_seconds = (
+            min(chunk_seconds, max_chunk_seconds)
+            if chunk_seconds > 0
+            else max_chunk_seconds
+        )
+        self.chunk_overlap_seconds = chunk_overlap_seconds
+        self.chunk_search_seconds = chunk_search_seconds
+
+    def transcribe(
+        self,
+        audio: NormalizedAudio,
+        on_partial: Optional[PartialTranscriptCallback] = None,
+    ) -> Transcription:
+        samples = audio.samples
+        chunks = find_chunks(
+            samples,
+            sample_rate=SAMPLE_RATE,
+            chunk_seconds=self.chunk_seconds,
+            search_seconds=self.chunk_search_seconds,
+            overlap_seconds=self.chunk_overlap_seconds,
+        )
+        logger.info(f'Submitting {len(chunks)} windows to the batch server')
+
+        windows = []
+        n_mels = self.server.model.dims.n_mels
+        for chunk in chunks:
+            window = slice_chunk(samples, SAMPLE_RATE, chunk)
+            mel = whisper.log_mel_spectrogram(
+                whisper.pad_or_trim(window), n_mels
+            )
+            windows.append((mel, len(window) // HOP_LENGTH))
+        futures = self.server.submit(windows)
+
+        text = ''
+        segments = []
+        for chunk, future in zip(chunks, futures):
+            window_result = self.server.result(future)
+            result = {
+                'text': window_result.text,
+                'segments': [{'words': window_result.words}],
+            }
+            partial = TranscriptionMapper.from_whisper_result(
+                stitch_chunk_result(result, chunk, first_id=len(segments))
+            )
+
+            text += partial.text
+            segments.extend(partial.segments)
+            if on_partial is not None:
+                on_partial(partial)
+
+        return Transcription(text=text, segments=segments)
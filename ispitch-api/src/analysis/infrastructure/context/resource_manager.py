@@ -1,52 +1,50 @@
 import logging
-from contextlib import asynccontextmanager
-from typing import AsyncIterator
+from typing import Optional
 
 import redis.asyncio as aioredis
 
 from ....core.config import settings
-from ....core.database import db
-from ...application.adapters.sse_adapter import RedisSSEAdapter
-from ...domain.ports.output import NotificationPort
-from ..adapters.notification.redis_adapter import RedisNotificationAdapter
-from ..persistance.documents.analysis_document import AnalysisDocument
+from ...application.adapters.redis_event_broker import RedisEventBroker
 
 logger = logging.getLogger(__name__)
 
 
 class ResourceManager:
-    @staticmethod
-    @asynccontextmanager
-    async def analysis_resources() -> AsyncIterator[NotificationPort]:
-        redis_client = None
-        try:
-            redis_client = aioredis.from_url(settings.redis_url)
-            await db.connect(document_models=[AnalysisDocument])
-            notification_port = RedisNotificationAdapter(redis_client)
-
-            logger.info('Async analysis resources initialized')
-            yield notification_port
-
-        except Exception as e:
-            logger.error(f'Error managing resources: {e}', exc_info=True)
-            raise
-        finally:
-            if redis_client:
-                await redis_client.close()
-            await db.close()
-            logger.info('Async analysis resources cleaned up')
-
-    @staticmethod
-    @asynccontextmanager
-    async def sse_adapter_context() -> AsyncIterator[RedisSSEAdapter]:
-        redis_client = None
-        try:
-            redis_client = aioredis.from_url(settings.redis_url)
-            sse_adapter = RedisSSEAdapter(redis_client)
-            yield sse_adapter
-        except Exception as e:
-            logger.error(f'Error initializing SSE adapter: {e}', exc_info=True)
-        finally:
-            if redis_client:
-                await redis_client.close()
-            logger.info('Redis SSE client cleaned up')
+    """
+    Recursos compartilhados pelo processo da API, abertos no lifespan. O
+    broker de eventos mantém uma única conexão de pubsub com o Redis para
+    todos os clientes SSE, em vez de um cliente e um pubsub por requisição.
+    """
+
+    _redis_client: Optional[aioredis.Redis] = None
+    _event_broker: Optional[RedisEventBroker] = None
+
+    @classmethod
+    async def start(cls) -> None:
+        cls._redis_client = aioredis.from_url(settings.redis_url)
+        cls._event_broker = RedisEventBroker(
+            cls._redis_client, queue_size=settings.sse_client_queue_size
+        )
+        await cls._event_broker.start()
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._event_broker:
+            await cls._event_broker.stop()
+        if cls._redis_client:
+            await cls._redis_client.aclose()
+        cls._event_broker = None
+        cls._redis_client = None
+        logger.info('Redis SSE client cleaned up')
+
+    @classmethod
+    def get_redis_client(cls) -> aioredis.Redis:
+        if cls._redis_client is None:
+            raise RuntimeError('Redis client has not been started.')
+        return cls._redis_client
+
+    @classmethod
+    def get_event_broker(cls) -> RedisEventBroker:
+        if cls._event_broker is None:
+            raise RuntimeError('SSE event broker has not been started.')
+        return cls._event_broker
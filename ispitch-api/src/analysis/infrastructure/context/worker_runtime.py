@@ -0,0 +1,186 @@
+import asyncio
+import logging
+import os
+import pathlib
+import socket
+import threading
+from typing import Any, Callable, Coroutine, Optional, TypeVar
+
+import redis.asyncio as aioredis
+
+from ....core.config import settings
+from ....core.database import db
+from ....core.metrics import registry
+from ...domain.ports.output import NotificationPort
+from ..adapters.metrics.redis_metrics_adapter import RedisMetricsAdapter
+from ..adapters.notification.redis_adapter import RedisNotificationAdapter
+from ..persistance.documents.analysis_document import AnalysisDocument
+from ..persistance.documents.analysis_stats_rollup_document import (
+    AnalysisStatsRollupDocument,
+)
+from ..persistance.documents.stage_cache_document import StageCacheDocument
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class WorkerRuntime:
+    """
+    Long-lived runtime of a Celery worker process.
+
+    Owns one event loop running in a background thread, the Mongo and Redis
+    connections opened on that loop, and the warm-up of the models. Tasks
+    submit their coroutines with `run`, so nothing is set up per job.
+
+    The loop also pushes the process metrics to Redis every
+    `metrics_push_interval_seconds`, for the API's /metrics/workers to
+    export.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._redis_client: Optional[aioredis.Redis] = None
+        self._notification_port: Optional[NotificationPort] = None
+        self._metrics_task: Optional[asyncio.Task] = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            raise RuntimeError('Worker runtime has not been started.')
+        return self._loop
+
+    @property
+    def redis_client(self) -> aioredis.Redis:
+        if self._redis_client is None:
+            raise RuntimeError('Worker runtime has not been started.')
+        return self._redis_client
+
+    @property
+    def notification_port(self) -> NotificationPort:
+        if self._notification_port is None:
+            raise RuntimeError('Worker runtime has not been started.')
+        return self._notification_port
+
+    def start(self, warm_up: Optional[Callable[[], None]] = None) -> None:
+        """
+        Starts the event loop, opens the connections and runs `warm_up`
+        (model loading) before signaling that the worker is ready.
+        Calling it again is a no-op.
+        """
+        with self._lock:
+            if self._loop is not None:
+                return
+
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._loop.run_forever,
+                name='worker-runtime-loop',
+                daemon=True,
+            )
+            self._thread.start()
+
+            self.run(self._open_resources())
+
+            if warm_up is not None:
+                logger.info('Warming up analysis models...')
+                warm_up()
+
+            self._mark_ready()
+            logger.info('Worker runtime ready')
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Runs a coroutine on the runtime loop and waits for its result."""
+        if self._loop is None:
+            self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._loop is None:
+                return
+
+            self._ready.clear()
+            self._remove_ready_file()
+
+            try:
+                asyncio.run_coroutine_threadsafe(
+                    self._close_resources(), self._loop
+                ).result()
+            finally:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join()
+                self._loop.close()
+                self._loop = None
+                self._thread = None
+                logger.info('Worker runtime stopped')
+
+    async def _open_resources(self) -> None:
+        self._redis_client = aioredis.from_url(settings.redis_url)
+        await db.connect(
+            document_models=[
+                AnalysisDocument,
+                AnalysisStatsRollupDocument,
+                StageCacheDocument,
+            ]
+        )
+        self._notification_port = RedisNotificationAdapter(self._redis_client)
+        if settings.metrics_push_interval_seconds > 0:
+            self._metrics_task = asyncio.create_task(self._push_metrics())
+        logger.info('Worker resources initialized')
+
+    async def _push_metrics(self) -> None:
+        interval = settings.metrics_push_interval_seconds
+        metrics_store = RedisMetricsAdapter(
+            lambda: self._redis_client, push_interval_seconds=interval
+        )
+        process = f'worker@{socket.gethostname()}:{os.getpid()}'
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                await self._try_push_metrics(metrics_store, process)
+        except asyncio.CancelledError:
+            # As análises do último intervalo, até a chave expirar
+            await self._try_push_metrics(metrics_store, process)
+            raise
+
+    @staticmethod
+    async def _try_push_metrics(
+        metrics_store: RedisMetricsAdapter, process: str
+    ) -> None:
+        try:
+            await metrics_store.push(process, registry.snapshot())
+        except Exception as e:
+            logger.warning(f'Failed to push worker metrics: {e}')
+
+    async def _close_resources(self) -> None:
+        if self._metrics_task:
+            self._metrics_task.cancel()
+            await asyncio.gather(self._metrics_task, return_exceptions=True)
+            self._metrics_task = None
+        if self._redis_client:
+            await self._redis_client.close()
+        await db.close()
+        self._redis_client = None
+        self._notification_port = None
+        logger.info('Worker resources cleaned up')
+
+    def _mark_ready(self) -> None:
+        self._ready.set()
+        if settings.worker_ready_file:
+            pathlib.Path(settings.worker_ready_file).touch()
+
+    @staticmethod
+    def _remove_ready_file() -> None:
+        if settings.worker_ready_file:
+            pathlib.Path(settings.worker_ready_file).unlink(missing_ok=True)
+
+
+worker_runtime = WorkerRuntime()
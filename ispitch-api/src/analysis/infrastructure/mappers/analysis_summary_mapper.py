@@ -0,0 +1,24 @@
+from ...domain.models.analysis_summary import AnalysisSummary
+from ..persistance.documents.analysis_summary_projection import (
+    AnalysisSummaryProjection,
+)
+
+
+class AnalysisSummaryMapper:
+    @staticmethod
+    def from_projection(
+        projection: AnalysisSummaryProjection,
+    ) -> AnalysisSummary:
+        return AnalysisSummary(
+            id=str(projection.id),
+            user_id=projection.user_id,
+            status=projection.status,
+            filename=projection.filename,
+            created_at=projection.created_at,
+            score=projection.score,
+            duration=projection.duration or 0.0,
+            speech_rate=projection.speech_rate or 0.0,
+            filler_words_count=projection.filler_words_count or 0,
+            pauses_count=projection.pauses_count or 0,
+            updated_at=projection.updated_at,
+        )
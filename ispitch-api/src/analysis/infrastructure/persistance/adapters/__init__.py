@@ -1,9 +1,17 @@
 from .analysis_repository_adapter import AnalysisRepositoryAdapter
 from .analysis_stats_repository_adapter import AnalysisStatsRepositoryAdapter
+from .disk_analysis_cache_adapter import DiskAnalysisCacheAdapter
+from .filesystem_blob_store_adapter import FilesystemBlobStoreAdapter
+from .mongo_analysis_cache_adapter import MongoAnalysisCacheAdapter
+from .redis_blob_references import RedisBlobReferences
 from .storage_adapter import StorageAdapter
 
 __all__ = [
     'AnalysisRepositoryAdapter',
     'AnalysisStatsRepositoryAdapter',
+    'DiskAnalysisCacheAdapter',
+    'FilesystemBlobStoreAdapter',
+    'MongoAnalysisCacheAdapter',
+    'RedisBlobReferences',
     'StorageAdapter',
 ]
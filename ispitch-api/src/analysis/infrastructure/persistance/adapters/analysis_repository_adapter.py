@@ -1,17 +1,39 @@
 import asyncio
-from typing import List, Tuple
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
 
+from beanie import PydanticObjectId
+from pymongo import DESCENDING
+
+from .....core.config import settings
+from .....core.metrics import timed
 from ....domain.models.analysis import Analysis
+from ....domain.models.analysis_summary import AnalysisSummary
+from ....domain.models.pagination import AnalysisCursor
 from ....domain.ports.output import AnalysisRepositoryPort
 from ...mappers.analysis_document_mapper import AnalysisDocumentMapper
+from ...mappers.analysis_summary_mapper import AnalysisSummaryMapper
 from ..documents.analysis_document import AnalysisDocument
+from ..documents.analysis_summary_projection import AnalysisSummaryProjection
+
+COUNT_CACHE_MAX_USERS = 10_000
+
+# Ordem da listagem; coberta pelo índice (user_id, created_at, _id)
+USER_LIST_SORT = [('created_at', DESCENDING), ('_id', DESCENDING)]
 
 
 class AnalysisRepositoryAdapter(AnalysisRepositoryPort):
+    # Total de análises por usuário: (instante da contagem, total)
+    _user_counts: OrderedDict[str, Tuple[float, int]] = OrderedDict()
+
     @classmethod
     async def save(self, analysis: Analysis) -> Analysis:
         analysis_document = AnalysisDocumentMapper.from_entity(analysis)
-        await analysis_document.save()
+        with timed('mongo.save'):
+            await analysis_document.save()
+        if analysis.id is None:
+            self._invalidate_count(analysis.user_id)
         return AnalysisDocumentMapper.from_document(analysis_document)
 
     @classmethod
@@ -22,31 +44,76 @@ class AnalysisRepositoryAdapter(AnalysisRepositoryPort):
     @classmethod
     async def find_by_user_id(
         self, user_id: str, page: int, page_size: int
-    ) -> Tuple[List[Analysis], int]:
+    ) -> Tuple[List[AnalysisSummary], int]:
         skip = (page - 1) * page_size
-        find_query = AnalysisDocument.find({'user_id': user_id})
+        find_query = AnalysisDocument.find(
+            {'user_id': user_id}, projection_model=AnalysisSummaryProjection
+        )
 
         list_task = (
-            find_query.sort(-AnalysisDocument.created_at)
-            .skip(skip)
-            .limit(page_size)
-            .to_list()
+            find_query.sort(USER_LIST_SORT).skip(skip).limit(page_size).to_list()
         )
-        count_task = find_query.count()
+        count_task = self.count_by_user_id(user_id)
 
-        analysis_documents, total_count = await asyncio.gather(
-            list_task, count_task
-        )
+        projections, total_count = await asyncio.gather(list_task, count_task)
 
         mapped_analyses = [
-            analysis
-            for document in analysis_documents
-            if (analysis := AnalysisDocumentMapper.from_document(document))
-            is not None
+            AnalysisSummaryMapper.from_projection(projection)
+            for projection in projections
         ]
 
         return mapped_analyses, total_count
 
+    @classmethod
+    async def find_after_cursor(
+        self, user_id: str, limit: int, cursor: Optional[AnalysisCursor]
+    ) -> List[AnalysisSummary]:
+        query = {'user_id': user_id}
+        if cursor is not None:
+            cursor_id = PydanticObjectId(cursor.id)
+            query['$or'] = [
+                {'created_at': {'$lt': cursor.created_at}},
+                {'created_at': cursor.created_at, '_id': {'$lt': cursor_id}},
+            ]
+
+        projections = (
+            await AnalysisDocument
+            .find(query, projection_model=AnalysisSummaryProjection)
+            .sort(USER_LIST_SORT)
+            .limit(limit)
+            .to_list()
+        )
+        return [
+            AnalysisSummaryMapper.from_projection(projection)
+            for projection in projections
+        ]
+
+    @classmethod
+    async def count_by_user_id(self, user_id: str) -> int:
+        """
+        Total of the user's analyses, cached for a few seconds so that
+        paging through the list does not count the collection on every page.
+        """
+        now = time.monotonic()
+        cached = self._user_counts.get(user_id)
+        if (
+            cached is not None
+            and now - cached[0] < settings.analysis_count_cache_ttl_seconds
+        ):
+            self._user_counts.move_to_end(user_id)
+            return cached[1]
+
+        total = await AnalysisDocument.find({'user_id': user_id}).count()
+        self._user_counts[user_id] = (now, total)
+        self._user_counts.move_to_end(user_id)
+        while len(self._user_counts) > COUNT_CACHE_MAX_USERS:
+            self._user_counts.popitem(last=False)
+        return total
+
+    @classmethod
+    def _invalidate_count(self, user_id: Optional[str]) -> None:
+        self._user_counts.pop(user_id, None)
+
     @classmethod
     async def find_all(self) -> list[Analysis]:
         analysis_documents = await AnalysisDocument.find_all().to_list()
@@ -59,15 +126,34 @@ class AnalysisRepositoryAdapter(AnalysisRepositoryPort):
     async def delete_by_id(self, analysis_id: str):
         analysis_document = await AnalysisDocument.get(analysis_id)
         await analysis_document.delete()
+        self._invalidate_count(analysis_document.user_id)
 
     @classmethod
-    async def find_recent_by_user_id(self, user_id: str) -> Analysis:
-        find_query = AnalysisDocument.find({'user_id': user_id})
+    async def find_summary_by_id(
+        cls, analysis_id: str
+    ) -> Optional[AnalysisSummary]:
+        if not PydanticObjectId.is_valid(analysis_id):
+            return None
+
+        projection = await AnalysisDocument.find_one(
+            {'_id': PydanticObjectId(analysis_id)},
+            projection_model=AnalysisSummaryProjection,
+        )
+        if projection is None:
+            return None
 
-        analysis_document = await find_query.sort(
-            -AnalysisDocument.created_at
-        ).first_or_none()
+        return AnalysisSummaryMapper.from_projection(projection)
+
+    @classmethod
+    async def find_recent_by_user_id(
+        self, user_id: str
+    ) -> Optional[AnalysisSummary]:
+        find_query = AnalysisDocument.find(
+            {'user_id': user_id}, projection_model=AnalysisSummaryProjection
+        )
 
-        mapped_analyses = AnalysisDocumentMapper.from_document(analysis_document)
+        projection = await find_query.sort(USER_LIST_SORT).first_or_none()
+        if projection is None:
+            return None
 
-        return mapped_analyses
+        return AnalysisSummaryMapper.from_projection(projection)
@@ -1,16 +1,43 @@
-import asyncio
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
+from pymongo import UpdateOne
+
+from .....core.metrics import timed
+from ....domain.models.analysis import Analysis, AnalysisStatus
 from ....domain.models.analysis_stats import AnalysisStats, ChartData
 from ....domain.models.time_range import TimeRange
 from ....domain.ports.output import AnalysisStatsRepositoryPort
 from ..documents.analysis_document import AnalysisDocument
+from ..documents.analysis_stats_rollup_document import (
+    AnalysisStatsRollupDocument,
+)
 
 SECONDS_TO_MINUTES = 60
 
+HOUR = 'hour'
+DAY = 'day'
+MONTH = 'month'
+GRANULARITIES = (HOUR, DAY, MONTH)
+
+# Granularidade lida do rollup e granularidade do gráfico de cada período.
+# O ano é lido por dia, para a janela de 365 dias não arredondar para
+# meses inteiros, e os dias são somados em meses no gráfico.
+RANGE_GRANULARITIES = {
+    TimeRange.DAY: (HOUR, HOUR),
+    TimeRange.MONTH: (DAY, DAY),
+    TimeRange.YEAR: (DAY, MONTH),
+    TimeRange.ALL: (MONTH, MONTH),
+}
+
 
 class AnalysisStatsRepositoryAdapter(AnalysisStatsRepositoryPort):
+    """
+    Estatísticas servidas pelos buckets de `analysis_stats_rollups`. Cada
+    análise concluída incrementa seus buckets de hora, dia e mês, e o /stats
+    lê só os buckets do período, sem agregar as análises.
+    """
+
     MONTH_NAMES = [
         'Jan',
         'Fev',
@@ -29,53 +56,87 @@ class AnalysisStatsRepositoryAdapter(AnalysisStatsRepositoryPort):
     async def get_stats(
         self, user_id: str, time_range: TimeRange
     ) -> AnalysisStats:
-        base_match = {'user_id': user_id, 'status': 'completed'}
-        time_filter = self._get_time_filter(time_range)
+        granularity, chart_granularity = RANGE_GRANULARITIES[time_range]
+        query: dict[str, Any] = {
+            'user_id': user_id,
+            'granularity': granularity,
+        }
+        start_date = self._get_start_date(time_range)
+        if start_date:
+            query['bucket_start'] = {
+                '$gte': self._truncate(start_date, granularity)
+            }
 
-        if time_filter:
-            base_match.update(time_filter)
+        buckets = (
+            await AnalysisStatsRollupDocument
+            .find(query)
+            .sort(+AnalysisStatsRollupDocument.bucket_start)
+            .to_list()
+        )
 
-        totals_pipeline = [
-            {'$match': base_match},
-            {
-                '$group': {
-                    '_id': None,
-                    'total_analyses': {'$sum': 1},
-                    'total_filler_words': {
-                        '$sum': '$speech_analysis.fillerwords_analysis.total'
-                    },
-                    'total_duration': {'$sum': '$audio_analysis.duration'},
-                }
-            },
-        ]
+        return AnalysisStats(
+            total_analyses=sum(bucket.analyses for bucket in buckets),
+            total_filler_words=sum(bucket.filler_words for bucket in buckets),
+            total_duration=round(
+                sum(bucket.duration for bucket in buckets) / SECONDS_TO_MINUTES
+            ),
+            chart_data=self._build_chart_data(buckets, chart_granularity),
+        )
 
-        chart_grouping = self._get_chart_grouping(time_range)
-        name_projection = self._get_name_projection(time_range)
+    @classmethod
+    async def record_completed(cls, analysis: Analysis) -> None:
+        if analysis.user_id is None:
+            return
 
-        chart_pipeline = [
-            {'$match': base_match},
-            {'$group': {'_id': chart_grouping, 'analyses': {'$sum': 1}}},
-            {'$sort': {'_id': 1}},
-            {'$project': {'_id': 0, 'name': name_projection, 'analyses': 1}},
-        ]
+        speech = analysis.speech_analysis
+        audio = analysis.audio_analysis
+        increments = {
+            'analyses': 1,
+            'filler_words': (
+                speech.fillerwords_analysis.total
+                if speech and speech.fillerwords_analysis
+                else 0
+            ),
+            'duration': audio.duration if audio else 0.0,
+            'speech_rate_sum': audio.speech_rate if audio else 0.0,
+            'score_sum': analysis.score or 0,
+        }
+        created_at = analysis.created_at or datetime.now(timezone.utc)
 
-        totals_result, chart_result = await asyncio.gather(
-            self._run_pipeline(totals_pipeline),
-            self._run_pipeline(chart_pipeline),
-        )
+        # Um $inc com upsert por bucket: cada documento é atualizado de forma
+        # atômica no servidor, sem ler e regravar os totais.
+        with timed('mongo.stats_rollup'):
+            collection = AnalysisStatsRollupDocument.get_pymongo_collection()
+            await collection.bulk_write(
+                [
+                    UpdateOne(
+                        {
+                            'user_id': analysis.user_id,
+                            'granularity': granularity,
+                            'bucket_start': cls._truncate(
+                                created_at, granularity
+                            ),
+                        },
+                        {'$inc': increments},
+                        upsert=True,
+                    )
+                    for granularity in GRANULARITIES
+                ],
+                ordered=False,
+            )
 
-        total_analyses, total_filler_words, total_duration = self._parse_totals(
-            totals_result
+    @classmethod
+    async def rebuild(cls, user_id: Optional[str] = None) -> int:
+        scope: dict[str, Any] = (
+            {'user_id': user_id} if user_id else {'user_id': {'$ne': None}}
         )
+        await AnalysisStatsRollupDocument.find(scope).delete()
 
-        chart_data = self._build_chart_data(chart_result)
+        match = {**scope, 'status': AnalysisStatus.COMPLETED.value}
+        for granularity in GRANULARITIES:
+            await cls._run_pipeline(cls._rebuild_pipeline(match, granularity))
 
-        return AnalysisStats(
-            total_analyses=total_analyses,
-            total_filler_words=total_filler_words,
-            total_duration=total_duration,
-            chart_data=chart_data,
-        )
+        return await AnalysisStatsRollupDocument.find(scope).count()
 
     @staticmethod
     async def _run_pipeline(
@@ -88,87 +149,112 @@ class AnalysisStatsRepositoryAdapter(AnalysisStatsRepositoryPort):
         return results
 
     @staticmethod
-    def _parse_totals(
-        totals_result: list[dict[str, Any]],
-    ) -> tuple[int, int, float]:
-        if not totals_result:
-            return 0, 0, 0.0
-
-        totals = totals_result[0]
-        total_analyses = totals.get('total_analyses', 0)
-        total_filler_words = totals.get('total_filler_words', 0)
-        total_duration = round(
-            totals.get('total_duration', 0) / SECONDS_TO_MINUTES
-        )
-        return total_analyses, total_filler_words, total_duration
+    def _rebuild_pipeline(
+        match: dict[str, Any], granularity: str
+    ) -> list[dict[str, Any]]:
+        date_parts = {
+            'year': {'$year': '$created_at'},
+            'month': {'$month': '$created_at'},
+        }
+        if granularity in {DAY, HOUR}:
+            date_parts['day'] = {'$dayOfMonth': '$created_at'}
+        if granularity == HOUR:
+            date_parts['hour'] = {'$hour': '$created_at'}
+
+        return [
+            {'$match': match},
+            {
+                '$group': {
+                    '_id': {
+                        'user_id': '$user_id',
+                        'bucket_start': {'$dateFromParts': date_parts},
+                    },
+                    'analyses': {'$sum': 1},
+                    'filler_words': {
+                        '$sum': '$speech_analysis.fillerwords_analysis.total'
+                    },
+                    'duration': {'$sum': '$audio_analysis.duration'},
+                    'speech_rate_sum': {'$sum': '$audio_analysis.speech_rate'},
+                    'score_sum': {'$sum': '$score'},
+                }
+            },
+            {
+                '$project': {
+                    '_id': 0,
+                    'user_id': '$_id.user_id',
+                    'granularity': {'$literal': granularity},
+                    'bucket_start': '$_id.bucket_start',
+                    'analyses': 1,
+                    'filler_words': 1,
+                    'duration': 1,
+                    'speech_rate_sum': 1,
+                    'score_sum': 1,
+                }
+            },
+            {
+                '$merge': {
+                    'into': AnalysisStatsRollupDocument.get_collection_name(),
+                    'on': ['user_id', 'granularity', 'bucket_start'],
+                    'whenMatched': 'replace',
+                    'whenNotMatched': 'insert',
+                }
+            },
+        ]
 
     @staticmethod
-    def _build_chart_data(chart_result: list[dict[str, Any]]) -> list[ChartData]:
-        chart_data: list[ChartData] = []
-        for item in chart_result:
-            name = item.get('name')
-            analyses_count = item.get('analyses', 0)
-            chart_data.append(ChartData(name=name, analyses=analyses_count))
+    def _truncate(moment: datetime, granularity: str) -> datetime:
+        # Buckets em UTC, como os operadores de data do Mongo
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
 
-        return chart_data
+        moment = moment.replace(minute=0, second=0, microsecond=0)
+        if granularity in {DAY, MONTH}:
+            moment = moment.replace(hour=0)
+        if granularity == MONTH:
+            moment = moment.replace(day=1)
+        return moment
+
+    def _build_chart_data(
+        self,
+        buckets: list[AnalysisStatsRollupDocument],
+        chart_granularity: str,
+    ) -> list[ChartData]:
+        # Os buckets chegam ordenados; os de granularidade mais fina são
+        # somados no bucket do gráfico que os contém.
+        analyses_by_bucket: dict[datetime, int] = {}
+        for bucket in buckets:
+            chart_bucket = self._truncate(bucket.bucket_start, chart_granularity)
+            analyses_by_bucket[chart_bucket] = (
+                analyses_by_bucket.get(chart_bucket, 0) + bucket.analyses
+            )
+
+        return [
+            ChartData(
+                name=self._get_bucket_name(bucket_start, chart_granularity),
+                analyses=analyses,
+            )
+            for bucket_start, analyses in analyses_by_bucket.items()
+        ]
 
     @staticmethod
-    def _get_time_filter(time_range: TimeRange) -> Optional[dict]:
+    def _get_start_date(time_range: TimeRange) -> Optional[datetime]:
         if time_range == TimeRange.ALL:
             return None
 
         now = datetime.now(timezone.utc)
 
         if time_range == TimeRange.DAY:
-            start_date = now - timedelta(days=1)
+            return now - timedelta(days=1)
         elif time_range == TimeRange.MONTH:
-            start_date = now - timedelta(days=30)
+            return now - timedelta(days=30)
         elif time_range == TimeRange.YEAR:
-            start_date = now - timedelta(days=365)
-        else:
-            return None
+            return now - timedelta(days=365)
+        return None
 
-        return {'created_at': {'$gte': start_date}}
-
-    @staticmethod
-    def _get_chart_grouping(time_range: TimeRange) -> dict:
-        if time_range == TimeRange.DAY:
-            return {
-                'year': {'$year': '$created_at'},
-                'month': {'$month': '$created_at'},
-                'day': {'$dayOfMonth': '$created_at'},
-                'hour': {'$hour': '$created_at'},
-            }
-        elif time_range == TimeRange.MONTH:
-            # Agrupa por dia
-            return {
-                'year': {'$year': '$created_at'},
-                'month': {'$month': '$created_at'},
-                'day': {'$dayOfMonth': '$created_at'},
-            }
+    def _get_bucket_name(self, bucket_start: datetime, granularity: str) -> str:
+        if granularity == HOUR:
+            return f'{bucket_start.hour}h'
+        elif granularity == DAY:
+            return f'{bucket_start.day}/{bucket_start.month}'
         else:
-            # Agrupa por mês
-            return {
-                'year': {'$year': '$created_at'},
-                'month': {'$month': '$created_at'},
-            }
-
-    def _get_name_projection(self, time_range: TimeRange) -> dict:
-        # Depois do $group o campo de agrupamento fica em "_id"
-        if time_range == TimeRange.DAY:
-            return {'$concat': [{'$toString': '$_id.hour'}, 'h']}
-        elif time_range == TimeRange.MONTH:
-            return {
-                '$concat': [
-                    {'$toString': '$_id.day'},
-                    '/',
-                    {'$toString': '$_id.month'},
-                ]
-            }
-        else:
-            return {
-                '$arrayElemAt': [
-                    self.MONTH_NAMES,
-                    {'$subtract': ['$_id.month', 1]},
-                ]
-            }
+            return self.MONTH_NAMES[bucket_start.month - 1]
@@ -0,0 +1,79 @@
+import asyncio
+import logging
+import os
+import pathlib
+import pickle
+import time
+from typing import Any, Optional
+
+from ....domain.models.cache import StageCacheKey
+from ....domain.ports.output import AnalysisCachePort
+
+logger = logging.getLogger(__name__)
+
+
+class DiskAnalysisCacheAdapter(AnalysisCachePort):
+    """
+    Stage results pickled into one file per key on the local disk.
+
+    The file mtime is refreshed on every hit and drives the LRU eviction
+    when more than `max_entries` files exist; the write time stored with
+    the value drives the TTL.
+    """
+
+    def __init__(self, directory: str, max_entries: int, ttl_seconds: int):
+        self.directory = pathlib.Path(directory)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        os.makedirs(self.directory, exist_ok=True)
+
+    async def get(self, key: StageCacheKey) -> Optional[Any]:
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: StageCacheKey, value: Any) -> None:
+        await asyncio.to_thread(self._write, key, value)
+
+    def _path(self, key: StageCacheKey) -> pathlib.Path:
+        return self.directory / f'{key.digest}.pkl'
+
+    def _read(self, key: StageCacheKey) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                written_at, value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f'Discarding unreadable cache entry {path}: {e}')
+            path.unlink(missing_ok=True)
+            return None
+
+        if time.time() - written_at > self.ttl_seconds:
+            path.unlink(missing_ok=True)
+            return None
+
+        os.utime(path)
+        return value
+
+    def _write(self, key: StageCacheKey, value: Any) -> None:
+        path = self._path(key)
+        temp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(temp_path, 'wb') as f:
+            pickle.dump((time.time(), value), f)
+        os.replace(temp_path, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self.directory.glob('*.pkl'):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue
+
+        excess = len(entries) - self.max_entries
+        if excess <= 0:
+            return
+
+        for _, path in sorted(entries)[:excess]:
+            path.unlink(missing_ok=True)
@@ -0,0 +1,77 @@
+import os
+import pathlib
+import tempfile
+
+from ....domain.ports.output import BlobStorePort, BlobWriter
+
+STAGING_DIR = '.staging'
+
+
+class FilesystemBlobWriter(BlobWriter):
+    def __init__(self, store: 'FilesystemBlobStoreAdapter'):
+        self._store = store
+        fd, self._staging_path = tempfile.mkstemp(dir=store.staging_dir)
+        self._file = os.fdopen(fd, 'wb')
+
+    def write(self, data: bytes) -> None:
+        self._file.write(data)
+
+    def commit(self, key: str) -> None:
+        self._file.close()
+        target = self._store.path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Mesmo sistema de arquivos que o staging: a troca é atômica
+        os.replace(self._staging_path, target)
+
+    def abort(self) -> None:
+        self._file.close()
+        pathlib.Path(self._staging_path).unlink(missing_ok=True)
+
+
+class FilesystemBlobStoreAdapter(BlobStorePort):
+    """
+    Blobs under a local directory, one file per key. Writes go to a staging
+    file in the same directory and are renamed into place on commit, so a
+    reader never sees a partial blob.
+
+    Only works across machines if `directory` is shared between them; for
+    API and workers on different nodes use the S3 backend.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = pathlib.Path(directory).resolve()
+        self.staging_dir = self.directory / STAGING_DIR
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key: str) -> pathlib.Path:
+        path = (self.directory / key).resolve()
+        if not path.is_relative_to(self.directory) or path == self.directory:
+            raise ValueError(f'Invalid blob key: {key!r}')
+        return path
+
+    def open_writer(self) -> BlobWriter:
+        return FilesystemBlobWriter(self)
+
+    def exists(self, key: str) -> bool:
+        return self.path(key).is_file()
+
+    def size(self, key: str) -> int:
+        return self.path(key).stat().st_size
+
+    def read_range(self, key: str, start: int, length: int) -> bytes:
+        with open(self.path(key), 'rb') as f:
+            f.seek(start)
+            return f.read(length)
+
+    def delete(self, key: str) -> None:
+        path = self.path(key)
+        path.unlink(missing_ok=True)
+        # Remove os diretórios que ficaram vazios (os artefatos de cada
+        # análise ficam em um diretório próprio)
+        for parent in path.parents:
+            if parent == self.directory:
+                break
+            try:
+                parent.rmdir()
+            except OSError:
+                break
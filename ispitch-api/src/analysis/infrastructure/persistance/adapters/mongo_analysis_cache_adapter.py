@@ -0,0 +1,74 @@
+import pickle
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from pymongo import ASCENDING
+
+from ....domain.models.cache import StageCacheKey
+from ....domain.ports.output import AnalysisCachePort
+from ..documents.stage_cache_document import StageCacheDocument
+
+# Ao passar de max_entries, a coleção é aparada até esta fração dele, para
+# a ordenação por acesso não rodar a cada nova entrada
+TRIM_TO_RATIO = 0.9
+
+
+class MongoAnalysisCacheAdapter(AnalysisCachePort):
+    """
+    Stage results pickled into the `stage_cache` collection, shared by every
+    worker. Mongo's TTL index expires entries by age; the least recently
+    used ones are removed when the collection grows past `max_entries`,
+    checked against the estimated count kept in the collection metadata.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+
+    @staticmethod
+    async def get(key: StageCacheKey) -> Optional[Any]:
+        document = await StageCacheDocument.find_one(
+            StageCacheDocument.key == key.digest
+        )
+        if document is None:
+            return None
+
+        await document.set({
+            StageCacheDocument.last_access_at: datetime.now(timezone.utc)
+        })
+        return pickle.loads(document.value)
+
+    async def set(self, key: StageCacheKey, value: Any) -> None:
+        now = datetime.now(timezone.utc)
+        await StageCacheDocument.get_pymongo_collection().update_one(
+            {'key': key.digest},
+            {
+                '$set': {
+                    'audio_hash': key.audio_hash,
+                    'stage': key.stage,
+                    'value': pickle.dumps(value),
+                    'created_at': now,
+                    'last_access_at': now,
+                }
+            },
+            upsert=True,
+        )
+        await self._evict()
+
+    async def _evict(self) -> None:
+        collection = StageCacheDocument.get_pymongo_collection()
+        count = await collection.estimated_document_count()
+        if count <= self.max_entries:
+            return
+
+        # Só os IDs: os valores em pickle não precisam sair do Mongo
+        excess = count - int(self.max_entries * TRIM_TO_RATIO)
+        oldest = (
+            await collection
+            .find({}, {'_id': 1})
+            .sort('last_access_at', ASCENDING)
+            .limit(excess)
+            .to_list(length=excess)
+        )
+        await collection.delete_many({
+            '_id': {'$in': [document['_id'] for document in oldest]}
+        })
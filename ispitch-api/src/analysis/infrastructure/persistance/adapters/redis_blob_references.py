@@ -0,0 +1,48 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable
+
+import redis.asyncio as aioredis
+
+# Tempo máximo com a trava: cobre a cópia de um blob grande no S3
+LOCK_TIMEOUT_SECONDS = 60
+LOCK_WAIT_SECONDS = 30
+
+
+def references_key(key: str) -> str:
+    return f'blob:{key}:refs'
+
+
+class RedisBlobReferences:
+    """
+    Reference counts of the blobs, shared by the API (one reference per
+    enqueued analysis) and the workers (which release it at the end).
+
+    Taking or dropping a reference happens under a per-blob lock together
+    with the write or delete of the blob itself, so an upload of the same
+    content never reuses a blob that a worker is about to delete.
+
+    `redis_client` is resolved on each call: the API and the worker open
+    their clients on different loops after this object is built.
+    """
+
+    def __init__(self, redis_client: Callable[[], aioredis.Redis]):
+        self._redis_client = redis_client
+
+    @asynccontextmanager
+    async def lock(self, key: str) -> AsyncIterator[None]:
+        async with self._redis_client().lock(
+            f'blob:{key}:lock',
+            timeout=LOCK_TIMEOUT_SECONDS,
+            blocking_timeout=LOCK_WAIT_SECONDS,
+        ):
+            yield
+
+    async def acquire(self, key: str) -> int:
+        return await self._redis_client().incr(references_key(key))
+
+    async def release(self, key: str) -> int:
+        redis_client = self._redis_client()
+        remaining = await redis_client.decr(references_key(key))
+        if remaining <= 0:
+            await redis_client.delete(references_key(key))
+        return remaining
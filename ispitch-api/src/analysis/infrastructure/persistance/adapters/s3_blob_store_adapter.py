@@ -0,0 +1,133 @@
+import uuid
+from typing import Optional
+
+import boto3
+from botocore.exceptions import ClientError
+
+from ....domain.ports.output import BlobStorePort, BlobWriter
+
+STAGING_PREFIX = 'staging/'
+# O S3 exige pelo menos 5 MiB em cada parte de um multipart, exceto a última
+MIN_PART_SIZE = 5 * 1024 * 1024
+NOT_FOUND_CODES = {'404', 'NoSuchKey', 'NotFound'}
+
+
+class S3BlobWriter(BlobWriter):
+    """
+    Sends the blob in multipart parts of `part_size` as it is written. The
+    upload targets a staging key and is copied server-side to the final key
+    on commit; a blob smaller than one part goes in a single PUT instead.
+    """
+
+    def __init__(self, client, bucket: str, part_size: int):
+        self._client = client
+        self._bucket = bucket
+        self._part_size = max(part_size, MIN_PART_SIZE)
+        self._staging_key = f'{STAGING_PREFIX}{uuid.uuid4().hex}'
+        self._buffer = bytearray()
+        self._upload_id: Optional[str] = None
+        self._parts: list[dict] = []
+
+    def write(self, data: bytes) -> None:
+        self._buffer += data
+        while len(self._buffer) >= self._part_size:
+            part = bytes(self._buffer[: self._part_size])
+            del self._buffer[: self._part_size]
+            self._upload_part(part)
+
+    def commit(self, key: str) -> None:
+        if self._upload_id is None:
+            self._client.put_object(
+                Bucket=self._bucket, Key=key, Body=bytes(self._buffer)
+            )
+            return
+
+        if self._buffer:
+            self._upload_part(bytes(self._buffer))
+            self._buffer.clear()
+        self._client.complete_multipart_upload(
+            Bucket=self._bucket,
+            Key=self._staging_key,
+            UploadId=self._upload_id,
+            MultipartUpload={'Parts': self._parts},
+        )
+        self._client.copy_object(
+            Bucket=self._bucket,
+            Key=key,
+            CopySource={'Bucket': self._bucket, 'Key': self._staging_key},
+        )
+        self._client.delete_object(Bucket=self._bucket, Key=self._staging_key)
+
+    def abort(self) -> None:
+        self._buffer.clear()
+        if self._upload_id is not None:
+            self._client.abort_multipart_upload(
+                Bucket=self._bucket,
+                Key=self._staging_key,
+                UploadId=self._upload_id,
+            )
+
+    def _upload_part(self, data: bytes) -> None:
+        if self._upload_id is None:
+            upload = self._client.create_multipart_upload(
+                Bucket=self._bucket, Key=self._staging_key
+            )
+            self._upload_id = upload['UploadId']
+        part_number = len(self._parts) + 1
+        response = self._client.upload_part(
+            Bucket=self._bucket,
+            Key=self._staging_key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=data,
+        )
+        self._parts.append({'PartNumber': part_number, 'ETag': response['ETag']})
+
+
+class S3BlobStoreAdapter(BlobStorePort):
+    """
+    Blobs in an S3-compatible bucket (AWS, MinIO, the stand-in of the
+    benchmarks). boto3 is an optional dependency, installed with the `s3`
+    extra; this module is only imported when that backend is selected.
+    """
+
+    def __init__(self, client, bucket: str, part_size: int):
+        self._client = client
+        self._bucket = bucket
+        self._part_size = part_size
+
+    @classmethod
+    def create(
+        cls, bucket: str, part_size: int, **client_options
+    ) -> 'S3BlobStoreAdapter':
+        """`client_options` go to boto3.client (endpoint_url, region_name...)."""
+        client = boto3.client('s3', **client_options)
+        return cls(client, bucket=bucket, part_size=part_size)
+
+    def open_writer(self) -> BlobWriter:
+        return S3BlobWriter(self._client, self._bucket, self._part_size)
+
+    def exists(self, key: str) -> bool:
+        try:
+            self._client.head_object(Bucket=self._bucket, Key=key)
+        except ClientError as e:
+            if e.response['Error']['Code'] in NOT_FOUND_CODES:
+                return False
+            raise
+        return True
+
+    def size(self, key: str) -> int:
+        response = self._client.head_object(Bucket=self._bucket, Key=key)
+        return response['ContentLength']
+
+    def read_range(self, key: str, start: int, length: int) -> bytes:
+        response = self._client.get_object(
+            Bucket=self._bucket,
+            Key=key,
+            Range=f'bytes={start}-{start + length - 1}',
+        )
+        with response['Body'] as body:
+            return body.read()
+
+    def delete(self, key: str) -> None:
+        self._client.delete_object(Bucket=self._bucket, Key=key)
@@ -1,12 +1,16 @@
+import asyncio
+import hashlib
 import json
 import logging
 import os
 import pathlib
-import tempfile
+import pickle
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterable, Iterable, Iterator, Optional
 
-from fastapi import UploadFile
-
-from ....domain.ports.output import StoragePort
+from ....domain.models.audio import StoredAudio
+from ....domain.ports.output import BlobStorePort, BlobWriter, StoragePort
+from .redis_blob_references import RedisBlobReferences
 
 logger = logging.getLogger(__name__)
 
@@ -14,40 +18,190 @@ logger = logging.getLogger(__name__)
 class StorageAdapter(StoragePort):
     """
     Service responsible for handling file storage operations.
+
+    Uploaded audio goes to a content-addressed blob store (a local directory
+    or an S3 bucket), so the API and the workers don't need to share a
+    filesystem. Each enqueued analysis holds one reference to its blob; the
+    blob is deleted when the last one is released.
     """
 
     RESULTS_DIR = 'analysis_results'
-
-    def __init__(self):
+    WRITE_BLOCK_BYTES = 1024 * 1024
+
+    def __init__(
+        self,
+        blob_store: BlobStorePort,
+        references: RedisBlobReferences,
+        read_chunk_bytes: int = 4 * 1024 * 1024,
+    ):
+        self.blob_store = blob_store
+        self.references = references
+        self.read_chunk_bytes = read_chunk_bytes
         os.makedirs(self.RESULTS_DIR, exist_ok=True)
 
-    @staticmethod
-    def save_temporary_audio(file: UploadFile) -> str:
+    async def save_temporary_audio(
+        self, chunks: AsyncIterable[bytes], suffix: str
+    ) -> StoredAudio:
         """
-        Saves the uploaded audio file to a temporary location.
+        Writes the streamed audio to the blob store, hashing its content in
+        the same pass, and takes a reference to it. Chunks are gathered
+        into blocks of `WRITE_BLOCK_BYTES` and written and hashed in a
+        worker thread, so the event loop only receives the body. If the
+        stream fails (an upload rejected halfway, a client that disconnects),
+        the partial blob is discarded.
+
+        The key is the SHA-256 of the content: the same recording uploaded
+        twice is stored once.
 
         Args:
-            file: The uploaded audio file.
+            chunks: The audio content, as it arrives.
+            suffix: Extension of the blob key.
 
         Returns:
-            str: The path to the saved temporary file.
+            StoredAudio: The key, SHA-256 and size of the saved audio.
+        """
+        content_hash = hashlib.sha256()
+        writer = await asyncio.to_thread(self.blob_store.open_writer)
+        try:
+            size = await self._write_stream(chunks, writer, content_hash)
+        except BaseException:
+            await asyncio.to_thread(writer.abort)
+            raise
+
+        key = f'audio/{content_hash.hexdigest()}{suffix}'
+        async with self.references.lock(key):
+            if await asyncio.to_thread(self.blob_store.exists, key):
+                await asyncio.to_thread(writer.abort)
+            else:
+                await asyncio.to_thread(writer.commit, key)
+            await self.references.acquire(key)
+
+        logger.info(f'Audio saved as blob {key}')
+        return StoredAudio(
+            key=key, content_hash=content_hash.hexdigest(), size=size
+        )
+
+    @classmethod
+    async def _write_stream(
+        cls, chunks: AsyncIterable[bytes], writer: BlobWriter, content_hash
+    ) -> int:
+        size = 0
+        block = bytearray()
+        async for chunk in chunks:
+            block += chunk
+            if len(block) >= cls.WRITE_BLOCK_BYTES:
+                block, full = bytearray(), block
+                await asyncio.to_thread(
+                    cls._write_block, writer, content_hash, full
+                )
+                size += len(full)
+        if block:
+            await asyncio.to_thread(
+                cls._write_block, writer, content_hash, block
+            )
+            size += len(block)
+        return size
+
+    @staticmethod
+    def _write_block(writer: BlobWriter, content_hash, block: bytearray) -> None:
+        # hashlib libera o GIL para blocos grandes
+        writer.write(block)
+        content_hash.update(block)
+
+    def read_audio(self, key: str) -> Iterator[bytes]:
+        """
+        Reads a blob in ranges of `read_chunk_bytes`, fetching the next range
+        in the background while the caller consumes the current one.
+
+        Args:
+            key: The blob key returned by `save_temporary_audio`.
+
+        Yields:
+            The content of the blob, in order.
+        """
+        size = self.blob_store.size(key)
+        offsets = iter(range(0, size, self.read_chunk_bytes))
+        with ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='blob-read'
+        ) as executor:
+            pending = self._fetch(executor, key, next(offsets, None))
+            while pending is not None:
+                data = pending.result()
+                pending = self._fetch(executor, key, next(offsets, None))
+                yield data
+
+    def _fetch(
+        self, executor: ThreadPoolExecutor, key: str, offset: Optional[int]
+    ) -> Optional[Future]:
+        if offset is None:
+            return None
+        return executor.submit(
+            self.blob_store.read_range, key, offset, self.read_chunk_bytes
+        )
+
+    async def release_audio(self, key: str) -> None:
+        """
+        Drops one reference to the blob, deleting it with the last one.
+
+        Args:
+            key: The blob key returned by `save_temporary_audio`.
         """
         try:
-            with tempfile.NamedTemporaryFile(
-                delete=False,
-                suffix='.mp3' if file.content_type == 'audio/mpeg' else '.wav',
-            ) as temp_file:
-                for chunk in iter(lambda: file.file.read(1024 * 1024), b''):
-                    temp_file.write(chunk)
-                temp_file_path = temp_file.name
-                logger.info(f'Temporary audio file saved at: {temp_file_path}')
-                return temp_file_path
+            async with self.references.lock(key):
+                if await self.references.release(key) <= 0:
+                    await asyncio.to_thread(self.blob_store.delete, key)
+                    logger.info(f'Blob {key} deleted.')
         except Exception as e:
-            logger.error(
-                f'Error saving temporary audio file: {e}', exc_info=True
+            logger.error(f'Error releasing blob {key}: {e}', exc_info=True)
+            raise
+
+    async def save_artifact(
+        self, analysis_id: str, name: str, value: Any
+    ) -> str:
+        """
+        Pickles the result of a stage into the blob store, so the next stage
+        task of the analysis can read it from any node.
+
+        Args:
+            analysis_id: The analysis the result belongs to.
+            name: The stage that produced it.
+            value: The stage result.
+
+        Returns:
+            The key of the artifact, passed to the next task.
+        """
+        key = self._artifact_key(analysis_id, name)
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        await asyncio.to_thread(self._write_blob, key, data)
+        return key
+
+    async def load_artifact(self, key: str) -> Any:
+        return pickle.loads(await asyncio.to_thread(self._read_blob, key))
+
+    async def delete_artifacts(
+        self, analysis_id: str, names: Iterable[str]
+    ) -> None:
+        for name in names:
+            await asyncio.to_thread(
+                self.blob_store.delete, self._artifact_key(analysis_id, name)
             )
+
+    @staticmethod
+    def _artifact_key(analysis_id: str, name: str) -> str:
+        return f'artifacts/{analysis_id}/{name}.pkl'
+
+    def _write_blob(self, key: str, data: bytes) -> None:
+        writer = self.blob_store.open_writer()
+        try:
+            writer.write(data)
+            writer.commit(key)
+        except BaseException:
+            writer.abort()
             raise
 
+    def _read_blob(self, key: str) -> bytes:
+        return self.blob_store.read_range(key, 0, self.blob_store.size(key))
+
     def save_analysis_result(self, analysis_id: str, result_data: dict):
         """
         Saves the analysis result dictionary to a JSON file.
@@ -69,24 +223,6 @@ class StorageAdapter(StoragePort):
             )
             raise
 
-    @staticmethod
-    def cleanup_temporary_file(file_path: str):
-        """
-        Deletes the temporary audio file.
-
-        Args:
-            file_path: Path to the temporary audio file.
-        """
-        try:
-            os.remove(file_path)
-            logger.info(f'Temporary file {file_path} deleted successfully.')
-        except Exception as e:
-            logger.error(
-                f'Error deleting temporary file {file_path}: {e}',
-                exc_info=True,
-            )
-            raise
-
     def get_analysis_result(self, analysis_id: str) -> dict:
         """
         Reads the analysis result JSON file.
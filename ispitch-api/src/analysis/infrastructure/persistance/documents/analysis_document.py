@@ -3,7 +3,7 @@ from typing import Optional
 
 from beanie import Document, Update, before_event
 from pydantic import BaseModel, Field
-from pymongo import ASCENDING, IndexModel
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 from ....domain.models.analysis import AnalysisStatus
 
@@ -161,4 +161,15 @@ class AnalysisDocument(Document):
 
     class Settings:
         name = 'analysis'
-        indexes = [IndexModel([('user_id', ASCENDING)], name='user_id_index')]
+        indexes = [
+            IndexModel([('user_id', ASCENDING)], name='user_id_index'),
+            # Listagem por usuário, mais recentes primeiro (keyset pagination)
+            IndexModel(
+                [
+                    ('user_id', ASCENDING),
+                    ('created_at', DESCENDING),
+                    ('_id', DESCENDING),
+                ],
+                name='user_created_at_index',
+            ),
+        ]
@@ -0,0 +1,36 @@
+from datetime import datetime
+
+from beanie import Document
+from pymongo import ASCENDING, IndexModel
+
+
+class AnalysisStatsRollupDocument(Document):
+    """
+    Totais das análises concluídas de um usuário em um bucket de tempo
+    (hora, dia ou mês, em UTC). Os contadores só crescem por $inc quando uma
+    análise termina; o /stats soma os buckets do período em vez de agregar
+    as análises.
+    """
+
+    user_id: str
+    granularity: str
+    bucket_start: datetime
+    analyses: int = 0
+    filler_words: int = 0
+    duration: float = 0.0
+    speech_rate_sum: float = 0.0
+    score_sum: int = 0
+
+    class Settings:
+        name = 'analysis_stats_rollups'
+        indexes = [
+            IndexModel(
+                [
+                    ('user_id', ASCENDING),
+                    ('granularity', ASCENDING),
+                    ('bucket_start', ASCENDING),
+                ],
+                name='user_bucket_index',
+                unique=True,
+            ),
+        ]
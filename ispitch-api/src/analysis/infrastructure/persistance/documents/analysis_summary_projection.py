@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import Optional
+
+from beanie import PydanticObjectId
+from pydantic import BaseModel, Field
+
+from ....domain.models.analysis import AnalysisStatus
+
+
+class AnalysisSummaryProjection(BaseModel):
+    """
+    Projection of AnalysisDocument with only the summary scalars. The nested
+    values are lifted by the projection itself, so Mongo never sends the
+    transcription or the contours.
+    """
+
+    id: PydanticObjectId = Field(alias='_id')
+    user_id: Optional[str] = None
+    status: AnalysisStatus
+    filename: str
+    score: Optional[int] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    duration: Optional[float] = None
+    speech_rate: Optional[float] = None
+    filler_words_count: Optional[int] = None
+    pauses_count: Optional[int] = None
+
+    class Settings:
+        projection = {
+            '_id': 1,
+            'user_id': 1,
+            'status': 1,
+            'filename': 1,
+            'score': 1,
+            'created_at': 1,
+            'updated_at': 1,
+            'duration': '$audio_analysis.duration',
+            'speech_rate': '$audio_analysis.speech_rate',
+            'filler_words_count': '$speech_analysis.fillerwords_analysis.total',
+            'pauses_count': '$speech_analysis.silence_analysis.pauses',
+        }
@@ -0,0 +1,34 @@
+from datetime import datetime, timezone
+
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+from .....core.config import settings
+
+
+class StageCacheDocument(Document):
+    key: str
+    audio_hash: str
+    stage: str
+    value: bytes
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+    last_access_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+
+    class Settings:
+        name = 'stage_cache'
+        indexes = [
+            IndexModel([('key', ASCENDING)], name='key_index', unique=True),
+            IndexModel(
+                [('created_at', ASCENDING)],
+                name='created_at_ttl_index',
+                expireAfterSeconds=settings.analysis_cache_ttl_seconds,
+            ),
+            IndexModel(
+                [('last_access_at', ASCENDING)], name='last_access_at_index'
+            ),
+        ]
@@ -2,6 +2,25 @@ from celery import Celery
 
 from src.core.config import settings
 
+# Fila de cada tarefa de análise. Cada uma tem uma fila longa, com o sufixo
+# do QueueLane, para os áudios acima de scheduler_short_max_seconds: os
+# workers de cada fila são dimensionados (e as vagas do escalonador
+# configuradas) separadamente.
+ANALYSIS_QUEUES = {
+    'run_analysis': 'analysis',
+    'analysis.transcribe': 'transcribe',
+    'analysis.prosody': 'prosody',
+    'analysis.nlp': 'nlp',
+    'analysis.finalize': 'finalize',
+    'analysis.fail': 'finalize',
+}
+
+
+def lane_queue(task_name: str, lane: str) -> str:
+    queue = ANALYSIS_QUEUES[task_name]
+    return queue if lane == 'short' else f'{queue}.{lane}'
+
+
 celery_app = Celery(
     'ispitch',
     broker=settings.redis_url,
@@ -17,5 +36,9 @@ celery_app.conf.update(
     timezone='America/Sao_Paulo',
     enable_utc=True,
     broker_connection_retry_on_startup=True,
-    worker_force_execv=True,
+    # Pipeline em estágios: uma fila por grupo de etapas, para que cada
+    # worker carregue só os modelos das filas que consome (-Q)
+    task_routes={
+        name: {'queue': queue} for name, queue in ANALYSIS_QUEUES.items()
+    },
 )
@@ -9,6 +9,65 @@ class Settings(BaseSettings):
     jwt_algorithm: str = 'HS256'
     jwt_access_token_expire_minutes: int = 30
     whisper_model: str = 'base'
+    transcription_backend: str = 'openai-whisper'
+    faster_whisper_compute_type: str = 'int8'
+    faster_whisper_cpu_threads: int = 0
+    faster_whisper_beam_size: int = 5
+    faster_whisper_batch_size: int = 8
+    transcription_chunk_seconds: float = 60.0
+    transcription_chunk_overlap_seconds: float = 1.0
+    transcription_chunk_search_seconds: float = 5.0
+    whisper_batch_max_size: int = 8
+    whisper_batch_max_wait_ms: int = 50
+    whisper_batch_timeout_seconds: float = 10 * 60
+    analysis_max_workers: int = 4
+    analysis_pipeline: str = 'monolithic'
+    worker_stage_groups: list[str] = ['transcribe', 'prosody', 'nlp', 'finalize']
+    scheduler_short_max_seconds: float = 2 * 60
+    scheduler_short_slots: int = 4
+    scheduler_long_slots: int = 2
+    scheduler_user_max_running: int = 2
+    scheduler_lease_seconds: int = 3 * 60 * 60
+    scheduler_realtime_factor: float = 0.5
+    scheduler_positions_interval_seconds: float = 10
+    scheduler_sweep_interval_seconds: float = 15
+    admission_short_max_wait_seconds: int = 10 * 60
+    admission_long_max_wait_seconds: int = 2 * 60 * 60
+    upload_rate_per_minute: float = 6
+    upload_rate_burst: int = 10
+    worker_ready_file: str | None = None
+    worker_preload_models: bool = False
+    worker_torch_threads: int = 0
+    metrics_push_interval_seconds: int = 15
+    sentiment_batch_size: int = 32
+    sentiment_max_length: int = 128
+    sentiment_window_stride: int = 32
+    topic_decoding: str = 'sample'
+    topic_num_beams: int = 4
+    topic_batch_size: int = 8
+    topic_cache_size: int = 256
+    analysis_cache_backend: str = 'disk'
+    analysis_cache_dir: str = 'analysis_cache'
+    analysis_cache_max_entries: int = 5000
+    analysis_cache_ttl_seconds: int = 7 * 24 * 60 * 60
+    analysis_cache_version: str = '1'
+    analysis_count_cache_ttl_seconds: int = 30
+    sse_client_queue_size: int = 64
+    sse_heartbeat_seconds: int = 15
+    analysis_events_max_len: int = 1000
+    analysis_events_ttl_seconds: int = 24 * 60 * 60
+    analysis_result_cache_max_bytes: int = 64 * 1024 * 1024
+    upload_max_bytes: int = 60 * 1024 * 1024
+    upload_max_duration_seconds: int = 30 * 60
+    blob_store_backend: str = 'filesystem'
+    blob_store_dir: str = 'audio_blobs'
+    blob_read_chunk_bytes: int = 4 * 1024 * 1024
+    s3_bucket: str = 'ispitch-audio'
+    s3_endpoint_url: str | None = None
+    s3_region: str | None = None
+    s3_access_key_id: str | None = None
+    s3_secret_access_key: str | None = None
+    s3_part_size_bytes: int = 8 * 1024 * 1024
 
     model_config = SettingsConfigDict(env_file='.env', env_file_encoding='utf-8')
 
@@ -21,6 +21,7 @@ async def domain_exception_handler(request: Request, exc: DomainException):
             error=HTTPStatus(exc.status_code).phrase,
             details=exc.details,
         ).model_dump(by_alias=True),
+        headers=exc.headers,
     )
 
 
@@ -62,9 +63,10 @@ async def authentication_exception_handler(request: Request, exc: AuthException)
         status_code=exc.status_code,
         content=ErrorResponse(
             statusCode=exc.status_code,
-            message=str(exc.detail),
+            message=exc.message,
             error=HTTPStatus(exc.status_code).phrase,
         ).model_dump(by_alias=True),
+        headers=exc.headers,
     )
 
 
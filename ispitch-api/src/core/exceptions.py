@@ -1,3 +1,4 @@
+import math
 from typing import Optional
 
 from fastapi import status
@@ -5,11 +6,16 @@ from fastapi import status
 
 class DomainException(Exception):
     def __init__(
-        self, status_code: int, message: str, details: Optional[list[str]]
+        self,
+        status_code: int,
+        message: str,
+        details: Optional[list[str]],
+        headers: Optional[dict[str, str]] = None,
     ):
         self.status_code = status_code
         self.message = message
         self.details = details
+        self.headers = headers
         super().__init__(self.message)
 
 
@@ -30,6 +36,16 @@ class ValidationException(DomainException):
         )
 
 
+class TooManyRequestsException(DomainException):
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            message=message,
+            details=[],
+            headers={'Retry-After': str(max(1, math.ceil(retry_after)))},
+        )
+
+
 class AuthException(DomainException):
     def __init__(
         self,
@@ -41,7 +57,7 @@ class AuthException(DomainException):
             status_code=status.HTTP_401_UNAUTHORIZED,
             message=message,
             details=details,
-            headers={'WWW-Authenticate': 'Bearer'},
+            headers={'WWW-Authenticate': 'Bearer', **(headers or {})},
         )
 
 
@@ -0,0 +1,280 @@
+"""
+Métricas em memória, exportadas no formato de texto do Prometheus.
+
+Cada processo (a API e cada worker) tem seu próprio registro. O /metrics
+de cada réplica da API exporta só o seu; os workers publicam um snapshot
+periodicamente no Redis, exportado em /metrics/workers, que deve ser um
+único alvo de scrape para não contar os workers uma vez por réplica. Todos
+levam o rótulo `process`: os percentis por etapa saem de
+`histogram_quantile` sobre `sum by (le, stage) (rate(...))`.
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Iterator
+
+# Segundos: de uma gravação no Redis até a transcrição de uma hora de áudio
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+    60,
+    120,
+    300,
+    600,
+    1800,
+    3600,
+)
+
+
+class Metric(ABC):
+    type = ''
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...]):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        self._series: dict[tuple[str, ...], object] = {}
+
+    def _key(self, labels: dict[str, object]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f'{self.name} expects labels {self.labelnames}, '
+                f'got {tuple(labels)}'
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            series = [
+                {'labels': list(key), **self._sample(value)}
+                for key, value in self._series.items()
+            ]
+        return {
+            'type': self.type,
+            'help': self.help,
+            'labelnames': list(self.labelnames),
+            'series': series,
+        }
+
+    @staticmethod
+    @abstractmethod
+    def _sample(value) -> dict:
+        pass
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+    @staticmethod
+    def _sample(value: float) -> dict:
+        return {'value': value}
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...],
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            # Contagens por faixa (a última é +Inf), soma e total
+            counts, total, count = self._series.get(
+                key, ([0] * (len(self.buckets) + 1), 0.0, 0)
+            )
+            index = next(
+                (i for i, le in enumerate(self.buckets) if value <= le),
+                len(self.buckets),
+            )
+            counts[index] += 1
+            self._series[key] = (counts, total + value, count + 1)
+
+    @contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        """Observa a duração do bloco, mesmo quando ele levanta exceção."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    @staticmethod
+    def _sample(value: tuple[list[int], float, int]) -> dict:
+        counts, total, count = value
+        cumulative, running = [], 0
+        for bucket_count in counts:
+            running += bucket_count
+            cumulative.append(running)
+        return {'buckets': cumulative, 'sum': total, 'count': count}
+
+    def snapshot(self) -> dict:
+        return {**super().snapshot(), 'le': list(self.buckets)}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(
+        self, name: str, help: str, labelnames: tuple[str, ...] = ()
+    ) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def snapshot(self) -> dict[str, dict]:
+        """Estado atual de todas as métricas, serializável em JSON."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.snapshot() for metric in metrics}
+
+    def _register(self, metric: Metric) -> Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f'Metric {metric.name} already registered')
+            self._metrics[metric.name] = metric
+        return metric
+
+
+def render(snapshots: dict[str, dict[str, dict]]) -> str:
+    """
+    Texto de exposição do Prometheus (versão 0.0.4) dos snapshots de cada
+    processo, indexados pelo nome do processo.
+    """
+    families: dict[str, dict] = {}
+    for snapshot in snapshots.values():
+        for name, family in snapshot.items():
+            families.setdefault(name, family)
+
+    lines = []
+    for name in sorted(families):
+        family = families[name]
+        lines.append(f'# HELP {name} {_escape_help(family["help"])}')
+        lines.append(f'# TYPE {name} {family["type"]}')
+        for process in sorted(snapshots):
+            process_family = snapshots[process].get(name)
+            if process_family is None:
+                continue
+            for series in process_family['series']:
+                labels = {
+                    **dict(zip(process_family['labelnames'], series['labels'])),
+                    'process': process,
+                }
+                lines.extend(
+                    _render_series(name, process_family, labels, series)
+                )
+    return '\n'.join(lines) + '\n'
+
+
+def _render_series(
+    name: str, family: dict, labels: dict[str, str], series: dict
+) -> list[str]:
+    if family['type'] != 'histogram':
+        return [f'{name}{_labels(labels)} {_number(series["value"])}']
+
+    bounds = [_number(le) for le in family['le']] + ['+Inf']
+    lines = [
+        f'{name}_bucket{_labels({**labels, "le": le})} {count}'
+        for le, count in zip(bounds, series['buckets'])
+    ]
+    lines.append(f'{name}_sum{_labels(labels)} {_number(series["sum"])}')
+    lines.append(f'{name}_count{_labels(labels)} {series["count"]}')
+    return lines
+
+
+def _labels(labels: dict[str, str]) -> str:
+    pairs = ','.join(
+        f'{name}="{_escape_label(value)}"' for name, value in labels.items()
+    )
+    return f'{{{pairs}}}'
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _escape_help(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n')
+
+
+def _number(value: float) -> str:
+    return repr(float(value))
+
+
+registry = MetricsRegistry()
+
+# Métricas da análise. Etapas servidas pelo cache contam só em
+# STAGE_CACHE_HITS, para não puxarem os percentis para baixo.
+STAGE_SECONDS = registry.histogram(
+    'ispitch_stage_duration_seconds',
+    'Execution time of each analysis stage.',
+    ('stage', 'outcome'),
+)
+STAGE_CACHE_HITS = registry.counter(
+    'ispitch_stage_cache_hits_total',
+    'Analysis stages served from the stage cache.',
+    ('stage',),
+)
+OPERATION_SECONDS = registry.histogram(
+    'ispitch_operation_duration_seconds',
+    'Time spent in port calls such as prosody steps, Mongo and Redis.',
+    ('operation',),
+)
+QUEUE_WAIT_SECONDS = registry.histogram(
+    'ispitch_queue_wait_seconds',
+    'Time from submission to the start of the first analysis task.',
+    ('lane',),
+)
+ANALYSES = registry.counter(
+    'ispitch_analyses_total',
+    'Finished analyses.',
+    ('lane', 'outcome'),
+)
+AUDIO_PROCESSED_SECONDS = registry.counter(
+    'ispitch_audio_processed_seconds_total',
+    'Seconds of audio of the finished analyses.',
+    ('lane', 'outcome'),
+)
+
+
+def timed(operation: str):
+    """Mede um bloco em OPERATION_SECONDS: `with timed('mongo.save'): ...`"""
+    return OPERATION_SECONDS.time(operation=operation)
+
+
+def outcome(succeeded: bool) -> str:
+    return 'success' if succeeded else 'failure'
@@ -1,5 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 
 def configure_cors(app: FastAPI):
@@ -13,3 +14,8 @@ def configure_cors(app: FastAPI):
         allow_methods=['*'],
         allow_headers=['*'],
     )
+
+
+def configure_compression(app: FastAPI):
+    # O Starlette não comprime text/event-stream, só as respostas comuns
+    app.add_middleware(GZipMiddleware, minimum_size=1024)
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from .camel_case_model import CamelCaseModel
 
 
@@ -6,3 +8,4 @@ class PaginationMetadata(CamelCaseModel):
     page: int
     page_size: int
     has_more: bool
+    next_cursor: Optional[str] = None
@@ -1,29 +1,51 @@
-from fastapi import FastAPI, HTTPException, status
+import os
+import socket
+
+from fastapi import Depends, FastAPI, HTTPException, status
 from fastapi.concurrency import asynccontextmanager
+from fastapi.responses import PlainTextResponse
 from pymongo.errors import ConnectionFailure
 
+from src.analysis.application.dependencies.services import (
+    create_scheduler_sweeper,
+    get_metrics_store,
+)
 from src.analysis.application.rest.endpoints import analysis
+from src.analysis.domain.ports.output import MetricsStorePort
+from src.analysis.infrastructure.context.resource_manager import (
+    ResourceManager,
+)
 from src.analysis.infrastructure.persistance.documents.analysis_document import (
     AnalysisDocument,
 )
+from src.analysis.infrastructure.persistance.documents.analysis_stats_rollup_document import (  # noqa: E501
+    AnalysisStatsRollupDocument,
+)
 from src.auth.application.rest.endpoints import auth
 from src.auth.infrastructure.persistance.documents.user_document import (
     UserDocument,
 )
 from src.core.database import db
 from src.core.exception_handlers import add_exception_handlers
-from src.core.middlewares import configure_cors
+from src.core.metrics import registry, render
+from src.core.middlewares import configure_compression, configure_cors
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     models_to_init = [
         AnalysisDocument,
+        AnalysisStatsRollupDocument,
         UserDocument,
     ]
 
     await db.connect(document_models=models_to_init)
+    await ResourceManager.start()
+    scheduler_sweeper = create_scheduler_sweeper()
+    await scheduler_sweeper.start()
     yield
+    await scheduler_sweeper.stop()
+    await ResourceManager.stop()
     await db.close()
 
 
@@ -36,6 +58,7 @@ app = FastAPI(
 
 
 configure_cors(app)
+configure_compression(app)
 add_exception_handlers(app)
 
 
@@ -67,3 +90,32 @@ async def health_check():
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f'An unexpected error occurred: {e}',
         )
+
+
+@app.get('/metrics', include_in_schema=False)
+async def metrics():
+    """
+    Prometheus exposition of this API process only. Each replica is a
+    scrape target of its own; worker metrics live at /metrics/workers.
+    """
+    snapshots = {
+        f'api@{socket.gethostname()}:{os.getpid()}': registry.snapshot()
+    }
+    return PlainTextResponse(
+        render(snapshots), media_type='text/plain; version=0.0.4'
+    )
+
+
+@app.get('/metrics/workers', include_in_schema=False)
+async def worker_metrics(
+    metrics_store: MetricsStorePort = Depends(get_metrics_store),
+):
+    """
+    Prometheus exposition of the snapshots the workers pushed to Redis,
+    each under its own `process` label. Every replica serves the same
+    data, so scrape it through a single target (e.g. the Service) only.
+    """
+    snapshots = await metrics_store.collect()
+    return PlainTextResponse(
+        render(snapshots), media_type='text/plain; version=0.0.4'
+    )
@@ -0,0 +1,212 @@
+"""
+Escalonador com os scripts Lua de verdade, executados pelo fakeredis (com o
+extra `lua`).
+"""
+
+import asyncio
+import json
+
+import fakeredis
+
+from src.analysis.domain.models.audio import StoredAudio
+from src.analysis.domain.models.events import SseEvent
+from src.analysis.domain.models.scheduling import QueuedAnalysis, QueueLane
+from src.analysis.domain.services.analysis_scheduler_service import (
+    AnalysisSchedulerService,
+    SchedulerConfig,
+)
+from src.analysis.infrastructure.adapters.scheduling.redis_scheduler_adapter import (  # noqa: E501
+    RedisSchedulerAdapter,
+)
+
+SHORT_CLIP = 60.0
+LONG_RECORDING = 30 * 60.0
+
+
+class RecordingTaskQueue:
+    def __init__(self):
+        self.dispatched: list[QueuedAnalysis] = []
+
+    def enqueue_analysis(self, job: QueuedAnalysis) -> None:
+        self.dispatched.append(job)
+
+    def ids(self) -> list[str]:
+        return [job.analysis_id for job in self.dispatched]
+
+
+class RecordingNotification:
+    def __init__(self):
+        self.events: list[tuple[str, SseEvent, str]] = []
+
+    async def publish(self, analysis_id, event, data) -> None:
+        self.events.append((analysis_id, event, data))
+
+    async def publish_many(self, events) -> None:
+        self.events.extend(events)
+
+
+def create_scheduler(
+    redis_client: fakeredis.FakeAsyncRedis,
+    lane_slots: dict[QueueLane, int],
+    lease_seconds: int = 60,
+) -> tuple[AnalysisSchedulerService, RecordingTaskQueue, RecordingNotification]:
+    task_queue = RecordingTaskQueue()
+    notification = RecordingNotification()
+    service = AnalysisSchedulerService(
+        scheduler_port=RedisSchedulerAdapter(
+            lambda: redis_client,
+            lane_slots=lane_slots,
+            tenant_slots=2,
+            lease_seconds=lease_seconds,
+        ),
+        task_queue_port=task_queue,
+        notification_port=notification,
+        config=SchedulerConfig(
+            short_max_seconds=120,
+            realtime_factor=0.5,
+            lane_slots=lane_slots,
+            max_wait_seconds=dict.fromkeys(lane_slots, 600),
+            positions_interval_seconds=60,
+        ),
+    )
+    return service, task_queue, notification
+
+
+def audio(name: str, duration: float) -> StoredAudio:
+    return StoredAudio(
+        key=f'audio/{name}.wav',
+        content_hash=name,
+        size=0,
+        filename=f'{name}.wav',
+        duration=duration,
+    )
+
+
+def test_user_at_limit_gets_short_clip_when_long_job_finishes():
+    async def scenario():
+        redis_client = fakeredis.FakeAsyncRedis()
+        service, task_queue, _ = create_scheduler(
+            redis_client, {QueueLane.SHORT: 4, QueueLane.LONG: 2}
+        )
+        await service.submit('long-1', 'user', audio('long-1', LONG_RECORDING))
+        await service.submit('long-2', 'user', audio('long-2', LONG_RECORDING))
+        await service.submit('clip', 'user', audio('clip', SHORT_CLIP))
+        # O usuário está no limite, somando as duas filas
+        assert task_queue.ids() == ['long-1', 'long-2']
+
+        await service.complete(task_queue.dispatched[0], succeeded=True)
+
+        assert task_queue.ids() == ['long-1', 'long-2', 'clip']
+        assert task_queue.dispatched[-1].lane == QueueLane.SHORT
+
+    asyncio.run(scenario())
+
+
+def test_slot_goes_to_user_with_fewest_running():
+    async def scenario():
+        redis_client = fakeredis.FakeAsyncRedis()
+        service, task_queue, _ = create_scheduler(
+            redis_client, {QueueLane.SHORT: 2, QueueLane.LONG: 1}
+        )
+        for name in ('a-1', 'a-2', 'a-3'):
+            await service.submit(name, 'a', audio(name, SHORT_CLIP))
+        await service.submit('b-1', 'b', audio('b-1', SHORT_CLIP))
+        assert task_queue.ids() == ['a-1', 'a-2']
+
+        await service.complete(task_queue.dispatched[0], succeeded=True)
+
+        assert task_queue.ids() == ['a-1', 'a-2', 'b-1']
+
+    asyncio.run(scenario())
+
+
+def test_sweep_reclaims_expired_lease_without_other_activity():
+    async def scenario():
+        redis_client = fakeredis.FakeAsyncRedis()
+        service, task_queue, _ = create_scheduler(
+            redis_client,
+            {QueueLane.SHORT: 1, QueueLane.LONG: 1},
+            lease_seconds=1,
+        )
+        await service.submit('dead', 'a', audio('dead', SHORT_CLIP))
+        await service.submit('next', 'b', audio('next', SHORT_CLIP))
+        assert task_queue.ids() == ['dead']
+
+        await asyncio.sleep(1.1)
+        await service.sweep()
+
+        assert task_queue.ids() == ['dead', 'next']
+
+    asyncio.run(scenario())
+
+
+def test_positions_are_published_at_most_once_per_interval():
+    async def scenario():
+        redis_client = fakeredis.FakeAsyncRedis()
+        service, _, notification = create_scheduler(
+            redis_client, {QueueLane.SHORT: 1, QueueLane.LONG: 1}
+        )
+        for index in range(5):
+            name = f'clip-{index}'
+            await service.submit(name, name, audio(name, SHORT_CLIP))
+
+        updates = [
+            (analysis_id, json.loads(data))
+            for analysis_id, event, data in notification.events
+            if event == SseEvent.QUEUE_UPDATE
+        ]
+        # clip-0 começou; só o primeiro envio com fila publicou as posições
+        assert updates[0][0] == 'clip-0'
+        assert updates[0][1]['position'] == 0
+        assert [(i, u['position']) for i, u in updates[1:]] == [('clip-1', 1)]
+
+    asyncio.run(scenario())
+
+
+def test_load_tracks_queued_audio_and_measured_realtime_factor():
+    async def scenario():
+        redis_client = fakeredis.FakeAsyncRedis()
+        service, task_queue, _ = create_scheduler(
+            redis_client, {QueueLane.SHORT: 1, QueueLane.LONG: 1}
+        )
+        scheduler_port = service._scheduler_port
+        await service.submit('first', 'a', audio('first', SHORT_CLIP))
+        await service.submit('second', 'b', audio('second', SHORT_CLIP))
+
+        load = await scheduler_port.load(QueueLane.SHORT)
+        assert load.audio_seconds == 2 * SHORT_CLIP
+        assert load.realtime_factor is None
+
+        await service.complete(task_queue.dispatched[0], succeeded=True)
+
+        load = await scheduler_port.load(QueueLane.SHORT)
+        assert load.audio_seconds == SHORT_CLIP
+        assert load.realtime_factor is not None
+        assert load.realtime_factor >= 0
+
+    asyncio.run(scenario())
+
+
+def test_failed_enqueue_returns_job_to_lane_for_the_sweep():
+    async def scenario():
+        redis_client = fakeredis.FakeAsyncRedis()
+        service, task_queue, _ = create_scheduler(
+            redis_client, {QueueLane.SHORT: 1, QueueLane.LONG: 1}
+        )
+        enqueue = task_queue.enqueue_analysis
+
+        def broker_down(job: QueuedAnalysis) -> None:
+            raise ConnectionError('broker unavailable')
+
+        task_queue.enqueue_analysis = broker_down
+        # Aceita pelo escalonador: a falha do broker não chega a quem enviou
+        await service.submit('clip', 'a', audio('clip', SHORT_CLIP))
+        load = await service._scheduler_port.load(QueueLane.SHORT)
+        assert load.audio_seconds == SHORT_CLIP
+
+        task_queue.enqueue_analysis = enqueue
+        await service.sweep()
+
+        assert task_queue.ids() == ['clip']
+
+    asyncio.run(scenario())